@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+"""
+Lean entry point for the MQTT consumer: `python consumer.py [mqtt_consumer options]`.
+
+Runs `manage.py mqtt_consumer` under sager_drone_task.settings_consumer (ORM
+and services only) unless DJANGO_SETTINGS_MODULE says otherwise.
+"""
+import os
+import sys
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sager_drone_task.settings_consumer')
+    from django.core.management import execute_from_command_line
+
+    execute_from_command_line([sys.argv[0], 'mqtt_consumer', *sys.argv[1:]])
+
+
+if __name__ == '__main__':
+    main()
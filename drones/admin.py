@@ -1,21 +1,76 @@
+from django.conf import settings
 from django.contrib import admin
-from .models import Drone, DroneTelemetryPoint, NoFlyZone
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .models import DangerRuleDefinition, Drone, DroneTelemetryPoint, NoFlyZone
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Avoids COUNT(*) over a whole large table, a full scan on PostgreSQL.
+
+    An unfiltered list uses the planner's row estimate (pg_class.reltuples)
+    once that exceeds ADMIN_EXACT_COUNT_LIMIT. A filtered list, or one on a
+    backend with no estimate, counts at most ADMIN_EXACT_COUNT_LIMIT rows,
+    so its page links stop there; narrow it down with the date hierarchy.
+    """
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        limit = int(getattr(settings, "ADMIN_EXACT_COUNT_LIMIT", 10000))
+        if not qs.query.where:
+            estimate = _estimated_rows(qs.db, qs.model._meta.db_table)
+            if estimate is not None and estimate > limit:
+                return estimate
+        return qs.order_by()[:limit].count()
+
+
+def _estimated_rows(alias, table):
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        row = cursor.fetchone()
+    # -1 (PostgreSQL 14+) or 0: never analyzed
+    return int(row[0]) if row and row[0] > 0 else None
+
 
 @admin.register(Drone)
 class DroneAdmin(admin.ModelAdmin):
-    list_display = ("serial", "last_seen_at", "latitude", "longitude", "is_dangerous")
+    list_display = ("serial", "drone_class", "last_seen_at", "latitude", "longitude", "is_dangerous")
     search_fields = ("serial",)
-    list_filter = ("is_dangerous",)
+    list_filter = ("is_dangerous", "drone_class")
 
 @admin.register(DroneTelemetryPoint)
 class DroneTelemetryPointAdmin(admin.ModelAdmin):
+    # Sized for millions of rows: the drone is joined instead of fetched per row, the
+    # counts are estimated or bounded, the date hierarchy narrows by the timestamp index,
+    # and the change form does not render every drone into a <select>.
     list_display = ("drone", "timestamp", "latitude", "longitude")
+    list_select_related = ("drone",)
     search_fields = ("drone__serial",)
     list_filter = ("timestamp",)
+    date_hierarchy = "timestamp"
+    ordering = ("-timestamp",)
+    raw_id_fields = ("drone",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(NoFlyZone)
 class NoFlyZoneAdmin(admin.ModelAdmin):
     list_display = ("name", "center_lat", "center_lon", "radius_km", "is_active")
     list_filter = ("is_active",)
-    search_fields = ("name",)
\ No newline at end of file
+    search_fields = ("name",)
+
+
+@admin.register(DangerRuleDefinition)
+class DangerRuleDefinitionAdmin(admin.ModelAdmin):
+    list_display = ("name", "drone_class", "field", "operator", "threshold", "zone", "is_active", "updated_at")
+    list_filter = ("is_active", "field", "drone_class")
+    search_fields = ("name", "reason")
+    raw_id_fields = ("zone",)
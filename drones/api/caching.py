@@ -0,0 +1,61 @@
+import hashlib
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.renderers import JSONRenderer
+
+from drones.services.cache_version import get_version
+
+
+def _etag_matches(request, etag: str) -> bool:
+    header = request.META.get("HTTP_IF_NONE_MATCH", "")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in [t.strip().removeprefix("W/") for t in header.split(",")]
+
+
+def cached_api_response(ttl: Optional[int] = None):
+    """
+    Cache a read-only APIView GET handler's JSON body.
+
+    - The cache key includes the full path (with query string) and the
+      drone-state version stamp, so bump_version() invalidates every entry.
+    - Entries also expire after `ttl` seconds (default DRONE_API_CACHE_TTL_SECONDS).
+    - Responses carry a content-hash ETag; If-None-Match hits return 304.
+
+    Only 200 responses are cached; anything else is returned unchanged.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            timeout = ttl if ttl is not None else settings.DRONE_API_CACHE_TTL_SECONDS
+            path_hash = hashlib.sha1(request.get_full_path().encode("utf-8")).hexdigest()
+            key = f"drones:api:{get_version()}:{path_hash}"
+
+            entry = cache.get(key) if timeout > 0 else None
+            if entry is None:
+                response = handler(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                body = JSONRenderer().render(response.data)
+                entry = (f'"{hashlib.sha1(body).hexdigest()}"', body)
+                if timeout > 0:
+                    cache.set(key, entry, timeout)
+
+            etag, body = entry
+            if _etag_matches(request, etag):
+                response = HttpResponseNotModified()
+            else:
+                response = HttpResponse(body, content_type="application/json")
+            response["ETag"] = etag
+            response["Cache-Control"] = "no-cache"
+            return response
+
+        return wrapper
+
+    return decorator
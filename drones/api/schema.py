@@ -0,0 +1,84 @@
+"""
+OpenAPI schema served from memory.
+
+drf-spectacular regenerates the schema, introspecting every view and
+serializer, on each request. CachedSpectacularAPIView builds it once per
+process (or loads the file written at build time by `manage.py spectacular
+--format openapi-json --file <OPENAPI_SCHEMA_FILE>`), renders each format
+once, and serves the bytes with an ETag.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+from drones.api.caching import _etag_matches
+
+
+class DroneJWTScheme(SimpleJWTScheme):
+    # Same bearer scheme as simplejwt's, under the name used by SPECTACULAR_SETTINGS["SECURITY"].
+    target_class = "drones.authentication.DroneJWTAuthentication"
+    name = "bearerAuth"
+
+
+# (media type, language) -> (etag, body, content type)
+_rendered: Dict[Tuple[str, Optional[str]], Tuple[str, bytes, str]] = {}
+_lock = threading.Lock()
+
+
+def clear_schema_cache() -> None:
+    with _lock:
+        _rendered.clear()
+
+
+def _schema_file() -> str:
+    path = getattr(settings, "OPENAPI_SCHEMA_FILE", "")
+    return path if path and os.path.isfile(path) else ""
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        renderer, _ = self.perform_content_negotiation(request)
+        lang = request.GET.get("lang")
+        if lang not in dict(settings.LANGUAGES):
+            lang = None
+        key = (renderer.media_type, lang)
+
+        entry = _rendered.get(key)
+        if entry is None:
+            with _lock:
+                entry = _rendered.get(key)
+                if entry is None:
+                    entry = _rendered[key] = self._render(request, renderer, *args, **kwargs)
+
+        etag, body, content_type = entry
+        if _etag_matches(request, etag):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type=content_type)
+            response["Content-Disposition"] = f'inline; filename="{self._get_filename(request, self.api_version)}"'
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    def _render(self, request, renderer, *args, **kwargs):
+        path = _schema_file()
+        if path:
+            with open(path, "rb") as f:
+                data = json.load(f)
+        else:
+            data = super().get(request, *args, **kwargs).data
+
+        body = renderer.render(data, renderer.media_type, self.get_renderer_context())
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        return f'"{hashlib.sha1(body).hexdigest()}"', body, content_type
@@ -1,11 +1,13 @@
 from .drones import (
     DroneListView,
     OnlineDronesView,
+    OnlineDronesCountView,
     NearbyDronesView,
     DangerousDronesView,
+    DroneConflictsView,
     DroneOSDView,
     MarkDroneSafeView,
 )
 
-from .telemetry import DronePathGeoJSONView
-from .zones import NoFlyZoneListCreateView, NoFlyZoneDetailView
+from .telemetry import DronePathGeoJSONView, DroneTrackStatsView, TelemetryExportView, HistoryNearbyView
+from .zones import NoFlyZoneListCreateView, NoFlyZoneBulkImportView, NoFlyZoneDetailView
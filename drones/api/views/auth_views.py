@@ -1,10 +1,12 @@
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_spectacular.utils import extend_schema
 
+from drones.serializers import DroneTokenObtainPairSerializer, DroneTokenRefreshSerializer
+
 @extend_schema(tags=["Auth"])
 class MyTokenObtainPairView(TokenObtainPairView):
-    pass
+    serializer_class = DroneTokenObtainPairSerializer
 
 @extend_schema(tags=["Auth"])
 class MyTokenRefreshView(TokenRefreshView):
-    pass
+    serializer_class = DroneTokenRefreshSerializer
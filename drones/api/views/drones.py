@@ -1,5 +1,5 @@
-from django.utils import timezone
 from django.conf import settings
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 
 from rest_framework.views import APIView
@@ -10,10 +10,20 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiRespon
 from drf_spectacular.types import OpenApiTypes
 
 from drones.models import Drone
-from drones.serializers import DroneSerializer, QueryNearbySerializer, DroneOSDResponseSerializer
-from drones.services.geo import haversine_km
-from drones.services.online import is_online
+from drones.serializers import (
+    DroneSerializer,
+    QueryNearbySerializer,
+    DroneOSDResponseSerializer,
+    DroneConflictSerializer,
+)
+from drones.services.geo import circle_bbox, haversine_km
+from drones.services.presence import online_cutoff
 from drones.permissions import CanMarkDroneSafe
+from drones.api.caching import cached_api_response
+from drones.services.cache_version import bump_version
+from drones.services.conflicts import current_conflicts
+from drones.services.osd_store import get_latest_payload, get_payload_history
+from drones.services.replica import pin_primary, use_replica
 
 
 @extend_schema(
@@ -41,6 +51,8 @@ from drones.permissions import CanMarkDroneSafe
 class DroneListView(APIView):
     permission_classes = [AllowAny]
 
+    @cached_api_response()
+    @use_replica()
     def get(self, request):
         serial_q = (request.query_params.get("serial") or "").strip()
         qs = Drone.objects.all().order_by("serial")
@@ -58,20 +70,42 @@ class DroneListView(APIView):
 class OnlineDronesView(APIView):
     permission_classes = [AllowAny]
 
+    @cached_api_response()
+    @use_replica()
     def get(self, request):
-        window = settings.ONLINE_WINDOW_SECONDS
-        cutoff = timezone.now() - timezone.timedelta(seconds=window)
-
+        # Matches the partial index drone_seen_located_idx.
         qs = (
             Drone.objects
-            .filter(last_seen_at__gte=cutoff)
-            .exclude(latitude__isnull=True)
-            .exclude(longitude__isnull=True)
+            .filter(
+                last_seen_at__gte=online_cutoff(),
+                latitude__isnull=False,
+                longitude__isnull=False,
+            )
             .order_by("serial")
         )
         return Response(DroneSerializer(qs, many=True).data)
 
 
+@extend_schema(
+    tags=["Drones"],
+    summary="Count online drones",
+    description=(
+        "Counts the drones /api/drones/online lists (located, seen within ONLINE_WINDOW_SECONDS) "
+        "from the materialized is_online flag. The flag is set on ingest and cleared by the "
+        "presence sweeper, so it may lag by up to PRESENCE_SWEEP_SECONDS."
+    ),
+    responses={200: OpenApiResponse(description='{"online": <int>}')},
+)
+class OnlineDronesCountView(APIView):
+    permission_classes = [AllowAny]
+
+    @use_replica()
+    def get(self, request):
+        # Matches the partial index drone_online_located_idx.
+        qs = Drone.objects.filter(is_online=True, latitude__isnull=False, longitude__isnull=False)
+        return Response({"online": qs.count()})
+
+
 @extend_schema(
     tags=["Drones"],
     summary="List drones within 5km of a point (lat, lon)",
@@ -101,6 +135,7 @@ class OnlineDronesView(APIView):
 class NearbyDronesView(APIView):
     permission_classes = [AllowAny]
 
+    @use_replica()
     def get(self, request):
         s = QueryNearbySerializer(data=request.query_params)
         s.is_valid(raise_exception=True)
@@ -109,7 +144,17 @@ class NearbyDronesView(APIView):
         lon = s.validated_data["lon"]
         radius_km = float(settings.NEARBY_RADIUS_KM)
 
-        candidates = Drone.objects.exclude(latitude__isnull=True).exclude(longitude__isnull=True)
+        # Bounding-box prefilter (drone_lat_lon_idx); exact distance below.
+        min_lat, min_lon, max_lat, max_lon = circle_bbox(lat, lon, radius_km)
+        candidates = Drone.objects.filter(latitude__gte=min_lat, latitude__lte=max_lat)
+        if max_lon - min_lon < 360.0:
+            if min_lon < -180.0:
+                candidates = candidates.filter(Q(longitude__gte=min_lon + 360.0) | Q(longitude__lte=max_lon))
+            elif max_lon > 180.0:
+                candidates = candidates.filter(Q(longitude__gte=min_lon) | Q(longitude__lte=max_lon - 360.0))
+            else:
+                candidates = candidates.filter(longitude__gte=min_lon, longitude__lte=max_lon)
+        candidates = candidates.exclude(longitude__isnull=True).order_by("serial")
 
         result = []
         for d in candidates:
@@ -129,11 +174,29 @@ class NearbyDronesView(APIView):
 class DangerousDronesView(APIView):
     permission_classes = [AllowAny]
 
+    @cached_api_response()
     def get(self, request):
         qs = Drone.objects.filter(is_dangerous=True).order_by("serial")
         return Response(DroneSerializer(qs, many=True).data)
 
 
+@extend_schema(
+    tags=["Drones"],
+    summary="List pairs of online drones closer than the minimum separation",
+    description=(
+        "Pairs closer than MIN_SEPARATION_M horizontally (and, when MIN_VERTICAL_SEPARATION_M > 0, "
+        "vertically), closest first. Drones in a conflict carry the separation_conflict danger reason."
+    ),
+    responses={200: DroneConflictSerializer(many=True)},
+)
+class DroneConflictsView(APIView):
+    permission_classes = [AllowAny]
+
+    @cached_api_response()
+    def get(self, request):
+        return Response(DroneConflictSerializer(current_conflicts(), many=True).data)
+
+
 @extend_schema(
     tags=["Drones"],
     summary="Get drone OSD payload by serial",
@@ -144,7 +207,14 @@ class DangerousDronesView(APIView):
             location=OpenApiParameter.PATH,
             required=True,
             description="Drone serial number.",
-        )
+        ),
+        OpenApiParameter(
+            name="history",
+            type=OpenApiTypes.BOOL,
+            location=OpenApiParameter.QUERY,
+            required=False,
+            description="Include the ring of recent payloads (when OSD_HISTORY_SIZE > 0).",
+        ),
     ],
     responses={
         200: DroneOSDResponseSerializer,
@@ -156,13 +226,18 @@ class DroneOSDView(APIView):
 
     def get(self, request, serial: str):
         drone = get_object_or_404(Drone, serial=serial)
-        return Response(
-            {
-                "serial": drone.serial,
-                "last_seen_at": drone.last_seen_at,
-                "osd": drone.last_payload,
-            }
-        )
+        _, payload = get_latest_payload(drone)
+        data = {
+            "serial": drone.serial,
+            "last_seen_at": drone.last_seen_at,
+            "osd": payload,
+        }
+        if (request.query_params.get("history") or "").lower() in ("1", "true", "yes"):
+            data["history"] = [
+                {"received_at": received_at, "osd": osd}
+                for received_at, osd in get_payload_history(drone)
+            ]
+        return Response(DroneOSDResponseSerializer(data).data)
 
 
 @extend_schema(
@@ -184,4 +259,6 @@ class MarkDroneSafeView(APIView):
         drone.is_dangerous = False
         drone.danger_reasons = []
         drone.save(update_fields=["is_dangerous", "danger_reasons", "updated_at"])
+        bump_version()
+        pin_primary()
         return Response({"status": "ok", "serial": drone.serial})
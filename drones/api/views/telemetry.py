@@ -1,13 +1,28 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from drf_spectacular.types import OpenApiTypes
 
 from drones.models import Drone, DroneTelemetryPoint
+from drones.api.caching import cached_api_response
+from drones.serializers import (
+    QueryTrackStatsSerializer,
+    DroneTrackStatsSerializer,
+    QueryTelemetryExportSerializer,
+    QueryHistoryNearbySerializer,
+    DroneClosestApproachSerializer,
+)
+from drones.services.export import EXPORT_FORMATS, export_telemetry
+from drones.services.grid import drones_near
+from drones.services.replica import read_alias, use_replica
+from drones.services.track_stats import compute_track_stats
 
 
 @extend_schema(
@@ -30,6 +45,8 @@ from drones.models import Drone, DroneTelemetryPoint
 class DronePathGeoJSONView(APIView):
     permission_classes = [AllowAny]
 
+    @cached_api_response()
+    @use_replica()
     def get(self, request, serial: str):
         drone = get_object_or_404(Drone, serial=serial)
         points = DroneTelemetryPoint.objects.filter(drone=drone).order_by("timestamp")
@@ -42,3 +59,117 @@ class DronePathGeoJSONView(APIView):
             "geometry": {"type": "LineString", "coordinates": coordinates},
         }
         return Response(geojson)
+
+
+@extend_schema(
+    tags=["Telemetry"],
+    summary="Get flight statistics of a drone over a time window",
+    description=(
+        "Distance flown, max/avg height and speed, and time online, computed from the drone's "
+        "telemetry points in [since, until). Defaults to today so far."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="serial",
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.PATH,
+            required=True,
+            description="Drone serial number.",
+        ),
+        QueryTrackStatsSerializer,
+    ],
+    responses={
+        200: DroneTrackStatsSerializer,
+        400: OpenApiResponse(description="Validation error (invalid since/until)."),
+        404: OpenApiResponse(description="Drone not found"),
+    },
+)
+class DroneTrackStatsView(APIView):
+    permission_classes = [AllowAny]
+
+    @use_replica()
+    def get(self, request, serial: str):
+        s = QueryTrackStatsSerializer(data=request.query_params)
+        s.is_valid(raise_exception=True)
+
+        drone = get_object_or_404(Drone, serial=serial)
+        since = s.validated_data.get("since")
+        if since is None:
+            since = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        until = s.validated_data.get("until")
+
+        stats = compute_track_stats(drone, since, until)
+        data = {"serial": drone.serial, "since": since, "until": until, **stats.summary()}
+        return Response(DroneTrackStatsSerializer(data).data)
+
+
+@extend_schema(
+    tags=["Telemetry"],
+    summary="Bulk export telemetry points",
+    description=(
+        "Streams telemetry points of the given drones (default: all) in [since, until), ordered by "
+        "drone then time, as CSV, NDJSON, or Parquet / Arrow IPC stream when pyarrow is installed."
+    ),
+    parameters=[QueryTelemetryExportSerializer],
+    responses={
+        (200, "text/csv"): OpenApiTypes.BINARY,
+        (200, "application/x-ndjson"): OpenApiTypes.BINARY,
+        (200, "application/vnd.apache.parquet"): OpenApiTypes.BINARY,
+        (200, "application/vnd.apache.arrow.stream"): OpenApiTypes.BINARY,
+        400: OpenApiResponse(description="Validation error (file_format, since/until)."),
+        401: OpenApiResponse(description="Auth required"),
+    },
+)
+class TelemetryExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        s = QueryTelemetryExportSerializer(data=request.query_params)
+        s.is_valid(raise_exception=True)
+
+        fmt = s.validated_data["file_format"]
+        # The body is streamed after get() returns, so the database is bound to the queryset.
+        chunks = export_telemetry(
+            fmt,
+            serials=s.validated_data.get("serials") or (),
+            since=s.validated_data.get("since"),
+            until=s.validated_data.get("until"),
+            using=read_alias(),
+        )
+        export_format = EXPORT_FORMATS[fmt]
+        response = StreamingHttpResponse(chunks, content_type=export_format.content_type)
+        stamp = timezone.now().strftime("%Y%m%dT%H%M%SZ")
+        response["Content-Disposition"] = f'attachment; filename="telemetry-{stamp}.{export_format.extension}"'
+        return response
+
+
+@extend_schema(
+    tags=["Telemetry"],
+    summary="Drones that were near a point during a time window",
+    description=(
+        "Drones with at least one telemetry point within radius_km of (lat, lon) in [since, until), "
+        "with their closest approach, nearest first. Served from the (grid_cell, timestamp) index."
+    ),
+    parameters=[QueryHistoryNearbySerializer],
+    responses={
+        200: DroneClosestApproachSerializer(many=True),
+        400: OpenApiResponse(description="Validation error (lat/lon/radius/since/until)."),
+    },
+)
+class HistoryNearbyView(APIView):
+    permission_classes = [AllowAny]
+
+    @use_replica()
+    def get(self, request):
+        s = QueryHistoryNearbySerializer(data=request.query_params)
+        s.is_valid(raise_exception=True)
+
+        d = s.validated_data
+        approaches = drones_near(
+            d["lat"],
+            d["lon"],
+            d.get("radius_km") or float(settings.NEARBY_RADIUS_KM),
+            d["since"],
+            d["until"],
+        )
+        return Response(DroneClosestApproachSerializer(approaches, many=True).data)
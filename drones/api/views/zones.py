@@ -11,6 +11,7 @@ from drf_spectacular.types import OpenApiTypes
 from drones.models import NoFlyZone
 from drones.serializers import NoFlyZoneSerializer
 from drones.permissions import CanModifySettings
+from drones.services.zone_import import ZoneImportError, import_zones, parse_feature_collection
 
 
 @extend_schema(
@@ -37,6 +38,46 @@ class NoFlyZoneListCreateView(APIView):
         return Response(NoFlyZoneSerializer(zone).data, status=status.HTTP_201_CREATED)
 
 
+@extend_schema(
+    tags=["Geofencing"],
+    summary="Bulk import no-fly zones from a GeoJSON FeatureCollection",
+    description=(
+        "Accepts Polygon, MultiPolygon (one zone per part) and Point features "
+        "(circle zones, radius from properties.radius_km or properties.radius_m). "
+        "All features are validated first; zones are then inserted in one transaction. "
+        "Pass ?replace=true to replace every existing zone."
+    ),
+    request=OpenApiTypes.OBJECT,
+    parameters=[
+        OpenApiParameter(
+            name="replace",
+            type=OpenApiTypes.BOOL,
+            location=OpenApiParameter.QUERY,
+            required=False,
+            description="Delete all existing zones before importing.",
+        )
+    ],
+    responses={
+        201: OpenApiResponse(description="Zones created"),
+        400: OpenApiResponse(description="Validation error (lists every invalid feature)"),
+        401: OpenApiResponse(description="Auth required"),
+        403: OpenApiResponse(description="Missing permission"),
+    },
+)
+class NoFlyZoneBulkImportView(APIView):
+    permission_classes = [IsAuthenticated, CanModifySettings]
+
+    def post(self, request):
+        try:
+            zones = parse_feature_collection(request.data)
+        except ZoneImportError as e:
+            return Response({"errors": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        replace = (request.query_params.get("replace") or "").lower() in ("1", "true", "yes")
+        created = import_zones(zones, replace=replace)
+        return Response({"created": len(created)}, status=status.HTTP_201_CREATED)
+
+
 @extend_schema(
     tags=["Geofencing"],
     summary="Update or delete a no-fly zone",
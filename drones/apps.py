@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class DronesConfig(AppConfig):
     name = 'drones'
+
+    def ready(self):
+        from drones import checks, signals  # noqa: F401
@@ -0,0 +1,25 @@
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from drones.services.auth_cache import PERMS_CLAIM, get_cached_user
+
+
+class DroneJWTAuthentication(JWTAuthentication):
+    """
+    simplejwt authentication with two fast paths:
+
+    - JWT_STATELESS_AUTH on and the token carries the perms claim:
+      return a TokenUser backed by the token itself (no DB access).
+    - otherwise: rebuild the User from a short-lived in-process cache of
+      its row (AUTH_CACHE_SECONDS) instead of one query per request.
+    """
+
+    def get_user(self, validated_token):
+        if settings.JWT_STATELESS_AUTH and PERMS_CLAIM in validated_token:
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        return get_cached_user(user_id, lambda: super(DroneJWTAuthentication, self).get_user(validated_token))
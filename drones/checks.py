@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Backends whose entries are only visible to the process that wrote them.
+_PER_PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend not in _PER_PROCESS_CACHES:
+        return []
+    return [
+        Warning(
+            f"The default cache ({backend}) is not shared between processes.",
+            hint=(
+                "The consumer's latest OSD payloads and response-cache invalidations do not reach "
+                "the web workers: /osd serves the persisted row (up to OSD_PERSIST_INTERVAL_SECONDS "
+                "old). Set DJANGO_CACHE_BACKEND / DJANGO_CACHE_LOCATION to a shared backend such as Redis."
+            ),
+            id="drones.W001",
+        )
+    ]
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from drones.services.grid import backfill_grid_cells
+
+
+class Command(BaseCommand):
+    help = "Compute grid_cell for telemetry points (after loaddata, or after changing GRID_CELL_DEG)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every point, not only points without a cell.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        n = backfill_grid_cells(only_missing=not options["all"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Updated grid_cell on {n} point(s)."))
@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from drones.services.conflicts import detect_conflicts
+
+
+class Command(BaseCommand):
+    help = "Flag online drones closer than MIN_SEPARATION_M with the separation_conflict danger reason."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.CONFLICT_DETECT_SECONDS or 1.0,
+            help="Seconds between runs (default: CONFLICT_DETECT_SECONDS).",
+        )
+        parser.add_argument("--once", action="store_true", help="Run a single detection and exit.")
+
+    def handle(self, *args, **options):
+        interval = max(options["interval"], 0.2)
+        while True:
+            conflicts = detect_conflicts()
+            if options["once"]:
+                for c in conflicts:
+                    self.stdout.write(f"{c.serial_a} <-> {c.serial_b}: {c.distance_m:.1f} m")
+                self.stdout.write(f"{len(conflicts)} conflict(s)")
+                return
+            time.sleep(interval)
@@ -0,0 +1,64 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from drones.services.export import EXPORT_FORMATS, export_telemetry
+
+
+def _parse_when(value):
+    if value is None:
+        return None
+    dt = parse_datetime(value)
+    if dt is None:
+        raise CommandError(f"Invalid datetime {value!r}; use ISO 8601 (e.g. 2026-01-31T00:00:00Z).")
+    return dt
+
+
+class Command(BaseCommand):
+    help = "Stream telemetry points to a CSV / NDJSON / Parquet / Arrow file in constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--serial",
+            action="append",
+            default=[],
+            help="Drone serial to export (repeatable; default: all drones).",
+        )
+        parser.add_argument("--since", help="Start of the window (ISO 8601, inclusive).")
+        parser.add_argument("--until", help="End of the window (ISO 8601, exclusive).")
+        parser.add_argument(
+            "--format",
+            default="csv",
+            help=f"Output format: {', '.join(sorted(EXPORT_FORMATS))}.",
+        )
+        parser.add_argument("--output", "-o", help="Output file (default: stdout).")
+        parser.add_argument("--chunk-size", type=int, help="Rows per chunk (default: EXPORT_CHUNK_ROWS).")
+
+    def handle(self, *args, **options):
+        try:
+            chunks = export_telemetry(
+                options["format"],
+                serials=options["serial"],
+                since=_parse_when(options["since"]),
+                until=_parse_when(options["until"]),
+                chunk_size=options["chunk_size"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        path = options["output"]
+        out = open(path, "wb") if path else sys.stdout.buffer
+        written = 0
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if path:
+                out.close()
+            else:
+                out.flush()
+
+        if path:
+            self.stdout.write(self.style.SUCCESS(f"Wrote {written} bytes to {path}."))
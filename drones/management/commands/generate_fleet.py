@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from drones.services.synthetic import FLIGHT_PATTERNS, delete_synthetic, generate_fleet
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic fleet (drones, telemetry tracks, zones) for benchmarks and scale testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--drones", type=int, default=1000)
+        parser.add_argument("--points", type=int, default=100, help="Telemetry points per drone.")
+        parser.add_argument("--zones", type=int, default=50)
+        parser.add_argument(
+            "--pattern",
+            action="append",
+            choices=sorted(FLIGHT_PATTERNS),
+            help="Flight pattern(s), assigned round-robin (repeatable; default: all).",
+        )
+        parser.add_argument("--center", type=float, nargs=2, default=(31.95, 35.91), metavar=("LAT", "LON"))
+        parser.add_argument("--spread-km", type=float, default=20.0, help="Half-width of the area drones start in.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds between fixes.")
+        parser.add_argument("--online-ratio", type=float, default=0.9)
+        parser.add_argument("--polygon-ratio", type=float, default=0.5, help="Share of polygon zones (rest are circles).")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="SIM", help="Serial / zone name prefix.")
+        parser.add_argument("--batch-size", type=int, default=10000, help="Telemetry rows per insert / COPY.")
+        parser.add_argument("--no-copy", action="store_true", help="Use bulk inserts even on PostgreSQL.")
+        parser.add_argument("--replace", action="store_true", help="Delete drones and zones with this prefix first.")
+
+    def handle(self, *args, **options):
+        if options["drones"] < 0 or options["points"] < 0 or options["zones"] < 0:
+            raise CommandError("--drones, --points and --zones must be >= 0.")
+
+        if options["replace"]:
+            n_drones, n_zones = delete_synthetic(options["prefix"])
+            self.stdout.write(f"Deleted {n_drones} drone row(s) and {n_zones} zone row(s) with prefix {options['prefix']!r}.")
+
+        started = time.monotonic()
+        fleet = generate_fleet(
+            drones=options["drones"],
+            points=options["points"],
+            zones=options["zones"],
+            patterns=options["pattern"] or tuple(FLIGHT_PATTERNS),
+            center=tuple(options["center"]),
+            spread_km=options["spread_km"],
+            interval_seconds=options["interval"],
+            online_ratio=options["online_ratio"],
+            polygon_ratio=options["polygon_ratio"],
+            seed=options["seed"],
+            prefix=options["prefix"],
+            batch_size=options["batch_size"],
+            use_copy=False if options["no_copy"] else None,
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {fleet.drones} drones, {fleet.points} points and {fleet.zones} zones in {elapsed:.1f}s "
+            f"({fleet.points / max(elapsed, 1e-9):,.0f} points/s)."
+        ))
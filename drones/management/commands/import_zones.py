@@ -0,0 +1,43 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from drones.services.zone_import import ZoneImportError, import_zones, parse_feature_collection
+
+
+class Command(BaseCommand):
+    help = "Bulk import no-fly zones from a GeoJSON FeatureCollection file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to a GeoJSON FeatureCollection file.")
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Delete all existing zones before importing.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], "rb") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+
+        try:
+            zones = parse_feature_collection(data)
+        except ZoneImportError as e:
+            for err in e.errors:
+                self.stderr.write(err)
+            raise CommandError(f"{len(e.errors)} invalid feature(s); nothing imported.")
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"Valid: {len(zones)} zone(s) would be imported."))
+            return
+
+        created = import_zones(zones, replace=options["replace"])
+        self.stdout.write(self.style.SUCCESS(f"Imported {len(created)} zone(s)."))
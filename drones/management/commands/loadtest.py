@@ -0,0 +1,138 @@
+import http.client
+import json
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_ENDPOINTS = [
+    "/api/drones",
+    "/api/drones/online",
+    "/api/drones/online/count",
+    "/api/drones/dangerous",
+    "/api/drones/conflicts",
+    "/api/drones/nearby?lat=31.95&lon=35.91",
+]
+
+
+def _default_url() -> str:
+    # The address gunicorn binds (gunicorn.conf.py), reached locally.
+    host, _, port = os.environ.get("WEB_BIND", "0.0.0.0:8000").rpartition(":")
+    if not port.isdigit():
+        port = "8000"
+    if host in ("", "0.0.0.0", "[::]", "unix"):
+        host = "127.0.0.1"
+    return f"http://{host}:{port}"
+
+
+def _percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(int(len(samples) * q), len(samples) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "HTTP load test against a running server: keep-alive clients hit the drone endpoints "
+        "round-robin and report throughput and latency percentiles per endpoint."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default=_default_url(), help="Server base URL (default: WEB_BIND).")
+        parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run.")
+        parser.add_argument("--concurrency", type=int, default=16, help="Concurrent keep-alive clients.")
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            help="Path (with query) to request; repeatable (default: the drone list endpoints).",
+        )
+        parser.add_argument("--serial", action="append", default=[], help="Also hit /path and /stats of this drone.")
+        parser.add_argument("--username", help="Obtain a JWT first (for authenticated endpoints).")
+        parser.add_argument("--password", default="")
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise CommandError("--url must be an http(s) URL.")
+        conn_cls = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        port = url.port or (443 if url.scheme == "https" else 80)
+        base = url.path.rstrip("/")
+
+        endpoints = list(options["endpoint"] or DEFAULT_ENDPOINTS)
+        for serial in options["serial"]:
+            endpoints += [f"/api/drones/{serial}/path", f"/api/drones/{serial}/stats"]
+
+        headers = {"Accept": "application/json"}
+        if options["username"]:
+            conn = conn_cls(url.hostname, port, timeout=10)
+            body = json.dumps({"username": options["username"], "password": options["password"]})
+            conn.request("POST", f"{base}/api/token/", body=body, headers={"Content-Type": "application/json"})
+            res = conn.getresponse()
+            data = res.read()
+            if res.status != 200:
+                raise CommandError(f"Token request failed ({res.status}): {data[:200]!r}")
+            headers["Authorization"] = f"Bearer {json.loads(data)['access']}"
+
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        lock = threading.Lock()
+        deadline = time.monotonic() + options["duration"]
+
+        def client(offset: int):
+            conn = conn_cls(url.hostname, port, timeout=30)
+            local = defaultdict(list)
+            local_errors = defaultdict(int)
+            i = offset
+            while time.monotonic() < deadline:
+                path = endpoints[i % len(endpoints)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    conn.request("GET", base + path, headers=headers)
+                    res = conn.getresponse()
+                    res.read()
+                    ok = res.status < 400
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    conn = conn_cls(url.hostname, port, timeout=30)
+                    ok = False
+                    time.sleep(0.05)
+                if ok:
+                    local[path].append(time.perf_counter() - started)
+                else:
+                    local_errors[path] += 1
+            conn.close()
+            with lock:
+                for path, samples in local.items():
+                    latencies[path].extend(samples)
+                for path, n in local_errors.items():
+                    errors[path] += n
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=client, args=(k,), daemon=True) for k in range(options["concurrency"])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - started
+
+        total = sum(len(v) for v in latencies.values())
+        self.stdout.write(
+            f"{options['concurrency']} clients, {elapsed:.1f}s: {total} ok, {sum(errors.values())} errors, "
+            f"{total / elapsed:.0f} req/s"
+        )
+        self.stdout.write(f"{'endpoint':<48} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for path in endpoints:
+            samples = latencies.get(path, [])
+            self.stdout.write(
+                f"{path[:48]:<48} {len(samples) / elapsed:>8.0f} "
+                f"{(statistics.median(samples) if samples else 0) * 1000:>8.1f} "
+                f"{_percentile(samples, 0.95) * 1000:>8.1f} {_percentile(samples, 0.99) * 1000:>8.1f} "
+                f"{errors.get(path, 0):>7}"
+            )
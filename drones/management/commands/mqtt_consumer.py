@@ -1,113 +1,95 @@
-import json
-import re
+import logging
 import socket
+import threading
 import time
-from typing import Any, Optional
 
 import paho.mqtt.client as mqtt
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import close_old_connections
 from django.utils import timezone
 
-from drones.models import Drone, DroneTelemetryPoint
-from drones.services.danger import DangerClassifier, DroneState, HeightRule, SpeedRule
-from drones.services.geofence import check_geofence
+from drones.services.conflicts import detect_conflicts
+from drones.services.ingest import TRANSIENT_DB_ERRORS, SpooledIngestor, TelemetryIngestor
+from drones.services.presence import sweep_presence
+from drones.services.profiling import Profiler
+from drones.services.reevaluate import reevaluate_fleet
+from drones.services.startup import StartupTimer, migrate_if_needed
 
-TOPIC_RE = re.compile(r"^thing/product/(?P<serial>[^/]+)/osd$")
-
-
-def safe_float(value: Any) -> Optional[float]:
-    try:
-        if value is None:
-            return None
-        return float(value)
-    except (TypeError, ValueError):
-        return None
+logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
     help = "Run MQTT consumer to ingest drone telemetry"
 
-    def handle(self, *args, **options):
-        classifier = DangerClassifier(
-            rules=[
-                HeightRule(settings.DANGEROUS_HEIGHT_M),
-                SpeedRule(settings.DANGEROUS_SPEED_MS),
-            ]
+    # System checks import the URLconf (every view, DRF, drf-spectacular); a worker serves no HTTP.
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--migrate",
+            action="store_true",
+            help="Apply pending migrations first (a no-op when the schema is current).",
+        )
+        parser.add_argument(
+            "--reevaluate",
+            action="store_true",
+            help="Re-classify the whole fleet in the background once connected.",
+        )
+        parser.add_argument(
+            "--profile",
+            type=float,
+            default=None,
+            metavar="RATE",
+            help="Fraction of messages to profile, 0..1 (default: PROFILE_INGEST_RATE).",
+        )
+        parser.add_argument(
+            "--cprofile",
+            action="store_true",
+            default=None,
+            help="Also cProfile sampled messages (default: PROFILE_CPROFILE).",
         )
 
+    def handle(self, *args, **options):
+        timer = StartupTimer()
+        if options["migrate"]:
+            applied = migrate_if_needed()
+            if applied:
+                self.stdout.write(f"Applied {len(applied)} migration(s)")
+            timer.phase("migrations")
+
+        ingestor = TelemetryIngestor()
+        spooled = SpooledIngestor.from_settings(ingestor)
+        profiler = Profiler.from_settings("ingest", rate=options["profile"], use_cprofile=options["cprofile"])
+        if profiler.enabled:
+            self.stdout.write(f"Profiling {profiler.rate:.0%} of messages (cProfile: {profiler.use_cprofile})")
+
         # Paho 2.x: safer callback API usage
         client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
 
+        started = threading.Event()
+
         def on_connect(c, userdata, flags, rc, properties=None):
             if rc == 0:
                 self.stdout.write(self.style.SUCCESS("Connected to MQTT broker"))
-                c.subscribe(settings.MQTT_TOPIC)
-                self.stdout.write(self.style.SUCCESS(f"Subscribed to {settings.MQTT_TOPIC}"))
+                topics = [t for t in (settings.MQTT_TOPIC, settings.MQTT_BINARY_TOPIC) if t]
+                c.subscribe([(t, 0) for t in topics])
+                self.stdout.write(self.style.SUCCESS(f"Subscribed to {', '.join(topics)}"))
+                if not started.is_set():
+                    started.set()
+                    timer.phase("connect")
+                    self.stdout.write(timer.summary())
+                    if options["reevaluate"]:
+                        threading.Thread(target=reevaluate, name="fleet-reevaluation", daemon=True).start()
             else:
                 self.stdout.write(self.style.ERROR(f"MQTT connect failed with rc={rc}"))
 
         def on_message(c, userdata, msg):
-            m = TOPIC_RE.match(msg.topic)
-            if not m:
-                return
-
-            serial = m.group("serial")
-
-            try:
-                payload = json.loads(msg.payload.decode("utf-8"))
-            except Exception:
-                return  # ignore invalid JSON
-
-            lat = safe_float(payload.get("latitude"))
-            lon = safe_float(payload.get("longitude"))
-            height = safe_float(payload.get("height"))
-            hspeed = safe_float(payload.get("horizontal_speed"))
-
-            now = timezone.now()
-
-            reasons = classifier.classify(DroneState(height=height, horizontal_speed=hspeed))
-
-            if lat is not None and lon is not None:
-                geofence_reason = check_geofence(lat, lon)
-                if geofence_reason:
-                    reasons.append(geofence_reason)
-
-            reasons = list(dict.fromkeys(reasons))
-            is_dangerous = bool(reasons)
-
-            with transaction.atomic():
-                drone, _ = Drone.objects.get_or_create(
-                    serial=serial,
-                    defaults={"last_seen_at": now},
-                )
-
-                drone.latitude = lat
-                drone.longitude = lon
-                drone.height = height
-                drone.horizontal_speed = hspeed
-                drone.last_seen_at = now
-                drone.is_dangerous = is_dangerous
-                drone.danger_reasons = reasons
-                drone.last_payload = payload
-
-                drone.save(update_fields=[
-                    "latitude", "longitude", "height", "horizontal_speed",
-                    "last_seen_at", "is_dangerous", "danger_reasons",
-                    "last_payload",
-                    "updated_at",
-                ])
-
-                if lat is not None and lon is not None:
-                    DroneTelemetryPoint.objects.create(
-                        drone=drone,
-                        timestamp=now,
-                        latitude=lat,
-                        longitude=lon,
-                        height=height,
-                        horizontal_speed=hspeed,
-                    )
+            with profiler.sample("message"):
+                if spooled is not None:
+                    spooled.submit(msg.topic, msg.payload, timezone.now())
+                else:
+                    ingestor.handle_message(msg.topic, msg.payload)
 
         def connect_with_retry(host: str, port: int, attempts: int = 30, sleep_s: float = 1.0):
             last_err: Exception | None = None
@@ -120,8 +102,99 @@ class Command(BaseCommand):
                     time.sleep(sleep_s)
             raise last_err or RuntimeError("MQTT connect failed")
 
+        def reevaluate():
+            try:
+                close_old_connections()
+                result = reevaluate_fleet()
+                self.stdout.write(f"Fleet re-evaluated: {result.checked} checked, {result.changed} changed")
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Fleet re-evaluation failed: {e}"))
+            finally:
+                close_old_connections()
+
+        def sweep_forever(interval: float):
+            while True:
+                time.sleep(interval)
+                try:
+                    close_old_connections()
+                    sweep_presence()
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f"Presence sweep failed: {e}"))
+
+        def detect_conflicts_forever(interval: float):
+            while True:
+                time.sleep(interval)
+                try:
+                    close_old_connections()
+                    detect_conflicts()
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f"Conflict detection failed: {e}"))
+
+        def replay_forever(interval: float, batch_size: int):
+            backoff = interval
+            while True:
+                time.sleep(backoff)
+                try:
+                    close_old_connections()
+                    with profiler.sample("replay"):
+                        n = spooled.drain(batch_size)
+                    if n and spooled.mode == "fallback":
+                        self.stdout.write(self.style.SUCCESS(f"Replayed {n} spooled frames"))
+                    backoff = interval
+                except TRANSIENT_DB_ERRORS as e:
+                    backoff = min(backoff * 2, 30.0)
+                    self.stdout.write(self.style.ERROR(f"Spool replay failed (retry in {backoff:g}s): {e}"))
+                except Exception:
+                    # Keep the thread alive: without it, fallback mode would spool every frame from now on.
+                    backoff = min(backoff * 2, 30.0)
+                    logger.exception("Spool replay crashed (retry in %gs)", backoff)
+
+        def report_stats_forever(interval: float):
+            while True:
+                time.sleep(interval)
+                counts = ingestor.stats.snapshot(reset=True)
+                if spooled is not None:
+                    depth = spooled.spool.stats()
+                    if depth["bytes"] or depth["dropped"] or depth["dead_lettered"]:
+                        counts.update({f"spool_{k}": v for k, v in depth.items()})
+                if counts:
+                    summary = " ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+                    self.stdout.write(f"[ingest {interval:g}s] {summary}")
+
         client.on_connect = on_connect
         client.on_message = on_message
 
+        if settings.PRESENCE_SWEEP_SECONDS > 0:
+            threading.Thread(
+                target=sweep_forever,
+                args=(settings.PRESENCE_SWEEP_SECONDS,),
+                name="presence-sweeper",
+                daemon=True,
+            ).start()
+
+        if settings.CONFLICT_DETECT_SECONDS > 0:
+            threading.Thread(
+                target=detect_conflicts_forever,
+                args=(settings.CONFLICT_DETECT_SECONDS,),
+                name="conflict-detector",
+                daemon=True,
+            ).start()
+
+        if spooled is not None:
+            threading.Thread(
+                target=replay_forever,
+                args=(settings.INGEST_SPOOL_REPLAY_SECONDS, settings.INGEST_SPOOL_REPLAY_BATCH),
+                name="spool-replay",
+                daemon=True,
+            ).start()
+
+        if settings.INGEST_STATS_LOG_SECONDS > 0:
+            threading.Thread(
+                target=report_stats_forever,
+                args=(settings.INGEST_STATS_LOG_SECONDS,),
+                name="ingest-stats",
+                daemon=True,
+            ).start()
+
         connect_with_retry(settings.MQTT_BROKER_HOST, settings.MQTT_BROKER_PORT)
         client.loop_forever()
@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from drones.services.presence import sweep_presence
+
+
+class Command(BaseCommand):
+    help = "Keep Drone.is_online in sync with last_seen_at and emit online/offline transitions."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.PRESENCE_SWEEP_SECONDS,
+            help="Seconds between sweeps (default: PRESENCE_SWEEP_SECONDS).",
+        )
+        parser.add_argument("--once", action="store_true", help="Run a single sweep and exit.")
+
+    def handle(self, *args, **options):
+        interval = max(options["interval"], 0.5)
+        while True:
+            came_online, went_offline = sweep_presence()
+            if came_online or went_offline:
+                self.stdout.write(f"online +{len(came_online)} / offline +{len(went_offline)}")
+            if options["once"]:
+                return
+            time.sleep(interval)
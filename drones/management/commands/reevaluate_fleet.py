@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from drones.services.reevaluate import reevaluate_fleet
+
+
+class Command(BaseCommand):
+    help = "Re-classify every drone against the current danger rules and no-fly zones."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        result = reevaluate_fleet(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {result.checked} drone(s); {result.changed} changed, {result.skipped} skipped (written meanwhile)."
+        ))
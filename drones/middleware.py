@@ -0,0 +1,25 @@
+from django.core.exceptions import MiddlewareNotUsed
+
+from drones.services.profiling import Profiler
+
+
+class ProfilingMiddleware:
+    """
+    Samples PROFILE_API_RATE of requests (see drones/services/profiling.py)
+    and aggregates them per "<METHOD> <route>". Removed from the middleware
+    chain entirely when the rate is 0.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.profiler = Profiler.from_settings("api")
+        if not self.profiler.enabled:
+            raise MiddlewareNotUsed()
+
+    def __call__(self, request):
+        with self.profiler.sample(f"{request.method} {request.path}") as sample:
+            response = self.get_response(request)
+            match = getattr(request, "resolver_match", None)
+            if sample is not None and match is not None:
+                sample.key = f"{request.method} /{match.route}"
+        return response
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0006_noflyzone_polygon_noflyzone_shape_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='noflyzone',
+            name='polygon_simplified',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='noflyzone',
+            name='simplify_tolerance_deg',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0007_noflyzone_polygon_simplified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drone',
+            name='drone_class',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.CreateModel(
+            name='DangerRuleDefinition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64)),
+                ('field', models.CharField(choices=[('height', 'Height (m)'), ('horizontal_speed', 'Horizontal speed (m/s)'), ('vertical_speed', 'Vertical speed (m/s)'), ('battery_percent', 'Battery level (%)')], max_length=32)),
+                ('operator', models.CharField(choices=[('gt', '>'), ('gte', '>='), ('lt', '<'), ('lte', '<=')], max_length=8)),
+                ('threshold', models.FloatField()),
+                ('reason', models.CharField(blank=True, help_text="Defaults to '<field> <op> <threshold>'.", max_length=128)),
+                ('drone_class', models.CharField(blank=True, default='', max_length=64)),
+                ('active_from', models.DateTimeField(blank=True, null=True)),
+                ('active_until', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('zone', models.ForeignKey(blank=True, help_text='Only applies while the drone is inside this zone.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='danger_rules', to='drones.noflyzone')),
+            ],
+            options={
+                'ordering': ['name', 'drone_class'],
+                'constraints': [models.UniqueConstraint(fields=('name', 'drone_class'), name='uniq_danger_rule_name_class')],
+            },
+        ),
+    ]
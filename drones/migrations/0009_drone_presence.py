@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0008_danger_rule_definition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drone',
+            name='is_online',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='drone',
+            index=models.Index(condition=models.Q(('latitude__isnull', False), ('longitude__isnull', False)), fields=['last_seen_at'], name='drone_seen_located_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drone',
+            index=models.Index(condition=models.Q(('is_online', True)), fields=['serial'], name='drone_online_serial_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_payloads_forward(apps, schema_editor):
+    Drone = apps.get_model("drones", "Drone")
+    DroneOSDPayload = apps.get_model("drones", "DroneOSDPayload")
+    db = schema_editor.connection.alias
+    rows = []
+    for d in Drone.objects.using(db).exclude(last_payload={}).only("id", "last_payload", "last_seen_at", "updated_at").iterator():
+        rows.append(
+            DroneOSDPayload(
+                drone_id=d.id,
+                payload=d.last_payload,
+                received_at=d.last_seen_at or d.updated_at,
+            )
+        )
+    DroneOSDPayload.objects.using(db).bulk_create(rows, batch_size=1000)
+
+
+def copy_payloads_backward(apps, schema_editor):
+    Drone = apps.get_model("drones", "Drone")
+    DroneOSDPayload = apps.get_model("drones", "DroneOSDPayload")
+    db = schema_editor.connection.alias
+    for p in DroneOSDPayload.objects.using(db).iterator():
+        Drone.objects.using(db).filter(id=p.drone_id).update(last_payload=p.payload)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0009_drone_presence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DroneOSDPayload',
+            fields=[
+                ('drone', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='osd', serialize=False, to='drones.drone')),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('received_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(copy_payloads_forward, copy_payloads_backward),
+        migrations.RemoveField(
+            model_name='drone',
+            name='last_payload',
+        ),
+    ]
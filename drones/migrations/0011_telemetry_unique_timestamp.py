@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:05
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def drop_duplicate_points(apps, schema_editor):
+    # Keep the first row of every (drone, timestamp) group so the unique
+    # constraint can be created.
+    DroneTelemetryPoint = apps.get_model("drones", "DroneTelemetryPoint")
+    points = DroneTelemetryPoint.objects.using(schema_editor.connection.alias)
+    keep = points.values("drone_id", "timestamp").annotate(keep=Min("id")).values("keep")
+    points.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0010_drone_osd_payload'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_points, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='dronetelemetrypoint',
+            name='drones_dron_drone_i_b5957b_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='dronetelemetrypoint',
+            constraint=models.UniqueConstraint(fields=('drone', 'timestamp'), name='telemetry_drone_ts_uniq'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0011_telemetry_unique_timestamp'),
+    ]
+
+    # Existing points keep grid_cell NULL: backfilling the largest table here would hold the
+    # migration's lock for the whole run. Fill them with `manage.py backfill_grid_cells`.
+    operations = [
+        migrations.AddField(
+            model_name='dronetelemetrypoint',
+            name='grid_cell',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='dronetelemetrypoint',
+            index=models.Index(fields=['grid_cell', 'timestamp'], name='telemetry_cell_ts_idx'),
+        ),
+    ]
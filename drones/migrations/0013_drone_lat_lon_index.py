@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0012_telemetry_grid_cell'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='drone',
+            index=models.Index(fields=['latitude', 'longitude'], name='drone_lat_lon_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drones', '0013_drone_lat_lon_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='drone',
+            name='drone_online_serial_idx',
+        ),
+        migrations.AddIndex(
+            model_name='drone',
+            index=models.Index(condition=models.Q(('is_online', True), ('latitude__isnull', False), ('longitude__isnull', False)), fields=['serial'], name='drone_online_located_idx'),
+        ),
+    ]
@@ -5,6 +5,8 @@ from django.utils import timezone
 
 class Drone(models.Model):
     serial = models.CharField(max_length=128, unique=True, db_index=True)
+    # Used to select per-class danger rule overrides ("" = default class)
+    drone_class = models.CharField(max_length=64, blank=True, default="")
 
     # current state
     latitude = models.FloatField(null=True, blank=True)
@@ -14,8 +16,9 @@ class Drone(models.Model):
 
     # tracking
     last_seen_at = models.DateTimeField(null=True, blank=True)
-
-    last_payload = models.JSONField(default=dict, blank=True)
+    # Materialized presence: set on ingest, cleared by the presence sweeper
+    # once last_seen_at falls outside ONLINE_WINDOW_SECONDS.
+    is_online = models.BooleanField(default=False)
 
     # dangerous classification
     is_dangerous = models.BooleanField(default=False)
@@ -31,9 +34,36 @@ class Drone(models.Model):
         permissions = [
             ("mark_safe", "Can mark drone as safe"),
         ]
+        indexes = [
+            # Online window queries: range scan on last_seen_at for located drones.
+            models.Index(
+                fields=["last_seen_at"],
+                name="drone_seen_located_idx",
+                condition=models.Q(latitude__isnull=False, longitude__isnull=False),
+            ),
+            # Small index over located online drones only (online count, conflict detection).
+            models.Index(
+                fields=["serial"],
+                name="drone_online_located_idx",
+                condition=models.Q(is_online=True, latitude__isnull=False, longitude__isnull=False),
+            ),
+            # Bounding-box prefilter of the nearby endpoint.
+            models.Index(fields=["latitude", "longitude"], name="drone_lat_lon_idx"),
+        ]
 
 
 
+# Latest raw OSD payload per drone, kept off the hot Drone row
+# (see drones/services/osd_store.py)
+class DroneOSDPayload(models.Model):
+    drone = models.OneToOneField(Drone, on_delete=models.CASCADE, primary_key=True, related_name="osd")
+    payload = models.JSONField(default=dict, blank=True)
+    received_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.drone_id} @ {self.received_at.isoformat()}"
+
+
 class DroneTelemetryPoint(models.Model):
     drone = models.ForeignKey(Drone, on_delete=models.CASCADE, related_name="telemetry_points")
 
@@ -42,12 +72,21 @@ class DroneTelemetryPoint(models.Model):
     longitude = models.FloatField()
     height = models.FloatField(null=True, blank=True)
     horizontal_speed = models.FloatField(null=True, blank=True)
+    # Spatial grid cell of (latitude, longitude), see drones/services/grid.py
+    grid_cell = models.BigIntegerField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         indexes = [
-            models.Index(fields=["drone", "timestamp"]),
+            # "Which drones were near P between t1 and t2": cell ranges + time range.
+            models.Index(fields=["grid_cell", "timestamp"], name="telemetry_cell_ts_idx"),
+        ]
+        constraints = [
+            # One fix per drone and device timestamp: QoS 1 retransmissions
+            # are dropped by the insert (ignore_conflicts), and the unique
+            # index serves the (drone, timestamp) path queries.
+            models.UniqueConstraint(fields=["drone", "timestamp"], name="telemetry_drone_ts_uniq"),
         ]
         ordering = ["timestamp"]
 
@@ -75,6 +114,10 @@ class NoFlyZone(models.Model):
     # Polygon fields (used when shape == "polygon")
     # Stored as list of [lon, lat] pairs (GeoJSON style)
     polygon = models.JSONField(default=list, blank=True)
+    # Simplified copy of `polygon` for large rings (empty when not simplified).
+    # Every edge of `polygon` lies within `simplify_tolerance_deg` of it.
+    polygon_simplified = models.JSONField(default=list, blank=True)
+    simplify_tolerance_deg = models.FloatField(null=True, blank=True)
 
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(default=timezone.now)
@@ -87,4 +130,50 @@ class NoFlyZone(models.Model):
     def __str__(self) -> str:
         if self.shape == self.SHAPE_CIRCLE:
             return f"{self.name} (circle)"
-        return f"{self.name} (polygon)"
\ No newline at end of file
+        return f"{self.name} (polygon)"
+
+
+# Danger rules defined as data (see drones/services/rules.py)
+class DangerRuleDefinition(models.Model):
+    FIELD_CHOICES = [
+        ("height", "Height (m)"),
+        ("horizontal_speed", "Horizontal speed (m/s)"),
+        ("vertical_speed", "Vertical speed (m/s)"),
+        ("battery_percent", "Battery level (%)"),
+    ]
+    OPERATOR_CHOICES = [
+        ("gt", ">"),
+        ("gte", ">="),
+        ("lt", "<"),
+        ("lte", "<="),
+    ]
+
+    # Rules sharing a name override each other: a class-specific rule replaces
+    # the default-class one, and a DB rule replaces a DANGER_RULES settings rule.
+    name = models.CharField(max_length=64)
+    field = models.CharField(max_length=32, choices=FIELD_CHOICES)
+    operator = models.CharField(max_length=8, choices=OPERATOR_CHOICES)
+    threshold = models.FloatField()
+    reason = models.CharField(max_length=128, blank=True, help_text="Defaults to '<field> <op> <threshold>'.")
+
+    # Optional scoping
+    drone_class = models.CharField(max_length=64, blank=True, default="")
+    zone = models.ForeignKey(
+        NoFlyZone, null=True, blank=True, on_delete=models.CASCADE, related_name="danger_rules",
+        help_text="Only applies while the drone is inside this zone.",
+    )
+    active_from = models.DateTimeField(null=True, blank=True)
+    active_until = models.DateTimeField(null=True, blank=True)
+
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["name", "drone_class"], name="uniq_danger_rule_name_class"),
+        ]
+        ordering = ["name", "drone_class"]
+
+    def __str__(self) -> str:
+        scope = f" [{self.drone_class}]" if self.drone_class else ""
+        return f"{self.name}{scope}: {self.field} {self.get_operator_display()} {self.threshold}"
@@ -1,19 +1,32 @@
+from django.conf import settings
 from rest_framework.permissions import BasePermission
+
 from drones.models import Drone
+from drones.services.auth_cache import PERMS_CLAIM, get_cached_permissions
+
+
+def has_drone_perm(request, codename: str) -> bool:
+    """
+    Check a drones permission without hitting the DB when possible:
+    - JWT_STATELESS_AUTH on and the token carries the perms claim: use the claim.
+    - otherwise: use the user's permission set from the in-process cache.
+    """
+    if not request.user or not request.user.is_authenticated:
+        return False
+
+    payload = getattr(request.auth, "payload", None)
+    if settings.JWT_STATELESS_AUTH and isinstance(payload, dict) and PERMS_CLAIM in payload:
+        return codename in payload[PERMS_CLAIM]
+
+    app_label = Drone._meta.app_label
+    return f"{app_label}.{codename}" in get_cached_permissions(request.user.pk)
+
 
 class CanMarkDroneSafe(BasePermission):
     def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-
-        app_label = Drone._meta.app_label
-        return request.user.has_perm(f"{app_label}.mark_safe")
+        return has_drone_perm(request, "mark_safe")
 
 
 class CanModifySettings(BasePermission):
     def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-
-        app_label = Drone._meta.app_label
-        return request.user.has_perm(f"{app_label}.modify_settings")
+        return has_drone_perm(request, "modify_settings")
@@ -0,0 +1,25 @@
+from django.db import DEFAULT_DB_ALIAS
+
+from drones.services.replica import current_read_alias, replica_alias
+
+
+class ReadReplicaRouter:
+    """
+    Writes always go to the primary; reads go wherever the enclosing
+    use_replica() block chose (see drones/services/replica.py), and to the
+    primary outside one.
+    """
+
+    def db_for_read(self, model, **hints):
+        return current_read_alias()
+
+    def db_for_write(self, model, **hints):
+        # Explicit, or Django would save an instance back to the database it was read from.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
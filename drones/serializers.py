@@ -1,5 +1,15 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
 from drones.models import Drone, NoFlyZone
+from drones.services.auth_cache import PERMS_CLAIM, permission_claims
+from drones.services.export import EXPORT_FORMATS
+from drones.services.polygons import prepare_polygon, validate_ring
 
 
 class DroneSerializer(serializers.ModelSerializer):
@@ -41,6 +51,110 @@ class QueryNearbySerializer(serializers.Serializer):
         return value
 
 
+class QueryTrackStatsSerializer(serializers.Serializer):
+    """
+    Query params for stats endpoint:
+    /api/drones/{serial}/stats?since=..&until=..
+    """
+    since = serializers.DateTimeField(required=False, help_text="Window start (default: start of today).")
+    until = serializers.DateTimeField(required=False, help_text="Window end, exclusive (default: open).")
+
+    def validate(self, attrs):
+        since, until = attrs.get("since"), attrs.get("until")
+        if since and until and until <= since:
+            raise serializers.ValidationError("until must be after since")
+        return attrs
+
+
+class DroneTrackStatsSerializer(serializers.Serializer):
+    """
+    Response schema for:
+    GET /api/drones/{serial}/stats
+    """
+    serial = serializers.CharField()
+    since = serializers.DateTimeField()
+    until = serializers.DateTimeField(allow_null=True)
+    points = serializers.IntegerField()
+    distance_km = serializers.FloatField(help_text="Sum of great-circle distances between consecutive points.")
+    max_height = serializers.FloatField(allow_null=True)
+    avg_height = serializers.FloatField(allow_null=True)
+    max_speed = serializers.FloatField(allow_null=True)
+    avg_speed = serializers.FloatField(allow_null=True)
+    online_seconds = serializers.FloatField(
+        help_text="Time covered by consecutive points at most ONLINE_WINDOW_SECONDS apart."
+    )
+    first_point_at = serializers.DateTimeField(allow_null=True)
+    last_point_at = serializers.DateTimeField(allow_null=True)
+
+
+class QueryTelemetryExportSerializer(serializers.Serializer):
+    """
+    Query params for export endpoint:
+    /api/telemetry/export?serials=A,B&since=..&until=..&file_format=csv
+
+    ("format" is reserved by DRF for renderer selection.)
+    """
+    serials = serializers.CharField(required=False, allow_blank=True, help_text="Comma-separated serials (default: all).")
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False, help_text="Exclusive.")
+    file_format = serializers.CharField(required=False, default="csv", help_text="csv, ndjson, parquet or arrow.")
+
+    def validate_serials(self, value: str):
+        return [s.strip() for s in value.split(",") if s.strip()]
+
+    def validate_file_format(self, value: str) -> str:
+        if value not in EXPORT_FORMATS:
+            raise serializers.ValidationError(f"file_format must be one of {sorted(EXPORT_FORMATS)}")
+        return value
+
+    def validate(self, attrs):
+        since, until = attrs.get("since"), attrs.get("until")
+        if since and until and until <= since:
+            raise serializers.ValidationError("until must be after since")
+        return attrs
+
+
+class QueryHistoryNearbySerializer(QueryNearbySerializer):
+    """
+    Query params for historical nearby endpoint:
+    /api/telemetry/nearby?lat=..&lon=..&radius_km=..&since=..&until=..
+    """
+    radius_km = serializers.FloatField(required=False, help_text="Search radius (default: NEARBY_RADIUS_KM).")
+    since = serializers.DateTimeField()
+    until = serializers.DateTimeField(help_text="Exclusive.")
+
+    def validate_radius_km(self, value: float) -> float:
+        max_km = float(settings.HISTORY_NEARBY_MAX_RADIUS_KM)
+        if value <= 0 or value > max_km:
+            raise serializers.ValidationError(f"radius_km must be > 0 and <= {max_km:g}")
+        return value
+
+    def validate(self, attrs):
+        if attrs["until"] <= attrs["since"]:
+            raise serializers.ValidationError("until must be after since")
+        return attrs
+
+
+class DroneClosestApproachSerializer(serializers.Serializer):
+    serial = serializers.CharField()
+    distance_km = serializers.FloatField()
+    at = serializers.DateTimeField(help_text="Time of the closest approach.")
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
+
+
+class DroneConflictSerializer(serializers.Serializer):
+    serial_a = serializers.CharField()
+    serial_b = serializers.CharField()
+    distance_m = serializers.FloatField(help_text="Horizontal (great-circle) distance.")
+    vertical_m = serializers.FloatField(allow_null=True, help_text="Height difference, null when a height is unknown.")
+
+
+class DroneOSDHistoryItemSerializer(serializers.Serializer):
+    received_at = serializers.DateTimeField()
+    osd = serializers.JSONField()
+
+
 class DroneOSDResponseSerializer(serializers.Serializer):
     """
     Response schema for:
@@ -49,6 +163,11 @@ class DroneOSDResponseSerializer(serializers.Serializer):
     serial = serializers.CharField()
     last_seen_at = serializers.DateTimeField(allow_null=True)
     osd = serializers.JSONField(help_text="Raw OSD payload published by the drone.")
+    history = DroneOSDHistoryItemSerializer(
+        many=True,
+        required=False,
+        help_text="Recent payloads, oldest first (only with ?history=true and OSD_HISTORY_SIZE > 0).",
+    )
 
 
 class NoFlyZoneSerializer(serializers.ModelSerializer):
@@ -84,27 +203,21 @@ class NoFlyZoneSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("radius_km must be > 0.")
             if polygon:
                 raise serializers.ValidationError("Circle zones must not include polygon points.")
+            attrs["polygon_simplified"] = []
+            attrs["simplify_tolerance_deg"] = None
 
         elif shape == NoFlyZone.SHAPE_POLYGON:
             if not isinstance(polygon, list) or len(polygon) < 3:
                 raise serializers.ValidationError(
                     "Polygon zones require polygon with at least 3 points."
                 )
-            for i, pt in enumerate(polygon):
-                if (
-                    not isinstance(pt, (list, tuple))
-                    or len(pt) != 2
-                    or not isinstance(pt[0], (int, float))
-                    or not isinstance(pt[1], (int, float))
-                ):
-                    raise serializers.ValidationError(
-                        f"polygon[{i}] must be [lon, lat] numbers."
-                    )
-                lon, lat = float(pt[0]), float(pt[1])
-                if not (-180 <= lon <= 180) or not (-90 <= lat <= 90):
-                    raise serializers.ValidationError(
-                        f"polygon[{i}] lon/lat out of range."
-                    )
+            try:
+                prepared = prepare_polygon(validate_ring(polygon))
+            except ValueError as e:
+                raise serializers.ValidationError(str(e))
+            attrs["polygon"] = prepared.ring
+            attrs["polygon_simplified"] = prepared.simplified
+            attrs["simplify_tolerance_deg"] = prepared.tolerance_deg
 
             if center_lat is not None or center_lon is not None or radius_km is not None:
                 raise serializers.ValidationError(
@@ -113,4 +226,42 @@ class NoFlyZoneSerializer(serializers.ModelSerializer):
         else:
             raise serializers.ValidationError("Invalid shape. Use 'circle' or 'polygon'.")
 
-        return attrs
\ No newline at end of file
+        return attrs
+
+
+def _with_perm_claims(access: str, user) -> str:
+    token = AccessToken(access)
+    token[PERMS_CLAIM] = permission_claims(user)
+    return str(token)
+
+
+class DroneTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Adds the user's drone permission codenames to the access token
+    (claim "perms"), so permission checks can skip the DB.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        data["access"] = _with_perm_claims(data["access"], self.user)
+        return data
+
+
+class DroneTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Re-reads the user's permissions on refresh, so claims are never older
+    than one access-token lifetime.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data["access"])
+        user = (
+            get_user_model().objects
+            .filter(**{jwt_settings.USER_ID_FIELD: access[jwt_settings.USER_ID_CLAIM]})
+            .first()
+        )
+        if user is None or not user.is_active:
+            raise AuthenticationFailed("No active account found for the given token.", "no_active_account")
+        data["access"] = _with_perm_claims(data["access"], user)
+        return data
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, FrozenSet, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+# Access-token claim carrying the drone permission codenames of the user.
+PERMS_CLAIM = "perms"
+CLAIMABLE_PERMS = ("mark_safe", "modify_settings")
+APP_LABEL = "drones"
+
+
+class _TTLCache:
+    """
+    Tiny thread-safe per-process cache with a fixed time-to-live.
+
+    Holds at most `max_entries` keys, least recently used first out. Values
+    are shared between threads, so only immutable data should be cached.
+    """
+
+    def __init__(self):
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Any, loader: Callable[[], Any], ttl: float, max_entries: int) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None and hit[0] > now:
+                self._data.move_to_end(key)
+                return hit[1]
+        value = loader()
+        if ttl > 0 and max_entries > 0:
+            with self._lock:
+                self._data[key] = (now + ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > max_entries:
+                    self._data.popitem(last=False)
+        return value
+
+    def invalidate(self, key: Any = None) -> None:
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+_users = _TTLCache()
+_permissions = _TTLCache()
+
+
+def _ttl() -> float:
+    return float(getattr(settings, "AUTH_CACHE_SECONDS", 30))
+
+
+def _max_entries() -> int:
+    return int(getattr(settings, "AUTH_CACHE_MAX_ENTRIES", 10_000))
+
+
+def _user_row(user) -> Tuple[str, Tuple[str, ...], Tuple[Any, ...]]:
+    fields = user._meta.concrete_fields
+    return user._state.db, tuple(f.attname for f in fields), tuple(getattr(user, f.attname) for f in fields)
+
+
+def get_cached_user(user_id: Any, loader: Callable[[], Any]) -> Any:
+    """
+    User for `user_id`, rebuilt from a cached row instead of queried.
+
+    The cache keeps the field values, not the instance: every request gets
+    its own User, so per-request state (attribute changes, permission
+    caches) never leaks between requests or threads.
+    """
+    db, names, values = _users.get_or_load(user_id, lambda: _user_row(loader()), _ttl(), _max_entries())
+    return get_user_model().from_db(db, names, values)
+
+
+def _load_permissions(user_id: Any) -> FrozenSet[str]:
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is None or not user.is_active:
+        return frozenset()
+    # Includes group permissions, and every permission for superusers.
+    return frozenset(user.get_all_permissions())
+
+
+def get_cached_permissions(user_id: Any) -> FrozenSet[str]:
+    """
+    "app_label.codename" permissions of a user, cached for AUTH_CACHE_SECONDS.
+    """
+    return _permissions.get_or_load(user_id, lambda: _load_permissions(user_id), _ttl(), _max_entries())
+
+
+def permission_claims(user) -> List[str]:
+    """
+    Drone permission codenames to embed in an access token for `user`.
+    """
+    return [c for c in CLAIMABLE_PERMS if user.has_perm(f"{APP_LABEL}.{c}")]
+
+
+def invalidate_auth_cache(user_id: Optional[Any] = None) -> None:
+    _users.invalidate(user_id)
+    _permissions.invalidate(user_id)
@@ -0,0 +1,96 @@
+"""
+Compact binary OSD formats, published on thing/product/<serial>/osd/<format>.
+
+"bin" (always available) is a fixed little-endian layout:
+
+    header  <4sBBH   magic b"SDT1", version (1), flags (0), fix count
+    fix     <dddffff timestamp (unix seconds), latitude, longitude,
+                     height, horizontal_speed, vertical_speed, battery_percent
+
+NaN marks a missing value (any non-finite value is read as missing). One frame can carry many fixes (40 bytes each,
+versus ~120 bytes for the equivalent JSON).
+
+"msgpack" is registered when the msgpack package is installed: a map, or an
+array of maps, with the same keys as the JSON payload.
+"""
+import math
+import struct
+from typing import Any, Callable, Dict, Iterable, List, Mapping
+
+try:  # optional
+    import msgpack
+except ImportError:  # pragma: no cover - depends on environment
+    msgpack = None
+
+MAGIC = b"SDT1"
+VERSION = 1
+HEADER = struct.Struct("<4sBBH")
+FIX = struct.Struct("<dddffff")
+FIX_FIELDS = (
+    "timestamp",
+    "latitude",
+    "longitude",
+    "height",
+    "horizontal_speed",
+    "vertical_speed",
+    "battery_percent",
+)
+
+# format name -> decoder(bytes-like) -> list of fix dicts
+BINARY_DECODERS: Dict[str, Callable[[Any], List[Dict[str, Any]]]] = {}
+
+
+def register_decoder(name: str):
+    def decorator(fn):
+        BINARY_DECODERS[name] = fn
+        return fn
+    return decorator
+
+
+@register_decoder("bin")
+def decode_struct_frame(buf: Any) -> List[Dict[str, Any]]:
+    """
+    Unpack a "bin" frame. Reads straight from a memoryview of the payload
+    (no intermediate copies). Raises ValueError on a malformed frame.
+    """
+    view = memoryview(buf)
+    if len(view) < HEADER.size:
+        raise ValueError("frame shorter than header")
+
+    magic, version, _flags, count = HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("unknown frame magic/version")
+
+    end = HEADER.size + count * FIX.size
+    if len(view) != end:
+        raise ValueError(f"frame length {len(view)} does not match {count} fixes")
+
+    isfinite = math.isfinite
+    fixes = []
+    for record in FIX.iter_unpack(view[HEADER.size:end]):
+        fixes.append({k: (v if isfinite(v) else None) for k, v in zip(FIX_FIELDS, record)})
+    return fixes
+
+
+def encode_struct_frame(fixes: Iterable[Mapping[str, Any]]) -> bytes:
+    """
+    Build a "bin" frame (used by device simulators and tests).
+    """
+    fixes = list(fixes)
+    out = bytearray(HEADER.pack(MAGIC, VERSION, 0, len(fixes)))
+    for fix in fixes:
+        out += FIX.pack(*(math.nan if fix.get(k) is None else float(fix[k]) for k in FIX_FIELDS))
+    return bytes(out)
+
+
+if msgpack is not None:
+    @register_decoder("msgpack")
+    def decode_msgpack(buf: Any) -> List[Dict[str, Any]]:
+        try:
+            data = msgpack.unpackb(buf, raw=False)
+        except Exception as e:
+            raise ValueError(str(e))
+        items = data if isinstance(data, list) else [data]
+        if not all(isinstance(item, dict) for item in items):
+            raise ValueError("msgpack frame must be a map or an array of maps")
+        return items
@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = "drones:api:version"
+
+_last_bump = 0.0
+
+
+def get_version() -> int:
+    """
+    Current drone-state version stamp. Read-only API responses are cached
+    under this stamp, so bumping it invalidates all of them at once.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_version(throttle: bool = False) -> None:
+    """
+    Invalidate cached drone responses.
+
+    throttle=True (used by the ingest pipeline) bumps at most once per
+    DRONE_API_CACHE_BUMP_INTERVAL_SECONDS per process, so a busy fleet does
+    not invalidate the cache on every single message.
+    """
+    global _last_bump
+    if throttle:
+        now = time.monotonic()
+        if now - _last_bump < float(getattr(settings, "DRONE_API_CACHE_BUMP_INTERVAL_SECONDS", 1.0)):
+            return
+        _last_bump = now
+
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Key missing (first bump or evicted): any fresh value invalidates.
+        cache.set(VERSION_KEY, int(time.time() * 1000), timeout=None)
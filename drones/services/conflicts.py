@@ -0,0 +1,187 @@
+"""
+Separation conflicts between drones.
+
+Positions are bucketed on a 3D grid over unit-sphere (ECEF) coordinates
+with a cell edge equal to the chord of MIN_SEPARATION_M, so a pair closer
+than the separation always sits in the same or an adjacent cell. Only those
+cells are compared, the comparison needs no trigonometry (squared chord vs
+a constant), and the grid has no antimeridian or pole special cases.
+"""
+import logging
+import math
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from drones.models import Drone
+from drones.services.cache_version import bump_version
+
+logger = logging.getLogger(__name__)
+
+CONFLICT_REASON = "separation_conflict"
+
+_EARTH_RADIUS_M = 6371000.0
+# Half of the 26 neighbour offsets: each adjacent cell pair is compared once.
+_FORWARD = [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1)
+    for dy in (-1, 0, 1)
+    for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+]
+
+
+@dataclass(frozen=True)
+class Conflict:
+    serial_a: str
+    serial_b: str
+    distance_m: float
+    vertical_m: Optional[float]
+
+
+def min_separation_m() -> float:
+    return float(getattr(settings, "MIN_SEPARATION_M", 50.0))
+
+
+def min_vertical_separation_m() -> float:
+    return float(getattr(settings, "MIN_VERTICAL_SEPARATION_M", 0.0))
+
+
+def find_conflicts(
+    positions: Iterable[Tuple[Hashable, float, float, Optional[float]]],
+    separation_m: Optional[float] = None,
+    vertical_m: Optional[float] = None,
+) -> List[Tuple[Hashable, Hashable, float, Optional[float]]]:
+    """
+    Pairs of (key, lat, lon, height) positions closer than separation_m
+    horizontally and, when vertical_m > 0, closer than vertical_m in height
+    (a missing height counts as close).
+
+    Returns (key_a, key_b, distance_m, vertical_m) tuples with keys in input order.
+    """
+    separation_m = min_separation_m() if separation_m is None else separation_m
+    vertical_m = min_vertical_separation_m() if vertical_m is None else vertical_m
+    if separation_m <= 0:
+        return []
+
+    chord = 2.0 * math.sin(min(separation_m / (2.0 * _EARTH_RADIUS_M), math.pi / 2))
+    limit = chord * chord
+    inv = 1.0 / chord
+
+    keys: List[Hashable] = []
+    heights: List[Optional[float]] = []
+    xs: List[float] = []
+    ys: List[float] = []
+    zs: List[float] = []
+    cells: Dict[Tuple[int, int, int], List[int]] = {}
+
+    for key, lat, lon, height in positions:
+        phi, lam = math.radians(lat), math.radians(lon)
+        cos_phi = math.cos(phi)
+        x, y, z = cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi)
+        cells.setdefault((int(math.floor(x * inv)), int(math.floor(y * inv)), int(math.floor(z * inv))), []).append(len(keys))
+        keys.append(key)
+        heights.append(height)
+        xs.append(x)
+        ys.append(y)
+        zs.append(z)
+
+    found = []
+
+    def close(i: int, j: int) -> None:
+        dx, dy, dz = xs[i] - xs[j], ys[i] - ys[j], zs[i] - zs[j]
+        d2 = dx * dx + dy * dy + dz * dz
+        if d2 >= limit:
+            return
+        hi, hj = heights[i], heights[j]
+        dh = abs(hi - hj) if hi is not None and hj is not None else None
+        if vertical_m > 0 and dh is not None and dh >= vertical_m:
+            return
+        distance = 2.0 * _EARTH_RADIUS_M * math.asin(min(math.sqrt(d2) / 2.0, 1.0))
+        a, b = (i, j) if i < j else (j, i)
+        found.append((keys[a], keys[b], distance, dh))
+
+    for (cx, cy, cz), members in cells.items():
+        n = len(members)
+        for a in range(n):
+            for b in range(a + 1, n):
+                close(members[a], members[b])
+        for ox, oy, oz in _FORWARD:
+            other = cells.get((cx + ox, cy + oy, cz + oz))
+            if other:
+                for i in members:
+                    for j in other:
+                        close(i, j)
+
+    found.sort(key=lambda c: c[2])
+    return found
+
+
+def current_conflicts() -> List[Conflict]:
+    """
+    Conflicts among online drones with a known position (read-only).
+    """
+    rows = (
+        Drone.objects
+        .filter(is_online=True, latitude__isnull=False, longitude__isnull=False)
+        .values_list("serial", "latitude", "longitude", "height")
+    )
+    return [Conflict(a, b, d, dh) for a, b, d, dh in find_conflicts(rows)]
+
+
+def with_conflict(reasons: Sequence[str], in_conflict: bool) -> List[str]:
+    """
+    reasons with CONFLICT_REASON added or removed. The detector owns that
+    reason; classification elsewhere carries it over with this helper.
+    """
+    reasons = [r for r in reasons if r != CONFLICT_REASON]
+    if in_conflict:
+        reasons.append(CONFLICT_REASON)
+    return reasons
+
+
+def detect_conflicts() -> List[Conflict]:
+    """
+    Find current conflicts and set/clear CONFLICT_REASON on the affected
+    drones. Rows are re-read under a row lock right before they are
+    written, so reasons set concurrently by ingest are kept.
+    """
+    rows = list(
+        Drone.objects
+        .filter(is_online=True, latitude__isnull=False, longitude__isnull=False)
+        .values_list("id", "serial", "latitude", "longitude", "height")
+    )
+    serials = {pk: serial for pk, serial, *_ in rows}
+    pairs = find_conflicts((pk, lat, lon, h) for pk, _, lat, lon, h in rows)
+
+    flagged: Set[int] = set()
+    for a, b, _, _ in pairs:
+        flagged.update((a, b))
+    previously = {
+        pk
+        for pk, reasons in Drone.objects.filter(is_dangerous=True).values_list("id", "danger_reasons")
+        if CONFLICT_REASON in (reasons or [])
+    }
+
+    to_check = flagged.symmetric_difference(previously)
+    if to_check:
+        now = timezone.now()
+        with transaction.atomic():
+            changed = []
+            for d in Drone.objects.select_for_update().filter(pk__in=to_check).only("id", "is_dangerous", "danger_reasons"):
+                reasons = with_conflict(d.danger_reasons or [], d.pk in flagged)
+                if reasons != list(d.danger_reasons or []):
+                    d.danger_reasons = reasons
+                    d.is_dangerous = bool(reasons)
+                    d.updated_at = now
+                    changed.append(d)
+            if changed:
+                Drone.objects.bulk_update(changed, ["is_dangerous", "danger_reasons", "updated_at"])
+        if changed:
+            bump_version()
+            logger.info("Separation conflicts: %d pair(s), %d drone(s) updated", len(pairs), len(changed))
+
+    return [Conflict(serials[a], serials[b], d, dh) for a, b, d, dh in pairs]
@@ -0,0 +1,128 @@
+import json
+import math
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.utils.dateparse import parse_datetime
+
+try:  # optional, much faster JSON parser
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+def _stdlib_loads(buf: Any) -> Any:
+    # json.loads accepts bytes directly (UTF-8/16/32 detection), no .decode() needed.
+    if isinstance(buf, memoryview):
+        buf = buf.tobytes()
+    # NaN/Infinity literals are not JSON (orjson rejects them, JSON columns too):
+    # keep them as strings, which extract_fields counts as bad fields.
+    return json.loads(buf, parse_constant=str)
+
+
+JSON_DECODERS: Dict[str, Callable[[Any], Any]] = {"json": _stdlib_loads}
+if orjson is not None:
+    JSON_DECODERS["orjson"] = orjson.loads
+
+
+def get_json_decoder(name: str = "auto") -> Callable[[Any], Any]:
+    """
+    Return a bytes -> object JSON decoder. "auto" prefers orjson when it is
+    installed. Decoders raise ValueError on malformed input.
+    """
+    if name == "auto":
+        return JSON_DECODERS.get("orjson", _stdlib_loads)
+    try:
+        return JSON_DECODERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown JSON decoder {name!r}; available: {sorted(JSON_DECODERS)}")
+
+
+def safe_float(value: Any) -> Optional[float]:
+    """
+    value as a finite float, or None ("nan", "inf" and overflowing ints included).
+    """
+    try:
+        if value is None:
+            return None
+        f = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return f if math.isfinite(f) else None
+
+
+# Fields of an OSD payload the ingest pipeline reads; everything else in the
+# payload is only stored raw. Danger-rule fields are added at runtime.
+OSD_POSITION_FIELDS: Tuple[str, ...] = ("latitude", "longitude", "height", "horizontal_speed")
+
+
+def extract_fields(payload: Dict[str, Any], fields: Iterable[str]) -> Tuple[Dict[str, Optional[float]], int]:
+    """
+    Pull the declared numeric fields out of a decoded payload.
+
+    Returns (values, bad) where values maps every field to a finite float or
+    None, and bad counts fields that were present but not numeric (NaN and
+    Infinity, as JSON literals or strings, included).
+    """
+    values: Dict[str, Optional[float]] = {}
+    bad = 0
+    get = payload.get
+    isfinite = math.isfinite
+    for name in fields:
+        v = get(name)
+        t = type(v)
+        if t is float and isfinite(v):
+            values[name] = v
+        elif v is None:
+            values[name] = None
+        else:
+            f = safe_float(v) if t is str or t is int or t is float else None
+            values[name] = f
+            if f is None:
+                bad += 1
+    return values, bad
+
+
+# Device clocks report unix seconds or milliseconds; anything above this is ms
+# (1e11 s is the year 5138).
+_MS_THRESHOLD = 1e11
+
+
+def device_time(value: Any) -> Optional[datetime]:
+    """
+    Device timestamp -> aware datetime, or None when absent/unusable.
+    Accepts unix seconds, unix milliseconds and ISO 8601 strings.
+    """
+    t = type(value)
+    if t is int or t is float:
+        ts = value / 1000.0 if abs(value) > _MS_THRESHOLD else value
+        try:
+            return datetime.fromtimestamp(ts, tz=dt_timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            return None
+    if t is str:
+        try:
+            dt = parse_datetime(value)
+        except ValueError:
+            return None
+        if dt is not None and dt.tzinfo is None:
+            dt = dt.replace(tzinfo=dt_timezone.utc)
+        return dt
+    return None
+
+
+def split_batch(data: Any) -> Optional[List[Dict[str, Any]]]:
+    """
+    Normalize a decoded OSD message into a list of fixes.
+
+    Accepts a single fix object, an array of fix objects, or
+    {"fixes": [...]}. Returns None when the message has any other shape.
+    """
+    if isinstance(data, dict):
+        fixes = data.get("fixes")
+        if fixes is None:
+            return [data]
+        data = fixes
+    if not isinstance(data, list) or not all(isinstance(f, dict) for f in data):
+        return None
+    return data
@@ -0,0 +1,71 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+
+class RecentFrames:
+    """
+    Per-drone memory of the last `window` device timestamps seen by this
+    process, used to drop QoS 1 retransmissions before they reach the DB.
+
+    Memory is bounded: at most `max_drones` drones are remembered, least
+    recently reporting first out. Frames outside that memory (older than
+    the window, or of a forgotten drone) are caught on insert by the
+    (drone, timestamp) unique constraint.
+    """
+
+    def __init__(self, window: int = 8, max_drones: int = 100_000):
+        self.window = window
+        self.max_drones = max_drones
+        # serial -> last timestamps, oldest first; a short list is smaller than a set or deque
+        self._seen: "OrderedDict[str, List[datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fresh(self, serial: str, timestamps: Iterable[datetime]) -> List[bool]:
+        """
+        For each timestamp, True if it was not seen before (and remember it).
+        Duplicates inside the same call are reported too.
+        """
+        if self.window <= 0 or self.max_drones <= 0:
+            return [True] * len(list(timestamps))
+
+        out: List[bool] = []
+        with self._lock:
+            recent = self._seen.get(serial)
+            if recent is None:
+                recent = self._seen[serial] = []
+                while len(self._seen) > self.max_drones:
+                    self._seen.popitem(last=False)
+            else:
+                self._seen.move_to_end(serial)
+
+            for ts in timestamps:
+                if ts in recent:
+                    out.append(False)
+                    continue
+                out.append(True)
+                recent.append(ts)
+                if len(recent) > self.window:
+                    del recent[0]
+        return out
+
+    def discard(self, serial: str, timestamps: Iterable[datetime]) -> None:
+        with self._lock:
+            recent = self._seen.get(serial)
+            if recent is None:
+                return
+            for ts in timestamps:
+                if ts in recent:
+                    recent.remove(ts)
+
+    def forget(self, serial: Optional[str] = None) -> None:
+        with self._lock:
+            if serial is None:
+                self._seen.clear()
+            else:
+                self._seen.pop(serial, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._seen)
@@ -0,0 +1,189 @@
+import csv
+import io
+import json
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import QuerySet
+
+from drones.models import DroneTelemetryPoint
+
+try:  # optional: Parquet / Arrow IPC export
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet as pyarrow_parquet
+except ImportError:  # pragma: no cover - depends on environment
+    pyarrow = None
+    pyarrow_parquet = None
+
+EXPORT_COLUMNS: Tuple[str, ...] = ("serial", "timestamp", "latitude", "longitude", "height", "horizontal_speed")
+
+Row = Tuple[Any, ...]
+
+
+def export_rows(
+    serials: Sequence[str] = (),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: Optional[int] = None,
+    using: Optional[str] = None,
+) -> Iterator[Row]:
+    """
+    Stream telemetry rows (EXPORT_COLUMNS order) ordered by drone, then time.
+
+    Uses QuerySet.iterator(), i.e. a server-side cursor on Postgres, so
+    memory stays constant whatever the number of rows. `using` pins the
+    database alias (the rows are fetched lazily, outside any routing block).
+    """
+    qs: QuerySet = DroneTelemetryPoint.objects.using(using)
+    if serials:
+        qs = qs.filter(drone__serial__in=list(serials))
+    if since is not None:
+        qs = qs.filter(timestamp__gte=since)
+    if until is not None:
+        qs = qs.filter(timestamp__lt=until)
+
+    chunk_size = chunk_size or int(getattr(settings, "EXPORT_CHUNK_ROWS", 5000))
+    rows = qs.order_by("drone_id", "timestamp").values_list(
+        "drone__serial", "timestamp", "latitude", "longitude", "height", "horizontal_speed"
+    )
+    return rows.iterator(chunk_size=chunk_size)
+
+
+def _chunks(rows: Iterable[Row], size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_csv(rows: Iterable[Row], chunk_size: int) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in _chunks(rows, chunk_size):
+        writer.writerows((serial, ts.isoformat(), *rest) for serial, ts, *rest in chunk)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def write_ndjson(rows: Iterable[Row], chunk_size: int) -> Iterator[bytes]:
+    # NaN/Infinity (possible in Postgres float columns) are not JSON: written as null.
+    dumps = json.dumps
+    isfinite = math.isfinite
+    for chunk in _chunks(rows, chunk_size):
+        lines = []
+        for serial, ts, *rest in chunk:
+            values = [v if v is None or isfinite(v) else None for v in rest]
+            lines.append(dumps(dict(zip(EXPORT_COLUMNS, (serial, ts.isoformat(), *values))), allow_nan=False))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _DrainSink(io.RawIOBase):
+    """
+    Write-only file object whose buffered output can be taken out between
+    writes, so pyarrow writers can feed a streaming response.
+    """
+
+    def __init__(self):
+        self._parts = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._parts.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow_schema():
+    return pyarrow.schema([
+        ("serial", pyarrow.string()),
+        ("timestamp", pyarrow.timestamp("us", tz="UTC")),
+        ("latitude", pyarrow.float64()),
+        ("longitude", pyarrow.float64()),
+        ("height", pyarrow.float64()),
+        ("horizontal_speed", pyarrow.float64()),
+    ])
+
+
+def _arrow_batches(rows: Iterable[Row], chunk_size: int, schema) -> Iterator[Any]:
+    for chunk in _chunks(rows, chunk_size):
+        columns = list(zip(*chunk))
+        yield pyarrow.record_batch([pyarrow.array(col, type=f.type) for col, f in zip(columns, schema)], schema=schema)
+
+
+def write_parquet(rows: Iterable[Row], chunk_size: int) -> Iterator[bytes]:
+    # One row group per chunk.
+    schema = _arrow_schema()
+    sink = _DrainSink()
+    writer = pyarrow_parquet.ParquetWriter(sink, schema)
+    for batch in _arrow_batches(rows, chunk_size, schema):
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def write_arrow(rows: Iterable[Row], chunk_size: int) -> Iterator[bytes]:
+    # Arrow IPC stream format, one record batch per chunk.
+    schema = _arrow_schema()
+    sink = _DrainSink()
+    writer = pyarrow.ipc.new_stream(sink, schema)
+    for batch in _arrow_batches(rows, chunk_size, schema):
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    content_type: str
+    extension: str
+    write: Callable[[Iterable[Row], int], Iterator[bytes]]
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "csv": ExportFormat("text/csv", "csv", write_csv),
+    "ndjson": ExportFormat("application/x-ndjson", "ndjson", write_ndjson),
+}
+if pyarrow is not None:
+    EXPORT_FORMATS["parquet"] = ExportFormat("application/vnd.apache.parquet", "parquet", write_parquet)
+    EXPORT_FORMATS["arrow"] = ExportFormat("application/vnd.apache.arrow.stream", "arrows", write_arrow)
+
+
+def export_telemetry(
+    fmt: str,
+    serials: Sequence[str] = (),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: Optional[int] = None,
+    using: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    Stream an export as byte chunks. Raises ValueError for an unknown (or
+    unavailable) format.
+    """
+    try:
+        export_format = EXPORT_FORMATS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown export format {fmt!r}; available: {sorted(EXPORT_FORMATS)}.")
+    chunk_size = chunk_size or int(getattr(settings, "EXPORT_CHUNK_ROWS", 5000))
+    rows = export_rows(serials, since, until, chunk_size=chunk_size, using=using)
+    return export_format.write(rows, chunk_size)
@@ -1,4 +1,5 @@
 import math
+from typing import Tuple
 
 def haversine_km(lat1: float, lon12: float, lat2: float, lon2: float) -> float:
     """
@@ -14,4 +15,17 @@ def haversine_km(lat1: float, lon12: float, lat2: float, lon2: float) -> float:
 
     a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return r * c
\ No newline at end of file
+    return r * c
+
+
+def circle_bbox(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Exact bounding box of a spherical circle as (min_lat, min_lon, max_lat, max_lon).
+    Longitudes fall outside -180..180 when the circle crosses the antimeridian;
+    a circle that reaches a pole spans 360 degrees of longitude.
+    """
+    ang = radius_km / 6371.0
+    dlat = math.degrees(ang)
+    ratio = math.sin(min(ang, math.pi / 2)) / max(math.cos(math.radians(lat)), 1e-12)
+    dlon = 180.0 if ratio >= 1.0 else math.degrees(math.asin(ratio))
+    return max(lat - dlat, -90.0), lon - dlon, min(lat + dlat, 90.0), lon + dlon
@@ -1,25 +1,35 @@
-from typing import List, Optional, Sequence
+import math
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
 
 from drones.models import NoFlyZone
-from drones.services.geo import haversine_km
+from drones.services.geo import circle_bbox, haversine_km
+from drones.services.polygons import ring_bbox, segment_distance
 
+GEOFENCE_REASON = "entered_no_fly_zone"
 
-def _point_in_polygon(lon: float, lat: float, polygon: Sequence[Sequence[float]]) -> bool:
-    """
-    Ray-casting algorithm.
-    polygon: list of [lon, lat] points (GeoJSON style). It may be open or closed.
-    """
-    if len(polygon) < 3:
-        return False
+# Zones whose bbox covers more cells than this are kept in a global list
+# instead of being copied into every cell.
+_MAX_CELLS_PER_ZONE = 4096
 
-    # Normalize to list of tuples
-    pts = [(float(p[0]), float(p[1])) for p in polygon]
 
+def _closed(polygon: Sequence[Sequence[float]]) -> Tuple[Tuple[float, float], ...]:
+    pts = [(float(p[0]), float(p[1])) for p in polygon]
     if pts[0] != pts[-1]:
         pts.append(pts[0])
+    return tuple(pts)
+
 
+def _ray_cast(x: float, y: float, pts: Sequence[Tuple[float, float]]) -> bool:
+    """
+    Ray-casting over an already closed ring of (lon, lat) tuples.
+    """
     inside = False
-    x, y = lon, lat
 
     for i in range(len(pts) - 1):
         x1, y1 = pts[i]
@@ -37,26 +47,199 @@ def _point_in_polygon(lon: float, lat: float, polygon: Sequence[Sequence[float]]
     return inside
 
 
-def check_geofence(lat: float, lon: float) -> Optional[str]:
+def _boundary_distance(x: float, y: float, pts: Sequence[Tuple[float, float]]) -> float:
     """
-    Returns a string reason if drone is inside any active zone, else None.
+    Planar distance (degrees) from a point to the edges of a closed ring.
+    """
+    return min(
+        segment_distance(x, y, pts[i][0], pts[i][1], pts[i + 1][0], pts[i + 1][1])
+        for i in range(len(pts) - 1)
+    )
 
-    Keeps the original reason string used in your fixtures:
-    - "entered_no_fly_zone"
+
+def _point_in_polygon(lon: float, lat: float, polygon: Sequence[Sequence[float]]) -> bool:
     """
-    zones = NoFlyZone.objects.filter(is_active=True)
+    Ray-casting algorithm.
+    polygon: list of [lon, lat] points (GeoJSON style). It may be open or closed.
+    """
+    if len(polygon) < 3:
+        return False
+    return _ray_cast(lon, lat, _closed(polygon))
+
 
-    for z in zones:
+@dataclass(frozen=True)
+class IndexedZone:
+    """
+    Immutable snapshot of an active zone, prepared for repeated point checks.
+    """
+    zone_id: int
+    shape: str
+    min_lon: float
+    min_lat: float
+    max_lon: float
+    max_lat: float
+    center_lat: Optional[float] = None
+    center_lon: Optional[float] = None
+    radius_km: Optional[float] = None
+    polygon: Tuple[Tuple[float, float], ...] = ()
+    simplified: Tuple[Tuple[float, float], ...] = ()
+    tolerance_deg: float = 0.0
+
+    @classmethod
+    def from_zone(cls, z: NoFlyZone) -> Optional["IndexedZone"]:
         if z.shape == NoFlyZone.SHAPE_CIRCLE:
             if z.center_lat is None or z.center_lon is None or z.radius_km is None:
-                continue
-            dist = haversine_km(lat, lon, float(z.center_lat), float(z.center_lon))
-            if dist <= float(z.radius_km):
-                return "entered_no_fly_zone"
+                return None
+            lat, lon, r = float(z.center_lat), float(z.center_lon), float(z.radius_km)
+            min_lat, min_lon, max_lat, max_lon = circle_bbox(lat, lon, r)
+            if min_lon < -180.0 or max_lon > 180.0:
+                # Crosses the antimeridian (or reaches a pole): every longitude.
+                min_lon, max_lon = -180.0, 180.0
+            return cls(
+                zone_id=z.pk,
+                shape=z.shape,
+                min_lon=min_lon,
+                min_lat=min_lat,
+                max_lon=max_lon,
+                max_lat=max_lat,
+                center_lat=lat,
+                center_lon=lon,
+                radius_km=r,
+            )
 
-        elif z.shape == NoFlyZone.SHAPE_POLYGON:
+        if z.shape == NoFlyZone.SHAPE_POLYGON:
             poly = z.polygon or []
-            if _point_in_polygon(lon, lat, poly):
-                return "entered_no_fly_zone"
+            if len(poly) < 3:
+                return None
+            pts = _closed(poly)
+            min_lon, min_lat, max_lon, max_lat = ring_bbox(pts)
+            simplified = z.polygon_simplified or []
+            tolerance = z.simplify_tolerance_deg
+            if len(simplified) < 3 or not tolerance:
+                simplified, tolerance = [], 0.0
+            return cls(
+                zone_id=z.pk,
+                shape=z.shape,
+                min_lon=min_lon,
+                min_lat=min_lat,
+                max_lon=max_lon,
+                max_lat=max_lat,
+                polygon=pts,
+                simplified=_closed(simplified) if simplified else (),
+                tolerance_deg=float(tolerance),
+            )
+
+        return None
+
+    def contains(self, lat: float, lon: float) -> bool:
+        if not (self.min_lat <= lat <= self.max_lat and self.min_lon <= lon <= self.max_lon):
+            return False
+
+        if self.shape == NoFlyZone.SHAPE_CIRCLE:
+            return haversine_km(lat, lon, self.center_lat, self.center_lon) <= self.radius_km
+
+        if self.simplified:
+            # Fast first pass: away from the simplified boundary the full
+            # ring gives the same answer, so only fall back near the edges.
+            if _boundary_distance(lon, lat, self.simplified) > self.tolerance_deg:
+                return _ray_cast(lon, lat, self.simplified)
 
-    return None
+        return _ray_cast(lon, lat, self.polygon)
+
+
+class GeofenceIndex:
+    """
+    In-memory grid index over active no-fly zones.
+
+    Each zone is bucketed into the grid cells its bounding box covers, so a
+    point check only tests the handful of zones near that point instead of
+    every active zone in the database.
+    """
+
+    def __init__(self, zones: Iterable[IndexedZone], cell_deg: float = 0.1):
+        self.cell_deg = cell_deg
+        self.zones: List[IndexedZone] = list(zones)
+        self._cells: Dict[Tuple[int, int], List[IndexedZone]] = defaultdict(list)
+        self._global: List[IndexedZone] = []
+
+        for z in self.zones:
+            r0, c0 = self._cell(z.min_lat, z.min_lon)
+            r1, c1 = self._cell(z.max_lat, z.max_lon)
+            if (r1 - r0 + 1) * (c1 - c0 + 1) > _MAX_CELLS_PER_ZONE:
+                self._global.append(z)
+                continue
+            for r in range(r0, r1 + 1):
+                for c in range(c0, c1 + 1):
+                    self._cells[(r, c)].append(z)
+
+    @classmethod
+    def from_db(cls) -> "GeofenceIndex":
+        indexed = []
+        for z in NoFlyZone.objects.filter(is_active=True).order_by("id"):
+            iz = IndexedZone.from_zone(z)
+            if iz is not None:
+                indexed.append(iz)
+        return cls(indexed, cell_deg=float(getattr(settings, "GEOFENCE_INDEX_CELL_DEG", 0.1)))
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def candidates(self, lat: float, lon: float) -> List[IndexedZone]:
+        # A NaN/inf position has no cell and lies in no zone.
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            return []
+        return self._cells.get(self._cell(lat, lon), []) + self._global
+
+    def zones_containing(self, lat: float, lon: float) -> List[int]:
+        return [z.zone_id for z in self.candidates(lat, lon) if z.contains(lat, lon)]
+
+    def check(self, lat: float, lon: float) -> Optional[str]:
+        for z in self.candidates(lat, lon):
+            if z.contains(lat, lon):
+                return GEOFENCE_REASON
+        return None
+
+
+_index: Optional[GeofenceIndex] = None
+_index_built_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_geofence_index() -> GeofenceIndex:
+    """
+    Return the process-wide geofence index, rebuilding it when it is missing
+    or older than GEOFENCE_INDEX_TTL_SECONDS (so other processes' zone edits
+    are picked up without a restart).
+    """
+    ttl = float(getattr(settings, "GEOFENCE_INDEX_TTL_SECONDS", 30))
+    index = _index
+    if index is not None and time.monotonic() - _index_built_at < ttl:
+        return index
+    return rebuild_geofence_index()
+
+
+def rebuild_geofence_index() -> GeofenceIndex:
+    global _index, _index_built_at
+    with _index_lock:
+        _index = GeofenceIndex.from_db()
+        _index_built_at = time.monotonic()
+        return _index
+
+
+def invalidate_geofence_index() -> None:
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def check_geofence(lat: float, lon: float) -> Optional[str]:
+    """
+    Returns a string reason if drone is inside any active zone, else None.
+
+    Keeps the original reason string used in your fixtures:
+    - "entered_no_fly_zone"
+    """
+    return get_geofence_index().check(lat, lon)
@@ -0,0 +1,160 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+
+from drones.models import DroneTelemetryPoint
+from drones.services.geo import circle_bbox, haversine_km
+
+
+def grid_cell_deg() -> float:
+    return float(getattr(settings, "GRID_CELL_DEG", 0.01))
+
+
+def grid_shape(deg: float) -> Tuple[int, int]:
+    """
+    (rows, cols) of the global grid for a cell size in degrees.
+    """
+    return int(math.ceil(180.0 / deg)), int(math.ceil(360.0 / deg))
+
+
+def grid_cell(lat: Optional[float], lon: Optional[float], deg: Optional[float] = None) -> Optional[int]:
+    """
+    Cell id of a position: row * cols + col, rows counted from -90 latitude
+    and columns from -180 longitude. Cells of one row are contiguous ids, so
+    a latitude band maps to a single id range. None when the position is
+    missing or not finite.
+    """
+    if lat is None or lon is None or not (math.isfinite(lat) and math.isfinite(lon)):
+        return None
+    deg = deg or grid_cell_deg()
+    rows, cols = grid_shape(deg)
+    row = min(max(int(math.floor((lat + 90.0) / deg)), 0), rows - 1)
+    col = int(math.floor((lon + 180.0) / deg)) % cols
+    return row * cols + col
+
+
+def cell_ranges(
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    deg: Optional[float] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Inclusive (first, last) cell id ranges covering a bbox. Longitudes may
+    run past +/-180 (antimeridian); ranges of adjacent full rows are merged.
+    A bbox with a non-finite bound covers no cells.
+    """
+    if not all(math.isfinite(v) for v in (min_lat, min_lon, max_lat, max_lon)):
+        return []
+    deg = deg or grid_cell_deg()
+    rows, cols = grid_shape(deg)
+    row_lo = min(max(int(math.floor((min_lat + 90.0) / deg)), 0), rows - 1)
+    row_hi = min(max(int(math.floor((max_lat + 90.0) / deg)), 0), rows - 1)
+
+    if max_lon - min_lon >= 360.0:
+        col_spans = [(0, cols - 1)]
+    else:
+        col_lo = int(math.floor((min_lon + 180.0) / deg))
+        col_hi = int(math.floor((max_lon + 180.0) / deg))
+        if col_lo < 0:
+            col_spans = [(0, col_hi), (col_lo % cols, cols - 1)]
+        elif col_hi >= cols:
+            col_spans = [(0, col_hi % cols), (col_lo, cols - 1)]
+        else:
+            col_spans = [(col_lo, col_hi)]
+
+    ranges: List[Tuple[int, int]] = []
+    for row in range(row_lo, row_hi + 1):
+        for lo, hi in col_spans:
+            first, last = row * cols + lo, row * cols + hi
+            if ranges and ranges[-1][1] + 1 >= first:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], last))
+            else:
+                ranges.append((first, last))
+    return sorted(ranges)
+
+
+@dataclass
+class ClosestApproach:
+    serial: str
+    distance_km: float
+    at: datetime
+    latitude: float
+    longitude: float
+
+
+def drones_near(
+    lat: float,
+    lon: float,
+    radius_km: float,
+    since: datetime,
+    until: datetime,
+) -> List[ClosestApproach]:
+    """
+    Drones that were within radius_km of (lat, lon) in [since, until), with
+    their closest approach, nearest first.
+
+    Candidate points come from the (grid_cell, timestamp) index. Up to
+    GRID_MAX_QUERY_CELLS cells of the circle's bbox are listed one by one,
+    so each index probe is bounded by both cell and time. Larger areas use
+    one id range per grid row (the time only filters within each range),
+    and beyond GRID_MAX_QUERY_RANGES ranges a lat/lon bbox filter on the
+    time range. Exact distances are then checked in Python.
+    """
+    min_lat, min_lon, max_lat, max_lon = circle_bbox(lat, lon, radius_km)
+    qs = DroneTelemetryPoint.objects.filter(timestamp__gte=since, timestamp__lt=until)
+
+    ranges = cell_ranges(min_lat, min_lon, max_lat, max_lon)
+    cell_count = sum(last - first + 1 for first, last in ranges)
+    if cell_count <= int(getattr(settings, "GRID_MAX_QUERY_CELLS", 1024)):
+        qs = qs.filter(grid_cell__in=[cell for first, last in ranges for cell in range(first, last + 1)])
+    elif len(ranges) <= int(getattr(settings, "GRID_MAX_QUERY_RANGES", 256)):
+        q = Q()
+        for first, last in ranges:
+            q |= Q(grid_cell__gte=first, grid_cell__lte=last) if first != last else Q(grid_cell=first)
+        qs = qs.filter(q)
+    else:
+        qs = qs.filter(latitude__gte=min_lat, latitude__lte=max_lat)
+        if -180.0 <= min_lon and max_lon <= 180.0:
+            qs = qs.filter(longitude__gte=min_lon, longitude__lte=max_lon)
+
+    best: Dict[str, ClosestApproach] = {}
+    rows = qs.values_list("drone__serial", "timestamp", "latitude", "longitude")
+    for serial, ts, p_lat, p_lon in rows.iterator(chunk_size=5000):
+        d = haversine_km(lat, lon, p_lat, p_lon)
+        if d > radius_km:
+            continue
+        current = best.get(serial)
+        if current is None or d < current.distance_km:
+            best[serial] = ClosestApproach(serial, d, ts, p_lat, p_lon)
+
+    return sorted(best.values(), key=lambda a: (a.distance_km, a.serial))
+
+
+def backfill_grid_cells(only_missing: bool = True, batch_size: int = 5000) -> int:
+    """
+    (Re)compute grid_cell for stored points: after migration 0012 (which
+    leaves existing points NULL), after loading fixtures, or after changing
+    GRID_CELL_DEG. Each batch commits on its own. Returns the rows updated.
+    """
+    deg = grid_cell_deg()
+    qs = DroneTelemetryPoint.objects.order_by("id")
+    if only_missing:
+        qs = qs.filter(grid_cell__isnull=True)
+
+    updated = 0
+    last_id = 0
+    while True:
+        batch = list(qs.filter(id__gt=last_id).only("id", "latitude", "longitude")[:batch_size])
+        if not batch:
+            return updated
+        for p in batch:
+            p.grid_cell = grid_cell(p.latitude, p.longitude, deg)
+        DroneTelemetryPoint.objects.bulk_update(batch, ["grid_cell"])
+        updated += len(batch)
+        last_id = batch[-1].id
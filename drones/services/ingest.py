@@ -0,0 +1,370 @@
+import logging
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.utils import timezone
+
+from drones.models import Drone, DroneTelemetryPoint
+from drones.services.binary_osd import BINARY_DECODERS
+from drones.services.cache_version import bump_version
+from drones.services.conflicts import CONFLICT_REASON, with_conflict
+from drones.services.decoding import (
+    OSD_POSITION_FIELDS,
+    device_time,
+    extract_fields,
+    get_json_decoder,
+    split_batch,
+)
+from drones.services.dedup import RecentFrames
+from drones.services.grid import grid_cell, grid_cell_deg
+from drones.services.osd_store import store_payload
+from drones.services.presence import emit_presence_change
+from drones.services.profiling import stage
+from drones.services.rules import classify, get_rule_set
+from drones.services.spool import Spool, SpoolRecord
+
+logger = logging.getLogger(__name__)
+
+TOPIC_RE = re.compile(r"^thing/product/(?P<serial>[^/]+)/osd$")
+BINARY_TOPIC_RE = re.compile(r"^thing/product/(?P<serial>[^/]+)/osd/(?P<format>[a-z0-9_]+)$")
+
+# Errors that a later attempt may not hit again (lost connection, server
+# restarting, lock timeout). Anything else (DataError, IntegrityError, a bug)
+# fails the same way every time, so the frame is dead-lettered instead.
+TRANSIENT_DB_ERRORS = (OperationalError, InterfaceError)
+
+
+class IngestStats:
+    """
+    Thread-safe ingest counters (messages, fixes, and every kind of drop).
+    """
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def incr(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[key] += n
+
+    def snapshot(self, reset: bool = False) -> Dict[str, int]:
+        with self._lock:
+            data = dict(self._counts)
+            if reset:
+                self._counts.clear()
+        return data
+
+
+class TelemetryIngestor:
+    """
+    Turns raw MQTT messages into Drone state + telemetry history.
+
+    Only the fields needed for classification (position plus the active
+    danger-rule fields) are extracted from the payload; the raw payload is
+    kept as-is in the OSD store.
+    """
+
+    def __init__(self, stats: Optional[IngestStats] = None, decoder: Optional[str] = None):
+        self.stats = stats or IngestStats()
+        self.decode = get_json_decoder(decoder or getattr(settings, "MQTT_JSON_DECODER", "auto"))
+        self.recent = RecentFrames(
+            window=int(getattr(settings, "INGEST_DEDUP_WINDOW", 8)),
+            max_drones=int(getattr(settings, "INGEST_DEDUP_MAX_DRONES", 100_000)),
+        )
+
+    def parse_message(self, topic: str, payload: bytes) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Decode one MQTT message into (serial, fixes), or None (counted) when
+        it cannot be used.
+        """
+        self.stats.incr("messages")
+
+        m = TOPIC_RE.match(topic)
+        if m:
+            try:
+                data = self.decode(payload)
+            except ValueError:
+                self.stats.incr("dropped_malformed_json")
+                return None
+            fixes = split_batch(data)
+            if fixes is None:
+                self.stats.incr("dropped_not_an_object")
+                return None
+        else:
+            m = BINARY_TOPIC_RE.match(topic)
+            if not m:
+                self.stats.incr("dropped_unknown_topic")
+                return None
+            decoder = BINARY_DECODERS.get(m.group("format"))
+            if decoder is None:
+                self.stats.incr("dropped_unknown_format")
+                return None
+            try:
+                fixes = decoder(payload)
+            except (ValueError, TypeError):
+                self.stats.incr("dropped_malformed_binary")
+                return None
+
+        if not fixes:
+            self.stats.incr("dropped_empty_batch")
+            return None
+        return m.group("serial"), fixes
+
+    def handle_message(self, topic: str, payload: bytes, received_at: Optional[datetime] = None) -> bool:
+        """
+        Entry point for one MQTT message. Returns True if it was ingested.
+        """
+        with stage("decode"):
+            parsed = self.parse_message(topic, payload)
+        if parsed is None:
+            return False
+        serial, fixes = parsed
+        return self.ingest_batch(serial, fixes, received_at=received_at) is not None
+
+    def handle_many(self, messages: Iterable[Tuple[str, bytes, datetime]]) -> int:
+        """
+        Bulk path (spool replay): (topic, payload, received_at) messages are
+        grouped per drone and each drone's fixes ingested as one batch.
+        Returns the number of drones updated.
+        """
+        fixes_by_serial: Dict[str, List[Dict[str, Any]]] = {}
+        arrivals_by_serial: Dict[str, List[datetime]] = {}
+        for topic, payload, received_at in messages:
+            with stage("decode"):
+                parsed = self.parse_message(topic, payload)
+            if parsed is None:
+                continue
+            serial, fixes = parsed
+            fixes_by_serial.setdefault(serial, []).extend(fixes)
+            arrivals_by_serial.setdefault(serial, []).extend([received_at] * len(fixes))
+
+        updated = 0
+        for serial, fixes in fixes_by_serial.items():
+            if self.ingest_batch(serial, fixes, arrivals=arrivals_by_serial[serial]) is not None:
+                updated += 1
+        return updated
+
+    def ingest(
+        self,
+        serial: str,
+        payload: Dict[str, Any],
+        received_at: Optional[datetime] = None,
+    ) -> Optional[Drone]:
+        return self.ingest_batch(serial, [payload], received_at=received_at)
+
+    def _frame_times(self, fixes: Sequence[Dict[str, Any]], arrivals: Sequence[datetime]) -> List[datetime]:
+        max_ahead = timedelta(seconds=float(getattr(settings, "INGEST_MAX_FUTURE_SKEW_SECONDS", 300)))
+        times = []
+        for i, (payload, arrival) in enumerate(zip(fixes, arrivals)):
+            ts = device_time(payload.get("timestamp"))
+            if ts is not None and ts - arrival > max_ahead:
+                self.stats.incr("future_timestamps")
+                ts = None
+            # Untimed fixes of one message keep their order (and stay distinct
+            # under the (drone, timestamp) constraint) via a microsecond offset.
+            times.append(ts or arrival + timedelta(microseconds=i))
+        return times
+
+    def ingest_batch(
+        self,
+        serial: str,
+        fixes: Sequence[Dict[str, Any]],
+        received_at: Optional[datetime] = None,
+        arrivals: Optional[Sequence[datetime]] = None,
+    ) -> Optional[Drone]:
+        """
+        Ingest one or more fixes of a drone in a single transaction.
+
+        Each fix is timed by its own "timestamp" (device clock) when present,
+        else by its arrival time (arrivals[i], or received_at / now). Frames already seen are dropped; the rest
+        are inserted with one bulk insert (conflicts on (drone, timestamp)
+        ignored). Current state and the OSD store only move forward: they
+        follow the newest fix, and only if it is newer than the stored state.
+
+        Returns the drone, or None when every fix was a duplicate.
+        """
+        if arrivals is None:
+            arrivals = [received_at or timezone.now()] * len(fixes)
+        rule_set = get_rule_set()
+        fields = OSD_POSITION_FIELDS + rule_set.fields
+
+        times = self._frame_times(fixes, arrivals)
+        batch = []
+        for ts, payload, is_fresh in zip(times, fixes, self.recent.fresh(serial, times)):
+            if not is_fresh:
+                self.stats.incr("duplicate_fixes")
+                continue
+            values, bad = extract_fields(payload, fields)
+            if bad:
+                self.stats.incr("bad_fields", bad)
+            batch.append((ts, values, payload))
+        if not batch:
+            return None
+
+        batch.sort(key=lambda item: item[0])
+        if len(batch) > 1:
+            self.stats.incr("batched_fixes", len(batch))
+
+        now, values, payload = batch[-1]
+        came_online = False
+
+        try:
+            with stage("transaction"), transaction.atomic():
+                drone, created = Drone.objects.get_or_create(
+                    serial=serial,
+                    defaults={"last_seen_at": now},
+                )
+
+                if created or drone.last_seen_at is None or now > drone.last_seen_at:
+                    lat = values["latitude"]
+                    lon = values["longitude"]
+                    with stage("classify"):
+                        reasons = classify(values, lat, lon, drone_class=drone.drone_class, now=now, rule_set=rule_set)
+                    reasons = with_conflict(reasons, CONFLICT_REASON in (drone.danger_reasons or []))
+
+                    drone.latitude = lat
+                    drone.longitude = lon
+                    drone.height = values["height"]
+                    drone.horizontal_speed = values["horizontal_speed"]
+                    drone.last_seen_at = now
+                    came_online = not drone.is_online
+                    drone.is_online = True
+                    drone.is_dangerous = bool(reasons)
+                    drone.danger_reasons = reasons
+
+                    drone.save(update_fields=[
+                        "latitude", "longitude", "height", "horizontal_speed",
+                        "last_seen_at", "is_online", "is_dangerous", "danger_reasons",
+                        "updated_at",
+                    ])
+                    with stage("osd_store"):
+                        store_payload(drone, payload, now)
+                else:
+                    self.stats.incr("stale_frames")
+
+                cell_deg = grid_cell_deg()
+                points: List[DroneTelemetryPoint] = [
+                    DroneTelemetryPoint(
+                        drone=drone,
+                        timestamp=ts,
+                        latitude=v["latitude"],
+                        longitude=v["longitude"],
+                        height=v["height"],
+                        horizontal_speed=v["horizontal_speed"],
+                        grid_cell=grid_cell(v["latitude"], v["longitude"], cell_deg),
+                    )
+                    for ts, v, _ in batch
+                    if v["latitude"] is not None and v["longitude"] is not None
+                ]
+                if points:
+                    DroneTelemetryPoint.objects.bulk_create(points, ignore_conflicts=True)
+                    self.stats.incr("fixes", len(points))
+        except Exception:
+            # Nothing was stored: let a retransmission (or a replay) through.
+            self.recent.discard(serial, [ts for ts, _, _ in batch])
+            raise
+
+        bump_version(throttle=True)
+        if came_online:
+            emit_presence_change([serial], online=True)
+        return drone
+
+
+class SpooledIngestor:
+    """
+    Puts a durable spool in front of a TelemetryIngestor.
+
+    mode "fallback": messages are ingested directly; on a transient DB error
+    (and while older frames are still spooled, to keep order) they are
+    appended to the spool instead. mode "always": messages only go to the
+    spool. drain() replays the spool in bulk and is run by a writer thread.
+
+    A frame that fails with any other error is moved to the spool's
+    dead-letter file, so one bad record cannot hold back the rest.
+    """
+
+    MODES = ("fallback", "always")
+
+    def __init__(self, ingestor: TelemetryIngestor, spool: Spool, mode: str = "fallback"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown spool mode {mode!r}; expected one of {self.MODES}.")
+        self.ingestor = ingestor
+        self.spool = spool
+        self.mode = mode
+
+    @classmethod
+    def from_settings(cls, ingestor: TelemetryIngestor) -> Optional["SpooledIngestor"]:
+        mode = getattr(settings, "INGEST_SPOOL_MODE", "fallback")
+        if mode == "off":
+            return None
+        mb = 1024 * 1024
+        spool = Spool(
+            settings.INGEST_SPOOL_DIR,
+            segment_bytes=int(settings.INGEST_SPOOL_SEGMENT_MB * mb),
+            max_bytes=int(settings.INGEST_SPOOL_MAX_MB * mb),
+            fsync_every=settings.INGEST_SPOOL_FSYNC_EVERY,
+            fsync_seconds=settings.INGEST_SPOOL_FSYNC_SECONDS,
+        )
+        return cls(ingestor, spool, mode=mode)
+
+    def submit(self, topic: str, payload: bytes, received_at: Optional[datetime] = None) -> None:
+        received_at = received_at or timezone.now()
+        if self.mode == "always" or self.spool.has_pending():
+            self.spool.append(topic, payload, received_at.timestamp())
+            return
+
+        try:
+            self.ingestor.handle_message(topic, payload, received_at=received_at)
+        except TRANSIENT_DB_ERRORS as e:
+            logger.warning("DB write failed, spooling frame: %s", e)
+            close_old_connections()
+            self.spool.append(topic, payload, received_at.timestamp())
+            self.ingestor.stats.incr("spooled")
+        except Exception:
+            logger.exception("Frame on %s cannot be ingested", topic)
+            self._dead_letter(SpoolRecord(topic, bytes(payload), received_at.timestamp()))
+
+    def _dead_letter(self, record: SpoolRecord) -> None:
+        self.spool.dead_letter(record.topic, record.payload, record.received_at)
+        self.ingestor.stats.incr("dead_lettered")
+
+    def _ingest_records(self, records: List[SpoolRecord]) -> None:
+        self.ingestor.handle_many(
+            (r.topic, r.payload, datetime.fromtimestamp(r.received_at, tz=dt_timezone.utc))
+            for r in records
+        )
+
+    def _replay_batch(self, records: List[SpoolRecord]) -> None:
+        try:
+            self._ingest_records(records)
+            return
+        except TRANSIENT_DB_ERRORS:
+            raise
+        except Exception:
+            logger.exception("Spooled batch of %d frames failed; retrying them one by one", len(records))
+        close_old_connections()
+
+        # Frames of drones stored before the failure are dropped as duplicates.
+        for record in records:
+            try:
+                self._ingest_records([record])
+            except TRANSIENT_DB_ERRORS:
+                raise
+            except Exception:
+                logger.exception("Spooled frame on %s cannot be ingested", record.topic)
+                self._dead_letter(record)
+
+    def drain(self, batch_size: int = 500) -> int:
+        """
+        Replay everything spooled so far. Raises the transient DB error
+        (leaving the remaining frames spooled) if the DB is still unavailable;
+        frames that fail for any other reason are dead-lettered.
+        """
+        if not self.spool.has_pending():
+            return 0
+        return self.spool.replay(self._replay_batch, batch_size=batch_size)
@@ -0,0 +1,108 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from drones.models import Drone, DroneOSDPayload
+
+# drone id -> monotonic time of the last DB write, per process
+_last_persisted: Dict[int, float] = {}
+_persist_lock = threading.Lock()
+
+
+def _latest_key(drone_id: int) -> str:
+    return f"drones:osd:latest:{drone_id}"
+
+
+def _history_key(drone_id: int) -> str:
+    return f"drones:osd:history:{drone_id}"
+
+
+def _should_persist(drone_id: int, force: bool) -> bool:
+    interval = float(getattr(settings, "OSD_PERSIST_INTERVAL_SECONDS", 0))
+    now = time.monotonic()
+    with _persist_lock:
+        if not force and interval > 0 and now - _last_persisted.get(drone_id, float("-inf")) < interval:
+            return False
+        _last_persisted[drone_id] = now
+        return True
+
+
+def store_payload(drone: Drone, payload: Dict[str, Any], received_at: datetime, force_persist: bool = False) -> None:
+    """
+    Record the latest raw OSD payload of a drone.
+
+    - Always written to the cache (latest + optional ring of the last
+      OSD_HISTORY_SIZE payloads), once the enclosing transaction commits,
+      so a rolled-back message is never served.
+    - Upserted into DroneOSDPayload at most once per
+      OSD_PERSIST_INTERVAL_SECONDS per drone (0 = on every message).
+
+    Processes only see each other's cached payloads through a shared cache
+    backend; with the per-process default, readers fall back to the
+    persisted row.
+    """
+    drone_id = drone.pk
+    transaction.on_commit(lambda: _cache_payload(drone_id, payload, received_at))
+
+    if _should_persist(drone_id, force_persist):
+        DroneOSDPayload.objects.bulk_create(
+            [DroneOSDPayload(drone=drone, payload=payload, received_at=received_at)],
+            update_conflicts=True,
+            unique_fields=["drone"],
+            update_fields=["payload", "received_at"],
+        )
+
+
+def _cache_payload(drone_id: int, payload: Dict[str, Any], received_at: datetime) -> None:
+    timeout = getattr(settings, "OSD_CACHE_SECONDS", 3600)
+    cache.set(_latest_key(drone_id), (received_at, payload), timeout)
+
+    history_size = int(getattr(settings, "OSD_HISTORY_SIZE", 0))
+    if history_size > 0:
+        history = cache.get(_history_key(drone_id)) or []
+        history.append((received_at, payload))
+        cache.set(_history_key(drone_id), history[-history_size:], timeout)
+
+
+def get_latest_payload(drone: Drone) -> Tuple[Optional[datetime], Dict[str, Any]]:
+    """
+    (received_at, payload) of the latest OSD message: from the cache when
+    present, otherwise from the persisted row ((None, {}) when never seen).
+    """
+    hit = cache.get(_latest_key(drone.pk))
+    if hit is not None:
+        return hit
+
+    row = DroneOSDPayload.objects.filter(drone=drone).first()
+    if row is None:
+        return None, {}
+    return row.received_at, row.payload
+
+
+def get_latest_payloads(drone_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Latest payload of many drones: one cache get_many, then one query for
+    the drones missing from the cache. Drones never seen are left out.
+    """
+    drone_ids = list(drone_ids)
+    keys = {_latest_key(pk): pk for pk in drone_ids}
+    found = {keys[k]: hit[1] for k, hit in cache.get_many(list(keys)).items()}
+
+    missing = [pk for pk in drone_ids if pk not in found]
+    if missing:
+        for drone_id, payload in DroneOSDPayload.objects.filter(drone_id__in=missing).values_list("drone_id", "payload"):
+            found[drone_id] = payload
+    return found
+
+
+def get_payload_history(drone: Drone) -> List[Tuple[datetime, Dict[str, Any]]]:
+    """
+    Recent payloads (oldest first) kept in the cache ring; empty when
+    OSD_HISTORY_SIZE is 0 or the ring has expired.
+    """
+    return list(cache.get(_history_key(drone.pk)) or [])
@@ -0,0 +1,191 @@
+import math
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+from django.conf import settings
+
+try:  # optional: used only to repair self-intersecting rings
+    from shapely.geometry import Polygon as _ShapelyPolygon
+    from shapely.validation import make_valid as _make_valid
+except ImportError:  # pragma: no cover - depends on environment
+    _ShapelyPolygon = None
+    _make_valid = None
+
+
+_NUMBER_TYPES = (int, float)
+
+
+def validate_ring(points: Any, label: str = "polygon") -> List[List[float]]:
+    """
+    Validate a polygon ring of [lon, lat] pairs in a single pass.
+
+    Returns the ring as a list of [lon, lat] floats.
+    Raises ValueError with a user-facing message on the first invalid point.
+    """
+    if not isinstance(points, (list, tuple)) or len(points) < 3:
+        raise ValueError(f"{label} requires at least 3 points.")
+
+    ring: List[List[float]] = []
+    append = ring.append
+    for i, pt in enumerate(points):
+        if not isinstance(pt, (list, tuple)) or len(pt) != 2:
+            raise ValueError(f"{label}[{i}] must be [lon, lat] numbers.")
+        lon, lat = pt
+        if not isinstance(lon, _NUMBER_TYPES) or not isinstance(lat, _NUMBER_TYPES):
+            raise ValueError(f"{label}[{i}] must be [lon, lat] numbers.")
+        if not (-180 <= lon <= 180) or not (-90 <= lat <= 90):
+            raise ValueError(f"{label}[{i}] lon/lat out of range.")
+        append([float(lon), float(lat)])
+
+    return ring
+
+
+def ring_bbox(ring: Sequence[Sequence[float]]):
+    """
+    Bounding box of a ring as (min_lon, min_lat, max_lon, max_lat).
+    """
+    lons = [p[0] for p in ring]
+    lats = [p[1] for p in ring]
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+@dataclass(frozen=True)
+class PreparedPolygon:
+    """
+    A zone polygon ready to be stored:
+    - ring: the full, normalized ring (closed, counter-clockwise)
+    - simplified: a simplified copy of ring, or [] when not simplified
+    - tolerance_deg: the simplification tolerance used, or None
+    """
+    ring: List[List[float]]
+    simplified: List[List[float]]
+    tolerance_deg: Optional[float]
+
+
+def signed_area(ring: Sequence[Sequence[float]]) -> float:
+    """
+    Shoelace signed area in degrees² (> 0 for counter-clockwise rings).
+    """
+    area = 0.0
+    for i in range(len(ring) - 1):
+        x1, y1 = ring[i][0], ring[i][1]
+        x2, y2 = ring[i + 1][0], ring[i + 1][1]
+        area += x1 * y2 - x2 * y1
+    return area / 2.0
+
+
+def normalize_ring(ring: Sequence[Sequence[float]]) -> List[List[float]]:
+    """
+    Drop repeated consecutive points, close the ring and orient it
+    counter-clockwise (RFC 7946 exterior ring winding).
+    """
+    pts: List[List[float]] = []
+    for p in ring:
+        pt = [float(p[0]), float(p[1])]
+        if not pts or pts[-1] != pt:
+            pts.append(pt)
+
+    if len(pts) > 1 and pts[0] == pts[-1]:
+        pts.pop()
+    if len(pts) < 3:
+        raise ValueError("polygon requires at least 3 distinct points.")
+
+    pts.append(list(pts[0]))
+    if signed_area(pts) < 0:
+        pts.reverse()
+    return pts
+
+
+def repair_ring(ring: List[List[float]]) -> List[List[float]]:
+    """
+    Repair a self-intersecting ring when shapely is installed.
+
+    A repair that splits the ring into several parts is replaced by their
+    convex hull: the stored zone must stay a single ring and must never
+    shrink. Without shapely the ring is returned unchanged.
+    """
+    if _ShapelyPolygon is None:
+        return ring
+
+    poly = _ShapelyPolygon(ring)
+    if poly.is_valid:
+        return ring
+
+    fixed = _make_valid(poly)
+    if fixed.geom_type != "Polygon":
+        fixed = fixed.convex_hull
+    if fixed.geom_type != "Polygon" or fixed.is_empty:
+        raise ValueError("polygon is degenerate and cannot be repaired.")
+    return normalize_ring([list(c) for c in fixed.exterior.coords])
+
+
+def segment_distance(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+    """
+    Planar distance from point p to segment ab (same units as the inputs).
+    """
+    dx, dy = bx - ax, by - ay
+    if dx == 0 and dy == 0:
+        return math.hypot(px - ax, py - ay)
+    t = ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy)
+    t = max(0.0, min(1.0, t))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def simplify_ring(ring: List[List[float]], tolerance_deg: float) -> List[List[float]]:
+    """
+    Douglas-Peucker simplification of a closed ring.
+
+    Every vertex (and therefore every edge) of the original ring lies within
+    tolerance_deg of the simplified ring, which is what lets the geofence
+    trust the simplified ring for points farther than that from its edges.
+    """
+    n = len(ring)
+    if n <= 4 or tolerance_deg <= 0:
+        return ring
+
+    # Anchor the closed ring at its first point and the vertex farthest from it.
+    x0, y0 = ring[0]
+    far = max(range(1, n - 1), key=lambda i: math.hypot(ring[i][0] - x0, ring[i][1] - y0))
+
+    keep = [False] * n
+    keep[0] = keep[far] = keep[n - 1] = True
+
+    stack = [(0, far), (far, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        ax, ay = ring[start]
+        bx, by = ring[end]
+        max_d, max_i = -1.0, start
+        for i in range(start + 1, end):
+            d = segment_distance(ring[i][0], ring[i][1], ax, ay, bx, by)
+            if d > max_d:
+                max_d, max_i = d, i
+        if max_d > tolerance_deg:
+            keep[max_i] = True
+            stack.append((start, max_i))
+            stack.append((max_i, end))
+
+    simplified = [ring[i] for i in range(n) if keep[i]]
+    if len(simplified) < 4:
+        return ring
+    return simplified
+
+
+def prepare_polygon(points: Sequence[Sequence[float]]) -> PreparedPolygon:
+    """
+    Normalize, repair and (for large rings) simplify a validated ring using
+    ZONE_SIMPLIFY_TOLERANCE_DEG and ZONE_SIMPLIFY_MIN_POINTS.
+    """
+    ring = repair_ring(normalize_ring(points))
+
+    tolerance = float(getattr(settings, "ZONE_SIMPLIFY_TOLERANCE_DEG", 0.0))
+    min_points = int(getattr(settings, "ZONE_SIMPLIFY_MIN_POINTS", 64))
+    if tolerance <= 0 or len(ring) < min_points:
+        return PreparedPolygon(ring=ring, simplified=[], tolerance_deg=None)
+
+    simplified = simplify_ring(ring, tolerance)
+    if len(simplified) == len(ring):
+        return PreparedPolygon(ring=ring, simplified=[], tolerance_deg=None)
+    return PreparedPolygon(ring=ring, simplified=simplified, tolerance_deg=tolerance)
@@ -0,0 +1,50 @@
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from drones.models import Drone
+from drones.signals import drone_presence_changed
+
+logger = logging.getLogger(__name__)
+
+
+def online_cutoff(now: Optional[datetime] = None) -> datetime:
+    now = now or timezone.now()
+    return now - timezone.timedelta(seconds=settings.ONLINE_WINDOW_SECONDS)
+
+
+def emit_presence_change(serials: List[str], online: bool) -> None:
+    if not serials:
+        return
+    logger.info("%d drone(s) went %s: %s", len(serials), "online" if online else "offline", ", ".join(serials[:20]))
+    drone_presence_changed.send(sender=Drone, serials=serials, online=online)
+
+
+def sweep_presence(now: Optional[datetime] = None) -> Tuple[List[str], List[str]]:
+    """
+    Reconcile Drone.is_online with last_seen_at.
+
+    Returns (came_online, went_offline) serials and emits
+    drone_presence_changed for each non-empty group. Both directions are
+    single UPDATE statements driven by the presence indexes.
+    """
+    cutoff = online_cutoff(now)
+
+    with transaction.atomic():
+        stale = Drone.objects.filter(is_online=True).exclude(last_seen_at__gte=cutoff)
+        went_offline = list(stale.values_list("serial", flat=True))
+        if went_offline:
+            stale.filter(serial__in=went_offline).update(is_online=False)
+
+        fresh = Drone.objects.filter(is_online=False, last_seen_at__gte=cutoff)
+        came_online = list(fresh.values_list("serial", flat=True))
+        if came_online:
+            fresh.filter(serial__in=came_online).update(is_online=True)
+
+    emit_presence_change(came_online, online=True)
+    emit_presence_change(went_offline, online=False)
+    return came_online, went_offline
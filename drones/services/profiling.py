@@ -0,0 +1,236 @@
+"""
+Opt-in sampling profiler for the ingest path and API views.
+
+A Profiler samples a fraction of units of work (MQTT messages, HTTP
+requests). For a sampled unit it records the wall time of every stage()
+block run inside it (stages may nest: "classify" includes "geofence"),
+the number and time of SQL queries, and optionally a cProfile of the
+whole unit. Aggregates are logged, and the merged cProfile stats written
+to PROFILE_DIR, every PROFILE_REPORT_SECONDS.
+
+When a unit is not sampled stage() is a context-variable lookup returning
+a shared no-op context manager, and a disabled profiler skips even the
+sampling decision.
+"""
+import contextvars
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_NULL = nullcontext()
+_current: contextvars.ContextVar[Optional["_Sample"]] = contextvars.ContextVar("drones_profile_sample", default=None)
+
+
+class _Timing:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+
+class _Sample:
+    __slots__ = ("key", "stages", "queries", "query_seconds")
+
+    def __init__(self, key: str):
+        # May be refined while the unit runs (e.g. to the resolved URL route).
+        self.key = key
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_seconds += time.perf_counter() - started
+
+
+@contextmanager
+def _timed(sample: _Sample, name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample.stages[name] += time.perf_counter() - started
+
+
+def stage(name: str):
+    """
+    Time a block as stage `name` of the current sampled unit (no-op otherwise).
+    """
+    sample = _current.get()
+    if sample is None:
+        return _NULL
+    return _timed(sample, name)
+
+
+class Profiler:
+    """
+    Aggregates sampled units per key (e.g. "message" or a URL route).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float = 0.0,
+        use_cprofile: bool = False,
+        report_seconds: float = 60.0,
+        directory: str = "",
+        top: int = 25,
+    ):
+        self.name = name
+        self.rate = max(0.0, min(float(rate), 1.0))
+        self.use_cprofile = use_cprofile
+        self.report_seconds = report_seconds
+        self.directory = directory
+        self.top = top
+
+        self._lock = threading.Lock()
+        self._units: Dict[str, _Timing] = defaultdict(_Timing)
+        self._stages: Dict[str, Dict[str, _Timing]] = defaultdict(lambda: defaultdict(_Timing))
+        self._queries: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        self._stats: Optional[pstats.Stats] = None
+        self._last_report = time.monotonic()
+        self._random = random.Random()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    @classmethod
+    def from_settings(cls, name: str, rate: Optional[float] = None, use_cprofile: Optional[bool] = None) -> "Profiler":
+        return cls(
+            name,
+            rate=getattr(settings, f"PROFILE_{name.upper()}_RATE", 0.0) if rate is None else rate,
+            use_cprofile=getattr(settings, "PROFILE_CPROFILE", False) if use_cprofile is None else use_cprofile,
+            report_seconds=getattr(settings, "PROFILE_REPORT_SECONDS", 60.0),
+            directory=getattr(settings, "PROFILE_DIR", ""),
+        )
+
+    def sample(self, key: str):
+        """
+        Context manager around one unit of work; records it if sampled.
+        """
+        if self.rate <= 0 or (self.rate < 1 and self._random.random() >= self.rate):
+            return _NULL
+        return self._record(key)
+
+    @contextmanager
+    def _record(self, key: str) -> Iterator[_Sample]:
+        sample = _Sample(key)
+        token = _current.set(sample)
+        profile = None
+        if self.use_cprofile:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # another profiler is active (Python 3.12+: one per process)
+                profile = None
+
+        started = time.perf_counter()
+        try:
+            with _wrap_all_connections(sample):
+                yield sample
+        finally:
+            elapsed = time.perf_counter() - started
+            if profile is not None:
+                profile.disable()
+            _current.reset(token)
+            self._add(sample.key, elapsed, sample, profile)
+            self.maybe_report()
+
+    def _add(self, key: str, elapsed: float, sample: _Sample, profile: Optional[cProfile.Profile]) -> None:
+        with self._lock:
+            self._units[key].add(elapsed)
+            for name, seconds in sample.stages.items():
+                self._stages[key][name].add(seconds)
+            q = self._queries[key]
+            q[0] += sample.queries
+            q[1] += sample.query_seconds
+            if profile is not None:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+
+    def report(self, reset: bool = True) -> str:
+        """
+        Text report of everything sampled since the last reset.
+        """
+        with self._lock:
+            units, stages, queries, stats = self._units, self._stages, self._queries, self._stats
+            if reset:
+                self._units = defaultdict(_Timing)
+                self._stages = defaultdict(lambda: defaultdict(_Timing))
+                self._queries = defaultdict(lambda: [0, 0.0])
+                self._stats = None
+
+        lines = [f"[profile {self.name}] {sum(u.count for u in units.values())} sampled unit(s), rate={self.rate:g}"]
+        for key in sorted(units, key=lambda k: -units[k].total):
+            u = units[key]
+            n_queries, query_s = queries[key]
+            lines.append(
+                f"  {key}: n={u.count} avg={u.total / u.count * 1000:.2f}ms max={u.max * 1000:.2f}ms "
+                f"sql={n_queries / u.count:.1f}/unit {query_s / u.count * 1000:.2f}ms"
+            )
+            for name, t in sorted(stages[key].items(), key=lambda item: -item[1].total):
+                lines.append(f"    {name}: n={t.count} avg={t.total / t.count * 1000:.3f}ms max={t.max * 1000:.2f}ms")
+
+        if stats is not None:
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+                path = os.path.join(self.directory, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+                stats.dump_stats(path)
+                lines.append(f"  cProfile stats written to {path}")
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats("cumulative").print_stats(self.top)
+            lines.append(out.getvalue().rstrip())
+        return "\n".join(lines)
+
+    def maybe_report(self) -> None:
+        if self.report_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_report < self.report_seconds:
+                return
+            self._last_report = now
+        logger.info("%s", self.report())
+
+
+@contextmanager
+def _wrap_all_connections(sample: _Sample) -> Iterator[None]:
+    wrapped = []
+    try:
+        for conn in connections.all():
+            conn.execute_wrappers.append(sample)
+            wrapped.append(conn)
+        yield
+    finally:
+        for conn in wrapped:
+            conn.execute_wrappers.remove(sample)
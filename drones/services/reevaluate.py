@@ -0,0 +1,181 @@
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import BooleanField, Case, JSONField, Q, Value, When
+from django.utils import timezone
+
+from drones.models import Drone
+from drones.services.cache_version import bump_version
+from drones.services.conflicts import CONFLICT_REASON, with_conflict
+from drones.services.decoding import OSD_POSITION_FIELDS, extract_fields
+from drones.services.geofence import get_geofence_index
+from drones.services.osd_store import get_latest_payloads
+from drones.services.rules import classify, get_rule_set
+
+logger = logging.getLogger(__name__)
+
+# Danger inputs stored on the Drone row; other rule fields come from the latest OSD payload.
+_DRONE_FIELDS = ("latitude", "longitude", "height", "horizontal_speed")
+
+
+@dataclass(frozen=True)
+class ReevaluationResult:
+    checked: int
+    changed: int
+    # Changed drones left alone because they were written (ingest, mark-safe, ...) while this ran.
+    skipped: int = 0
+
+
+def reevaluate_fleet(chunk_size: int = 2000, batch_size: int = 1000) -> ReevaluationResult:
+    """
+    Re-classify every drone's current state against the current rules and
+    zones, and write back only the drones whose danger reasons changed,
+    with one bulk update per batch_size drones.
+
+    Positions, height and speed come from the Drone rows; rule fields that
+    are not stored on Drone (e.g. battery_percent) come from the latest OSD
+    payloads, fetched in bulk. A row is only written if its updated_at is
+    still the one read here: a drone ingested (or marked safe) meanwhile
+    keeps that newer state, which was classified with the new rules anyway.
+    """
+    rule_set = get_rule_set()
+    index = get_geofence_index()
+    now = timezone.now()
+    extra_fields = tuple(f for f in rule_set.fields if f not in _DRONE_FIELDS)
+
+    qs = Drone.objects.only("id", "drone_class", *_DRONE_FIELDS, "is_dangerous", "danger_reasons", "updated_at")
+    checked = 0
+    changed: List[Tuple[Drone, datetime]] = []
+
+    for chunk in _chunks(qs.order_by("id").iterator(chunk_size=chunk_size), chunk_size):
+        payloads = get_latest_payloads(d.pk for d in chunk) if extra_fields else {}
+        for d in chunk:
+            values = {f: getattr(d, f) for f in OSD_POSITION_FIELDS}
+            if extra_fields:
+                values.update(extract_fields(payloads.get(d.pk) or {}, extra_fields)[0])
+
+            reasons = classify(
+                values,
+                d.latitude,
+                d.longitude,
+                drone_class=d.drone_class,
+                now=now,
+                rule_set=rule_set,
+                index=index,
+            )
+            # Separation conflicts are owned by the conflict detector.
+            reasons = with_conflict(reasons, CONFLICT_REASON in (d.danger_reasons or []))
+            checked += 1
+            if reasons != list(d.danger_reasons or []) or d.is_dangerous != bool(reasons):
+                changed.append((d, d.updated_at))
+                d.is_dangerous = bool(reasons)
+                d.danger_reasons = reasons
+
+    written = 0
+    for batch in _chunks(changed, batch_size):
+        written += _write_unchanged(batch, now)
+    if written:
+        bump_version()
+    skipped = len(changed) - written
+    logger.info("Fleet re-evaluation: %d drones checked, %d changed, %d skipped", checked, written, skipped)
+    return ReevaluationResult(checked=checked, changed=written, skipped=skipped)
+
+
+def _write_unchanged(batch: List[Tuple[Drone, datetime]], now: datetime) -> int:
+    """
+    One UPDATE for the batch, limited to rows whose updated_at is still the
+    value that was read (bulk_update has no per-row condition).
+    """
+    still_as_read = Q()
+    dangerous, reasons = [], []
+    for d, read_at in batch:
+        still_as_read |= Q(pk=d.pk, updated_at=read_at)
+        dangerous.append(When(pk=d.pk, then=Value(d.is_dangerous)))
+        reasons.append(When(pk=d.pk, then=Value(d.danger_reasons, output_field=JSONField())))
+    return Drone.objects.filter(still_as_read).update(
+        is_dangerous=Case(*dangerous, output_field=BooleanField()),
+        danger_reasons=Case(*reasons, output_field=JSONField()),
+        updated_at=now,
+    )
+
+
+def _chunks(iterable, size: int):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _BackgroundReevaluation:
+    """
+    Runs reevaluate_fleet() on a daemon thread, off the request that changed
+    zones or rules. Requests made while a run is in progress are coalesced
+    into one more run, so the last change is always applied.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = False
+        self._thread: Optional[threading.Thread] = None
+
+    def request(self) -> None:
+        with self._lock:
+            self._pending = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="fleet-reevaluation", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                self._pending = False
+            try:
+                close_old_connections()
+                reevaluate_fleet()
+            except Exception:
+                logger.exception("Fleet re-evaluation failed")
+            finally:
+                close_old_connections()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+
+_background = _BackgroundReevaluation()
+
+
+def _run_scheduled_reevaluation() -> None:
+    if getattr(settings, "FLEET_REEVALUATION_ASYNC", True):
+        _background.request()
+        return
+    try:
+        reevaluate_fleet()
+    except Exception:
+        logger.exception("Fleet re-evaluation failed")
+
+
+def schedule_fleet_reevaluation(using: Optional[str] = None) -> None:
+    """
+    Re-evaluate the fleet once the current transaction commits (right away
+    in autocommit), in the background unless FLEET_REEVALUATION_ASYNC is
+    off. Repeated calls within one transaction, e.g. a bulk zone delete
+    firing one signal per zone, schedule a single run.
+    """
+    conn = transaction.get_connection(using)
+    if any(entry[1] is _run_scheduled_reevaluation for entry in conn.run_on_commit):
+        return
+    transaction.on_commit(_run_scheduled_reevaluation, using=using)
@@ -0,0 +1,141 @@
+"""
+Read-replica selection for ReadReplicaRouter (drones/routers.py).
+
+Reads go to the primary unless they run inside use_replica(). Only the
+read-only API views (lists, paths, stats, exports) opt in, so ingest, the
+sweepers, authentication and every write keep using the primary.
+
+The alias is chosen once when the block is entered, so all reads of one
+request come from the same database. It is the primary when
+- no replica is configured (DATABASE_REPLICA_ALIAS not in DATABASES),
+- the replica lags by more than DATABASE_REPLICA_MAX_LAG_SECONDS, or cannot
+  be reached (checked at most every DATABASE_REPLICA_LAG_CHECK_SECONDS per
+  process; only PostgreSQL reports a lag),
+- pin_primary() was called recently: API writes pin reads to the primary
+  for the tolerated lag, so clients read their own writes and the response
+  cache is not refilled from a replica that has not seen them yet.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+PIN_KEY = "drones:db:primary_pinned_until"
+
+# 0 when the standby has replayed everything it received; otherwise the age of the last replayed transaction.
+_LAG_SQL = {
+    "postgresql": (
+        "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    ),
+}
+
+_read_alias: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("drones_read_alias", default=None)
+
+_lag_lock = threading.Lock()
+_lag: Dict[str, Tuple[float, Optional[float]]] = {}
+
+
+def replica_alias() -> str:
+    """
+    The configured replica alias, or "" when there is none.
+    """
+    alias = getattr(settings, "DATABASE_REPLICA_ALIAS", "")
+    if not alias or alias == DEFAULT_DB_ALIAS or alias not in settings.DATABASES:
+        return ""
+    return alias
+
+
+def current_read_alias() -> Optional[str]:
+    """
+    Alias chosen by the enclosing use_replica() block (None outside one).
+    """
+    return _read_alias.get()
+
+
+def measure_lag(alias: str) -> Optional[float]:
+    """
+    Replication lag of `alias` in seconds (0 on backends that do not report
+    one), or None if the database cannot be queried.
+    """
+    sql = _LAG_SQL.get(connections[alias].vendor)
+    if sql is None:
+        return 0.0
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(sql)
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        return None
+
+
+def replica_lag(alias: str) -> Optional[float]:
+    """
+    measure_lag(), reused for DATABASE_REPLICA_LAG_CHECK_SECONDS.
+    """
+    now = time.monotonic()
+    interval = float(getattr(settings, "DATABASE_REPLICA_LAG_CHECK_SECONDS", 5.0))
+    with _lag_lock:
+        checked = _lag.get(alias)
+    if checked is not None and now - checked[0] < interval:
+        return checked[1]
+    lag = measure_lag(alias)
+    with _lag_lock:
+        _lag[alias] = (now, lag)
+    return lag
+
+
+def reset_replica_lag() -> None:
+    with _lag_lock:
+        _lag.clear()
+
+
+def _pin_seconds() -> float:
+    # The last lag check may be this old, so a write may be missing from the replica for up to both.
+    return float(getattr(settings, "DATABASE_REPLICA_MAX_LAG_SECONDS", 5.0)) + float(
+        getattr(settings, "DATABASE_REPLICA_LAG_CHECK_SECONDS", 5.0)
+    )
+
+
+def pin_primary() -> None:
+    """
+    Serve replica-eligible reads from the primary for a while (call after a
+    write whose effect the client will read back). Shared through the cache.
+    """
+    if not replica_alias():
+        return
+    seconds = _pin_seconds()
+    cache.set(PIN_KEY, time.time() + seconds, timeout=int(seconds) + 1)
+
+
+def read_alias() -> str:
+    """
+    Database to serve a replica-eligible read from right now.
+    """
+    alias = replica_alias()
+    if not alias:
+        return DEFAULT_DB_ALIAS
+    if cache.get(PIN_KEY, 0) > time.time():
+        return DEFAULT_DB_ALIAS
+    lag = replica_lag(alias)
+    if lag is None or lag > float(getattr(settings, "DATABASE_REPLICA_MAX_LAG_SECONDS", 5.0)):
+        return DEFAULT_DB_ALIAS
+    return alias
+
+
+@contextmanager
+def use_replica() -> Iterator[str]:
+    """
+    Route the reads in this block to read_alias() (also usable as a decorator).
+    """
+    alias = read_alias()
+    token = _read_alias.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_alias.reset(token)
@@ -0,0 +1,244 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from drones.models import DangerRuleDefinition
+from drones.services.geofence import GEOFENCE_REASON, GeofenceIndex, get_geofence_index
+from drones.services.profiling import stage
+
+OPERATORS: Dict[str, str] = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+FIELDS = frozenset(name for name, _ in DangerRuleDefinition.FIELD_CHOICES)
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """
+    One danger rule as data: "<field> <operator> <threshold>", optionally
+    scoped to a drone class, a zone and/or a time window.
+    """
+    name: str
+    field: str
+    operator: str
+    threshold: float
+    reason: str = ""
+    drone_class: str = ""
+    zone_id: Optional[int] = None
+    active_from: Optional[datetime] = None
+    active_until: Optional[datetime] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "threshold", float(self.threshold))
+        if not math.isfinite(self.threshold):
+            raise ValueError(f"Rule {self.name!r} threshold must be a finite number.")
+        if self.field not in FIELDS:
+            raise ValueError(f"Unknown rule field {self.field!r}; expected one of {sorted(FIELDS)}.")
+        if self.operator not in OPERATORS:
+            raise ValueError(f"Unknown rule operator {self.operator!r}; expected one of {sorted(OPERATORS)}.")
+
+    @property
+    def reason_text(self) -> str:
+        return self.reason or f"{self.field} {OPERATORS[self.operator]} {self.threshold}"
+
+
+def rules_from_settings() -> List[RuleSpec]:
+    try:
+        return [
+            RuleSpec(
+                name=r["name"],
+                field=r["field"],
+                operator=r["operator"],
+                threshold=r["threshold"],
+                reason=r.get("reason", ""),
+                drone_class=r.get("drone_class", ""),
+            )
+            for r in getattr(settings, "DANGER_RULES", [])
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        raise ImproperlyConfigured(f"Invalid DANGER_RULES entry: {e}")
+
+
+def rules_from_db() -> List[RuleSpec]:
+    return [
+        RuleSpec(
+            name=r.name,
+            field=r.field,
+            operator=r.operator,
+            threshold=r.threshold,
+            reason=r.reason,
+            drone_class=r.drone_class,
+            zone_id=r.zone_id,
+            active_from=r.active_from,
+            active_until=r.active_until,
+        )
+        for r in DangerRuleDefinition.objects.filter(is_active=True)
+    ]
+
+
+def merge_rules(base: Iterable[RuleSpec], overrides: Iterable[RuleSpec]) -> List[RuleSpec]:
+    """
+    Rules are keyed by (name, drone_class); overrides replace base rules
+    with the same key and otherwise are appended.
+    """
+    merged: Dict[Tuple[str, str], RuleSpec] = {}
+    for r in list(base) + list(overrides):
+        merged[(r.name, r.drone_class)] = r
+    return list(merged.values())
+
+
+def _compile(rules: Sequence[RuleSpec]) -> Tuple[str, Callable[..., List[str]]]:
+    """
+    Generate one Python function evaluating every rule inline.
+
+    Only validated field names, operator tokens and float literals are
+    written into the source; reasons, classes, zones and time bounds are
+    passed in as constants so no user text is ever executed.
+    """
+    consts: List[Any] = []
+
+    def const(value: Any) -> str:
+        consts.append(value)
+        return f"_C[{len(consts) - 1}]"
+
+    def check(rule: RuleSpec, indent: str) -> List[str]:
+        cond = [f"v is not None and v {OPERATORS[rule.operator]} {rule.threshold!r}"]
+        if rule.zone_id is not None:
+            cond.append(f"{const(rule.zone_id)} in zone_ids")
+        if rule.active_from is not None:
+            cond.append(f"now >= {const(rule.active_from)}")
+        if rule.active_until is not None:
+            cond.append(f"now < {const(rule.active_until)}")
+        return [
+            f"{indent}v = get({rule.field!r})",
+            f"{indent}if {' and '.join(cond)}:",
+            f"{indent}    append({const(rule.reason_text)})",
+        ]
+
+    groups: Dict[str, List[RuleSpec]] = {}
+    for r in rules:
+        groups.setdefault(r.name, []).append(r)
+
+    lines = [
+        "def _evaluate(values, drone_class, zone_ids, now):",
+        "    reasons = []",
+        "    append = reasons.append",
+        "    get = values.get",
+    ]
+    for group in groups.values():
+        default = next((r for r in group if not r.drone_class), None)
+        overrides = [r for r in group if r.drone_class]
+        if not overrides:
+            lines += check(default, "    ")
+            continue
+        for i, r in enumerate(overrides):
+            kw = "if" if i == 0 else "elif"
+            lines.append(f"    {kw} drone_class == {const(r.drone_class)}:")
+            lines += check(r, "        ")
+        if default is not None:
+            lines.append("    else:")
+            lines += check(default, "        ")
+    lines.append("    return reasons")
+
+    source = "\n".join(lines) + "\n"
+    namespace: Dict[str, Any] = {"_C": tuple(consts)}
+    exec(compile(source, "<danger-rules>", "exec"), namespace)
+    return source, namespace["_evaluate"]
+
+
+class CompiledRuleSet:
+    """
+    A set of danger rules compiled into a single evaluator function.
+
+    values: mapping of field name -> float (or None when missing)
+    """
+
+    def __init__(self, rules: Sequence[RuleSpec]):
+        self.rules = list(rules)
+        self.fields: Tuple[str, ...] = tuple(sorted({r.field for r in self.rules}))
+        self.needs_zones = any(r.zone_id is not None for r in self.rules)
+        self.source, self._evaluate = _compile(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def evaluate(
+        self,
+        values: Mapping[str, Optional[float]],
+        drone_class: str = "",
+        zone_ids: Iterable[int] = (),
+        now: Optional[datetime] = None,
+    ) -> List[str]:
+        return self._evaluate(values, drone_class or "", zone_ids, now or timezone.now())
+
+
+_rule_set: Optional[CompiledRuleSet] = None
+_rule_version: Any = None
+_checked_at = 0.0
+_rule_lock = threading.Lock()
+
+
+def _db_version() -> Tuple[int, Any]:
+    agg = DangerRuleDefinition.objects.aggregate(n=Count("id"), latest=Max("updated_at"))
+    return agg["n"], agg["latest"]
+
+
+def get_rule_set() -> CompiledRuleSet:
+    """
+    Return the process-wide compiled rule set.
+
+    At most every DANGER_RULES_RELOAD_SECONDS a cheap version query checks
+    the rule table and recompiles when definitions changed, so edits made
+    in the admin reach running consumers without a redeploy.
+    """
+    global _rule_set, _rule_version, _checked_at
+    reload_s = float(getattr(settings, "DANGER_RULES_RELOAD_SECONDS", 5))
+    if _rule_set is not None and time.monotonic() - _checked_at < reload_s:
+        return _rule_set
+
+    with _rule_lock:
+        version = _db_version()
+        if _rule_set is None or version != _rule_version:
+            _rule_set = CompiledRuleSet(merge_rules(rules_from_settings(), rules_from_db()))
+            _rule_version = version
+        _checked_at = time.monotonic()
+        return _rule_set
+
+
+def invalidate_rule_set() -> None:
+    global _rule_set
+    with _rule_lock:
+        _rule_set = None
+
+
+def classify(
+    values: Mapping[str, Optional[float]],
+    lat: Optional[float],
+    lon: Optional[float],
+    drone_class: str = "",
+    now: Optional[datetime] = None,
+    rule_set: Optional[CompiledRuleSet] = None,
+    index: Optional[GeofenceIndex] = None,
+) -> List[str]:
+    """
+    Danger reasons for one drone state: data-defined rules first, then the
+    geofence reason when the position is inside an active zone.
+    """
+    rule_set = rule_set or get_rule_set()
+    zone_ids: List[int] = []
+    if lat is not None and lon is not None:
+        index = index or get_geofence_index()
+        with stage("geofence"):
+            zone_ids = index.zones_containing(lat, lon)
+
+    with stage("rules"):
+        reasons = rule_set.evaluate(values, drone_class=drone_class, zone_ids=zone_ids, now=now)
+    if zone_ids:
+        reasons.append(GEOFENCE_REASON)
+    return list(dict.fromkeys(reasons))
@@ -0,0 +1,265 @@
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# crc32, received_at (unix seconds), topic length, payload length
+RECORD = struct.Struct("<IdHI")
+SEGMENT_PREFIX = "seg-"
+SEGMENT_SUFFIX = ".spool"
+DEAD_LETTER_NAME = "dead-letter.spool"
+
+
+@dataclass(frozen=True)
+class SpoolRecord:
+    topic: str
+    payload: bytes
+    received_at: float
+
+
+def _segment_name(seq: int) -> str:
+    return f"{SEGMENT_PREFIX}{seq:012d}{SEGMENT_SUFFIX}"
+
+
+def _segment_seq(name: str) -> Optional[int]:
+    if not (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)):
+        return None
+    try:
+        return int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+    except ValueError:
+        return None
+
+
+def read_segment(path: str) -> Iterator[SpoolRecord]:
+    """
+    Yield the records of one segment file. A torn or corrupt tail (crash
+    mid-write) ends the segment.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    view = memoryview(data)
+    pos = 0
+    while pos < len(view):
+        if pos + RECORD.size > len(view):
+            logger.warning("Spool segment %s has a truncated tail at offset %d", path, pos)
+            return
+        crc, received_at, topic_len, payload_len = RECORD.unpack_from(view, pos)
+        start = pos + RECORD.size
+        end = start + topic_len + payload_len
+        if end > len(view):
+            logger.warning("Spool segment %s has a truncated tail at offset %d", path, pos)
+            return
+        body = view[start:end]
+        if zlib.crc32(body) != crc:
+            logger.warning("Spool segment %s has a corrupt record at offset %d", path, pos)
+            return
+        yield SpoolRecord(
+            topic=bytes(body[:topic_len]).decode("utf-8", "replace"),
+            payload=bytes(body[topic_len:]),
+            received_at=received_at,
+        )
+        pos = end
+
+
+class Spool:
+    """
+    Local append-only spool of raw MQTT frames, used while the database is
+    unavailable (or always, to decouple ingest from DB latency).
+
+    - Frames are appended to numbered segment files; a segment is closed
+      once it reaches segment_bytes, and only closed segments are replayed.
+    - Writes are flushed on every append and fsync'ed every fsync_every
+      records or fsync_seconds, whichever comes first.
+    - Total size is bounded by max_bytes: beyond it the oldest closed
+      segment is dropped (and counted) so the disk never fills up.
+    - Replay is at-least-once; re-delivered frames are dropped by the
+      ingest dedup (see drones/services/dedup.py).
+    - Frames that can never be ingested are moved to a dead-letter file
+      (same record format, never replayed) so they cannot block the spool.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 8 * 1024 * 1024,
+        max_bytes: int = 512 * 1024 * 1024,
+        fsync_every: int = 100,
+        fsync_seconds: float = 1.0,
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync_every = fsync_every
+        self.fsync_seconds = fsync_seconds
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_seq = 0
+        self._file_bytes = 0
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        self._closed: Dict[int, int] = {}  # seq -> size, closed segments awaiting replay
+        self._counts: Dict[str, int] = {"appended": 0, "replayed": 0, "dropped": 0, "dead_lettered": 0}
+
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            seq = _segment_seq(name)
+            if seq is not None:
+                # Whatever a previous process left behind is replayed first.
+                self._closed[seq] = os.path.getsize(os.path.join(directory, name))
+        self._next_seq = max(self._closed, default=0) + 1
+
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, _segment_name(seq))
+
+    @property
+    def dead_letter_path(self) -> str:
+        return os.path.join(self.directory, DEAD_LETTER_NAME)
+
+    # --- writing -----------------------------------------------------------
+
+    @staticmethod
+    def _pack(topic: str, payload: bytes, received_at: float) -> bytes:
+        topic_b = topic.encode("utf-8")
+        body = topic_b + bytes(payload)
+        return RECORD.pack(zlib.crc32(body), received_at, len(topic_b), len(payload)) + body
+
+    def append(self, topic: str, payload: bytes, received_at: float) -> None:
+        record = self._pack(topic, payload, received_at)
+
+        with self._lock:
+            if self._file is None:
+                self._open_segment()
+            self._file.write(record)
+            self._file.flush()
+            self._file_bytes += len(record)
+            self._unsynced += 1
+            self._counts["appended"] += 1
+
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._synced_at >= self.fsync_seconds:
+                self._sync()
+            if self._file_bytes >= self.segment_bytes:
+                self._close_segment()
+            self._enforce_limit()
+
+    def _open_segment(self) -> None:
+        self._file_seq = self._next_seq
+        self._next_seq += 1
+        self._file = open(self._path(self._file_seq), "ab")
+        self._file_bytes = 0
+
+    def _sync(self) -> None:
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def _close_segment(self) -> None:
+        if self._file is None:
+            return
+        self._sync()
+        self._file.close()
+        self._closed[self._file_seq] = self._file_bytes
+        self._file = None
+        self._file_bytes = 0
+
+    def _enforce_limit(self) -> None:
+        while self._closed and self._depth_bytes() > self.max_bytes:
+            seq = min(self._closed)
+            path = self._path(seq)
+            dropped = sum(1 for _ in read_segment(path))
+            self._closed.pop(seq)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._counts["dropped"] += dropped
+            logger.error("Spool over %d bytes: dropped oldest segment %s (%d frames)", self.max_bytes, path, dropped)
+
+    def dead_letter(self, topic: str, payload: bytes, received_at: float) -> None:
+        """
+        Set aside a frame that failed for good; read it back with
+        read_segment(spool.dead_letter_path).
+        """
+        record = self._pack(topic, payload, received_at)
+        with self._lock:
+            with open(self.dead_letter_path, "ab") as f:
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+            self._counts["dead_lettered"] += 1
+        logger.error("Dead-lettered frame on %s (%d bytes) in %s", topic, len(payload), self.dead_letter_path)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segment()
+
+    # --- reading -----------------------------------------------------------
+
+    def _depth_bytes(self) -> int:
+        return sum(self._closed.values()) + self._file_bytes
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._closed) or self._file_bytes > 0
+
+    def replay(self, handler: Callable[[List[SpoolRecord]], None], batch_size: int = 500) -> int:
+        """
+        Feed spooled frames, oldest first, to handler in batches of up to
+        batch_size. A segment is deleted once all of its batches were
+        handled; an exception from handler stops the replay and leaves the
+        segment in place for the next attempt. Returns the frames handled.
+        """
+        with self._lock:
+            self._close_segment()
+            pending = sorted(self._closed)
+
+        total = 0
+        for seq in pending:
+            path = self._path(seq)
+            handled = 0
+            batch: List[SpoolRecord] = []
+            try:
+                for record in read_segment(path):
+                    batch.append(record)
+                    if len(batch) >= batch_size:
+                        handler(batch)
+                        handled += len(batch)
+                        batch = []
+                if batch:
+                    handler(batch)
+                    handled += len(batch)
+            except FileNotFoundError:
+                pass  # dropped by the size limit while we were reading
+
+            with self._lock:
+                self._closed.pop(seq, None)
+                self._counts["replayed"] += handled
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total += handled
+        return total
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Spool depth (segments/bytes still to replay) plus lifetime counters.
+        """
+        with self._lock:
+            return {
+                "segments": len(self._closed) + (1 if self._file is not None else 0),
+                "bytes": self._depth_bytes(),
+                **self._counts,
+            }
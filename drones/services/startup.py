@@ -0,0 +1,71 @@
+"""
+Startup helpers for long-running workers (mqtt_consumer, consumer.py).
+"""
+import os
+import time
+from typing import List, Optional, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def process_uptime() -> Optional[float]:
+    """
+    Seconds since this process started, interpreter start-up included
+    (Linux /proc, 10ms resolution), or None where that is not available.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after "(comm)"; starttime is field 22 of the whole line.
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK"), 0.0)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def pending_migrations(database: str = DEFAULT_DB_ALIAS) -> List[str]:
+    """
+    Migrations of the installed apps not yet applied to `database`, as "app.name".
+    """
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connections[database])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [f"{migration.app_label}.{migration.name}" for migration, backwards in plan]
+
+
+def migrate_if_needed(database: str = DEFAULT_DB_ALIAS) -> List[str]:
+    """
+    Apply pending migrations; when the schema is current this costs two
+    queries instead of a full `migrate` run. Returns the migrations applied.
+    """
+    pending = pending_migrations(database)
+    if pending:
+        from django.core.management import call_command
+
+        call_command("migrate", database=database, verbosity=0, interactive=False)
+    return pending
+
+
+class StartupTimer:
+    """
+    Wall time of named start-up phases, reported relative to process start.
+    """
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float]] = []
+        self._started = time.perf_counter()
+        self._loaded = process_uptime()
+
+    def phase(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((name, now - self._started))
+        self._started = now
+
+    def summary(self) -> str:
+        parts = [] if self._loaded is None else [f"django {self._loaded * 1000:.0f}ms"]
+        parts += [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases]
+        total = process_uptime()
+        head = "Started" if total is None else f"Started in {total * 1000:.0f}ms"
+        return f"{head} ({', '.join(parts)})"
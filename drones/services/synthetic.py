@@ -0,0 +1,323 @@
+"""
+Synthetic fleets for benchmarks and local scale testing.
+
+Drones fly one of FLIGHT_PATTERNS around random home points; their tracks
+are written straight to the telemetry table (COPY on PostgreSQL, bulk
+executemany inserts elsewhere) together with the matching current state and latest
+OSD payload. Zones are a mix of circles and irregular polygons over the
+same area. Everything is seeded, so a given spec always yields the same
+data.
+"""
+import csv
+import io
+import logging
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from drones.models import Drone, DroneOSDPayload, DroneTelemetryPoint, NoFlyZone
+from drones.services.grid import grid_cell, grid_cell_deg
+from drones.services.polygons import prepare_polygon
+from drones.services.reevaluate import reevaluate_fleet
+from drones.services.zone_import import import_zones
+
+logger = logging.getLogger(__name__)
+
+_M_PER_DEG_LAT = 111320.0
+
+# pattern(rng, steps, dt) -> [(east_m, north_m, height_m)] relative to the home point
+Track = List[Tuple[float, float, float]]
+
+
+def _hover(rng: random.Random, steps: int, dt: float) -> Track:
+    height = rng.uniform(20, 80)
+    return [(rng.gauss(0, 1.5), rng.gauss(0, 1.5), height + rng.gauss(0, 0.5)) for _ in range(steps)]
+
+
+def _line(rng: random.Random, steps: int, dt: float) -> Track:
+    heading = rng.uniform(0, 2 * math.pi)
+    speed = rng.uniform(5, 25)
+    height = rng.uniform(40, 150)
+    dx, dy = math.sin(heading) * speed * dt, math.cos(heading) * speed * dt
+    return [(k * dx, k * dy, height + rng.gauss(0, 1)) for k in range(steps)]
+
+
+def _orbit(rng: random.Random, steps: int, dt: float) -> Track:
+    radius = rng.uniform(50, 500)
+    omega = rng.uniform(5, 20) / radius * rng.choice((-1, 1))
+    phase = rng.uniform(0, 2 * math.pi)
+    height = rng.uniform(30, 120)
+    return [
+        (radius * math.cos(phase + omega * k * dt), radius * math.sin(phase + omega * k * dt), height)
+        for k in range(steps)
+    ]
+
+
+def _survey(rng: random.Random, steps: int, dt: float) -> Track:
+    # Lawnmower: legs of `leg` metres, `spacing` metres apart.
+    speed = rng.uniform(5, 12)
+    leg = rng.uniform(200, 800)
+    spacing = rng.uniform(20, 60)
+    height = rng.uniform(60, 120)
+    track = []
+    for k in range(steps):
+        s = k * speed * dt
+        row, along = divmod(s, leg + spacing)
+        if along > leg:
+            x, y = (leg if row % 2 == 0 else 0.0), row * spacing + (along - leg)
+        else:
+            x, y = (along if row % 2 == 0 else leg - along), row * spacing
+        track.append((x, y, height))
+    return track
+
+
+def _random_walk(rng: random.Random, steps: int, dt: float) -> Track:
+    x = y = 0.0
+    height = rng.uniform(20, 100)
+    heading = rng.uniform(0, 2 * math.pi)
+    track = []
+    for _ in range(steps):
+        heading += rng.gauss(0, 0.3)
+        speed = max(rng.gauss(8, 3), 0.0)
+        x += math.sin(heading) * speed * dt
+        y += math.cos(heading) * speed * dt
+        height = min(max(height + rng.gauss(0, 2), 5.0), 700.0)
+        track.append((x, y, height))
+    return track
+
+
+FLIGHT_PATTERNS: Dict[str, Callable[[random.Random, int, float], Track]] = {
+    "hover": _hover,
+    "line": _line,
+    "orbit": _orbit,
+    "survey": _survey,
+    "random_walk": _random_walk,
+}
+
+
+@dataclass(frozen=True)
+class SyntheticFleet:
+    drones: int
+    points: int
+    zones: int
+
+
+def _offset(lat: float, lon: float, east_m: float, north_m: float) -> Tuple[float, float]:
+    new_lat = lat + north_m / _M_PER_DEG_LAT
+    new_lon = lon + east_m / (_M_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+    return new_lat, (new_lon + 180.0) % 360.0 - 180.0
+
+
+def synthetic_zones(
+    count: int,
+    center: Tuple[float, float],
+    spread_km: float,
+    rng: random.Random,
+    polygon_ratio: float = 0.5,
+    prefix: str = "SIM",
+) -> List[NoFlyZone]:
+    """
+    Unsaved zones around center: circles of 0.2-2 km and irregular
+    polygons of 5-40 vertices, prepared like API-created zones.
+    """
+    zones = []
+    for i in range(count):
+        lat, lon = _offset(center[0], center[1], rng.uniform(-1, 1) * spread_km * 1000, rng.uniform(-1, 1) * spread_km * 1000)
+        radius_km = rng.uniform(0.2, 2.0)
+        name = f"{prefix} zone {i:05d}"
+        if rng.random() >= polygon_ratio:
+            zones.append(NoFlyZone(
+                name=name, shape=NoFlyZone.SHAPE_CIRCLE, center_lat=lat, center_lon=lon, radius_km=radius_km,
+            ))
+            continue
+        n = rng.randint(5, 40)
+        ring = []
+        for k in range(n):
+            angle = 2 * math.pi * k / n
+            r = radius_km * 1000 * rng.uniform(0.6, 1.0)
+            p_lat, p_lon = _offset(lat, lon, r * math.cos(angle), r * math.sin(angle))
+            ring.append([p_lon, p_lat])
+        prepared = prepare_polygon(ring)
+        zones.append(NoFlyZone(
+            name=name,
+            shape=NoFlyZone.SHAPE_POLYGON,
+            polygon=prepared.ring,
+            polygon_simplified=prepared.simplified,
+            simplify_tolerance_deg=prepared.tolerance_deg,
+        ))
+    return zones
+
+
+_POINT_COLUMNS = ("drone_id", "timestamp", "latitude", "longitude", "height", "horizontal_speed", "grid_cell", "created_at")
+
+
+def _copy_points(rows: Sequence[Tuple]) -> None:
+    """
+    COPY telemetry rows on PostgreSQL (psycopg2 copy_expert or psycopg 3 copy).
+    """
+    table = connection.ops.quote_name(DroneTelemetryPoint._meta.db_table)
+    sql = f"COPY {table} ({', '.join(_POINT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):
+            buf.seek(0)
+            raw.copy_expert(sql, buf)
+        else:
+            with raw.copy(sql) as copy:
+                copy.write(buf.getvalue())
+
+
+def _insert_points(rows: Sequence[Tuple]) -> None:
+    """
+    One executemany INSERT, skipping model instantiation (which dominates
+    bulk_create at this volume).
+    """
+    table = connection.ops.quote_name(DroneTelemetryPoint._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(_POINT_COLUMNS))
+    sql = f"INSERT INTO {table} ({', '.join(_POINT_COLUMNS)}) VALUES ({placeholders})"
+    adapt = connection.ops.adapt_datetimefield_value
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            (drone_id, adapt(ts), lat, lon, h, v, cell, adapt(created))
+            for drone_id, ts, lat, lon, h, v, cell, created in rows
+        ])
+
+
+def _write_points(rows: List[Tuple], use_copy: bool) -> None:
+    if use_copy:
+        _copy_points(rows)
+    else:
+        _insert_points(rows)
+
+
+def _chunks(n: int, size: int) -> Iterator[range]:
+    for start in range(0, n, size):
+        yield range(start, min(start + size, n))
+
+
+def generate_fleet(
+    drones: int,
+    points: int,
+    zones: int = 0,
+    patterns: Sequence[str] = tuple(FLIGHT_PATTERNS),
+    center: Tuple[float, float] = (31.95, 35.91),
+    spread_km: float = 20.0,
+    interval_seconds: float = 1.0,
+    online_ratio: float = 0.9,
+    polygon_ratio: float = 0.5,
+    end: Optional[datetime] = None,
+    seed: int = 0,
+    prefix: str = "SIM",
+    batch_size: int = 10000,
+    use_copy: Optional[bool] = None,
+) -> SyntheticFleet:
+    """
+    Generate `drones` drones flying `patterns` for `points` fixes each,
+    `interval_seconds` apart, plus `zones` zones. Drones are written in
+    chunks: current state and OSD payload first, then their telemetry.
+    Offline drones (1 - online_ratio) stopped reporting an hour before `end`.
+
+    Drone state is classified (zones and rules) with one fleet
+    re-evaluation at the end. use_copy defaults to True on PostgreSQL.
+    """
+    unknown = set(patterns) - set(FLIGHT_PATTERNS)
+    if unknown or not patterns:
+        raise ValueError(f"Unknown flight pattern(s) {sorted(unknown)}; expected some of {sorted(FLIGHT_PATTERNS)}.")
+    if use_copy is None:
+        use_copy = connection.vendor == "postgresql"
+    rng = random.Random(seed)
+    end = end or timezone.now()
+    created_at = timezone.now()
+    cell_deg = grid_cell_deg()
+    dt = float(interval_seconds)
+    patterns = list(patterns)
+
+    if zones:
+        import_zones(synthetic_zones(zones, center, spread_km, rng, polygon_ratio=polygon_ratio, prefix=prefix))
+
+    total_points = 0
+    drone_chunk = max(batch_size // max(points, 1), 1)
+    for chunk in _chunks(drones, drone_chunk):
+        tracks = []
+        fleet = []
+        for i in chunk:
+            home = _offset(center[0], center[1], rng.uniform(-1, 1) * spread_km * 1000, rng.uniform(-1, 1) * spread_km * 1000)
+            online = rng.random() < online_ratio
+            last = end if online else end - timedelta(hours=1)
+            pattern = patterns[i % len(patterns)]
+            fixes = []
+            prev = None
+            for k, (east, north, height) in enumerate(FLIGHT_PATTERNS[pattern](rng, points, dt)):
+                lat, lon = _offset(home[0], home[1], east, north)
+                speed = 0.0 if prev is None else math.hypot(east - prev[0], north - prev[1]) / dt
+                prev = (east, north)
+                fixes.append((last - timedelta(seconds=dt * (points - 1 - k)), lat, lon, round(height, 2), round(speed, 2)))
+            tracks.append(fixes)
+
+            ts, lat, lon, height, speed = fixes[-1] if fixes else (None, *home, None, None)
+            fleet.append(Drone(
+                serial=f"{prefix}-{i:06d}",
+                latitude=lat,
+                longitude=lon,
+                height=height,
+                horizontal_speed=speed,
+                last_seen_at=ts,
+                is_online=online and ts is not None,
+            ))
+
+        with transaction.atomic():
+            fleet = Drone.objects.bulk_create(fleet)
+            if any(d.pk is None for d in fleet):
+                ids = dict(Drone.objects.filter(serial__in=[d.serial for d in fleet]).values_list("serial", "id"))
+                for d in fleet:
+                    d.pk = ids[d.serial]
+            DroneOSDPayload.objects.bulk_create([
+                DroneOSDPayload(
+                    drone_id=d.pk,
+                    payload={
+                        "latitude": d.latitude,
+                        "longitude": d.longitude,
+                        "height": d.height,
+                        "horizontal_speed": d.horizontal_speed,
+                        "battery_percent": rng.randint(5, 100),
+                    },
+                    received_at=d.last_seen_at or end,
+                )
+                for d in fleet
+            ])
+
+            rows: List[Tuple] = []
+            for d, fixes in zip(fleet, tracks):
+                for ts, lat, lon, height, speed in fixes:
+                    rows.append((d.pk, ts, lat, lon, height, speed, grid_cell(lat, lon, cell_deg), created_at))
+                    if len(rows) >= batch_size:
+                        _write_points(rows, use_copy)
+                        total_points += len(rows)
+                        rows = []
+            if rows:
+                _write_points(rows, use_copy)
+                total_points += len(rows)
+
+    reevaluate_fleet()
+    logger.info("Synthetic fleet: %d drones, %d points, %d zones", drones, total_points, zones)
+    return SyntheticFleet(drones=drones, points=total_points, zones=zones)
+
+
+def delete_synthetic(prefix: str = "SIM") -> Tuple[int, int]:
+    """
+    Remove drones (with their telemetry) and zones created with `prefix`.
+    Returns (drones, zones) deleted.
+    """
+    drone_ids = Drone.objects.filter(serial__startswith=f"{prefix}-").values("id")
+    with transaction.atomic():
+        DroneTelemetryPoint.objects.filter(drone_id__in=drone_ids).delete()
+        _, drones = Drone.objects.filter(serial__startswith=f"{prefix}-").delete()
+        _, zones = NoFlyZone.objects.filter(name__startswith=f"{prefix} zone ").delete()
+    return drones.get(Drone._meta.label, 0), zones.get(NoFlyZone._meta.label, 0)
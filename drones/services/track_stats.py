@@ -0,0 +1,116 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from drones.models import Drone, DroneTelemetryPoint
+from drones.services.geo import haversine_km
+
+
+@dataclass
+class TrackStats:
+    """
+    Running summary of a drone's telemetry points, folded in timestamp
+    order. The trailing position/timestamp/id are kept so more points can
+    be added later without re-reading the ones already counted.
+    """
+    points: int = 0
+    distance_km: float = 0.0
+    max_height: Optional[float] = None
+    height_sum: float = 0.0
+    height_count: int = 0
+    max_speed: Optional[float] = None
+    speed_sum: float = 0.0
+    speed_count: int = 0
+    online_seconds: float = 0.0
+    first_point_at: Optional[datetime] = None
+    last_point_at: Optional[datetime] = None
+    last_lat: Optional[float] = None
+    last_lon: Optional[float] = None
+    last_id: int = 0
+
+    def add(
+        self,
+        point_id: int,
+        ts: datetime,
+        lat: float,
+        lon: float,
+        height: Optional[float],
+        speed: Optional[float],
+        max_gap_s: float,
+    ) -> None:
+        if self.last_point_at is not None:
+            self.distance_km += haversine_km(self.last_lat, self.last_lon, lat, lon)
+            gap = (ts - self.last_point_at).total_seconds()
+            if gap <= max_gap_s:
+                self.online_seconds += gap
+        else:
+            self.first_point_at = ts
+
+        if height is not None:
+            self.height_sum += height
+            self.height_count += 1
+            if self.max_height is None or height > self.max_height:
+                self.max_height = height
+        if speed is not None:
+            self.speed_sum += speed
+            self.speed_count += 1
+            if self.max_speed is None or speed > self.max_speed:
+                self.max_speed = speed
+
+        self.points += 1
+        self.last_point_at = ts
+        self.last_lat, self.last_lon = lat, lon
+        self.last_id = max(self.last_id, point_id)
+
+    def summary(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for key in ("height_sum", "height_count", "speed_sum", "speed_count", "last_lat", "last_lon", "last_id"):
+            data.pop(key)
+        data["distance_km"] = round(self.distance_km, 6)
+        data["avg_height"] = self.height_sum / self.height_count if self.height_count else None
+        data["avg_speed"] = self.speed_sum / self.speed_count if self.speed_count else None
+        return data
+
+
+def _cache_key(drone_id: int, since: datetime, until: Optional[datetime]) -> str:
+    end = until.isoformat() if until is not None else "open"
+    return f"drones:track-stats:{drone_id}:{since.isoformat()}:{end}"
+
+
+def compute_track_stats(drone: Drone, since: datetime, until: Optional[datetime] = None) -> TrackStats:
+    """
+    Summarize the drone's points with since <= timestamp (< until).
+
+    The running summary is cached per drone and window, so a repeated call
+    only reads points inserted since the last one (by id). If any of those
+    is older than the last point already folded in (a late frame), the
+    window is recomputed from scratch. Cached summaries expire after
+    TRACK_STATS_CACHE_SECONDS, which also bounds the effect of rows that
+    commit out of id order.
+    """
+    key = _cache_key(drone.pk, since, until)
+    window = DroneTelemetryPoint.objects.filter(drone=drone, timestamp__gte=since)
+    if until is not None:
+        window = window.filter(timestamp__lt=until)
+
+    stats: Optional[TrackStats] = cache.get(key)
+    qs = window
+    if stats is not None:
+        qs = window.filter(id__gt=stats.last_id)
+        if stats.last_point_at is not None and qs.filter(timestamp__lte=stats.last_point_at).exists():
+            stats, qs = None, window
+    if stats is None:
+        stats = TrackStats()
+
+    max_gap_s = float(settings.ONLINE_WINDOW_SECONDS)
+    rows = qs.order_by("timestamp").values_list(
+        "id", "timestamp", "latitude", "longitude", "height", "horizontal_speed"
+    )
+    for point_id, ts, lat, lon, height, speed in rows.iterator(chunk_size=2000):
+        stats.add(point_id, ts, lat, lon, height, speed, max_gap_s)
+
+    cache.set(key, stats, int(getattr(settings, "TRACK_STATS_CACHE_SECONDS", 300)))
+    return stats
@@ -0,0 +1,154 @@
+import math
+from typing import Any, List
+
+from django.db import transaction
+
+from drones.models import NoFlyZone
+from drones.services.geofence import rebuild_geofence_index
+from drones.services.polygons import prepare_polygon, validate_ring
+from drones.services.reevaluate import schedule_fleet_reevaluation
+
+
+class ZoneImportError(ValueError):
+    """
+    Raised when a FeatureCollection contains invalid features.
+    Carries every error found, not just the first one.
+    """
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _parse_is_active(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise ValueError('properties.is_active must be true or false.')
+
+
+def _zones_from_feature(feature: Any, index: int) -> List[NoFlyZone]:
+    """
+    Convert a single GeoJSON Feature into one or more unsaved zones.
+
+    - Polygon       -> one polygon zone (outer ring only; holes are ignored,
+                       which can only make the zone larger, never smaller)
+    - MultiPolygon  -> one polygon zone per part, named "<name> [k]"
+    - Point         -> one circle zone, radius from properties.radius_km
+                       (or properties.radius_m)
+    """
+    if not isinstance(feature, dict) or feature.get("type") != "Feature":
+        raise ValueError("must be a GeoJSON Feature.")
+
+    props = feature.get("properties")
+    if props is None:
+        props = {}
+    elif not isinstance(props, dict):
+        raise ValueError("properties must be an object.")
+    geometry = feature.get("geometry")
+    if not isinstance(geometry, dict):
+        raise ValueError("geometry must be an object.")
+    name = str(props.get("name") or f"zone-{index}")[:128]
+    is_active = _parse_is_active(props.get("is_active"))
+    gtype = geometry.get("type")
+    coords = geometry.get("coordinates")
+
+    if gtype == "Point":
+        if not isinstance(coords, (list, tuple)) or len(coords) < 2:
+            raise ValueError("Point coordinates must be [lon, lat].")
+        lon, lat = coords[0], coords[1]
+        if not _is_number(lon) or not _is_number(lat):
+            raise ValueError("Point coordinates must be [lon, lat] numbers.")
+        if not (-180 <= lon <= 180) or not (-90 <= lat <= 90):
+            raise ValueError("Point lon/lat out of range.")
+        radius_km = props.get("radius_km")
+        if radius_km is None and _is_number(props.get("radius_m")):
+            radius_km = props["radius_m"] / 1000.0
+        if not _is_number(radius_km) or radius_km <= 0:
+            raise ValueError("Point zones require properties.radius_km (or radius_m) > 0.")
+        return [
+            NoFlyZone(
+                name=name,
+                shape=NoFlyZone.SHAPE_CIRCLE,
+                center_lat=float(lat),
+                center_lon=float(lon),
+                radius_km=float(radius_km),
+                polygon=[],
+                is_active=is_active,
+            )
+        ]
+
+    if gtype == "Polygon":
+        parts = [coords]
+    elif gtype == "MultiPolygon":
+        if not isinstance(coords, list) or not coords:
+            raise ValueError("MultiPolygon requires at least one polygon.")
+        parts = coords
+    else:
+        raise ValueError("geometry.type must be Polygon, MultiPolygon or Point.")
+
+    zones = []
+    for k, part in enumerate(parts):
+        if not isinstance(part, list) or not part:
+            raise ValueError("polygon coordinates must be a list of rings.")
+        label = "coordinates[0]" if gtype == "Polygon" else f"coordinates[{k}][0]"
+        prepared = prepare_polygon(validate_ring(part[0], label=label))
+        zones.append(
+            NoFlyZone(
+                name=name if len(parts) == 1 else f"{name} [{k}]"[:128],
+                shape=NoFlyZone.SHAPE_POLYGON,
+                polygon=prepared.ring,
+                polygon_simplified=prepared.simplified,
+                simplify_tolerance_deg=prepared.tolerance_deg,
+                is_active=is_active,
+            )
+        )
+    return zones
+
+
+def parse_feature_collection(data: Any) -> List[NoFlyZone]:
+    """
+    Validate a GeoJSON FeatureCollection in one pass and return unsaved zones.
+    Raises ZoneImportError listing every invalid feature.
+    """
+    if not isinstance(data, dict) or data.get("type") != "FeatureCollection":
+        raise ZoneImportError(["Body must be a GeoJSON FeatureCollection."])
+
+    features = data.get("features")
+    if not isinstance(features, list):
+        raise ZoneImportError(["FeatureCollection.features must be a list."])
+
+    zones: List[NoFlyZone] = []
+    errors: List[str] = []
+    for i, feature in enumerate(features):
+        try:
+            zones.extend(_zones_from_feature(feature, i))
+        except ValueError as e:
+            errors.append(f"features[{i}]: {e}")
+
+    if errors:
+        raise ZoneImportError(errors)
+    return zones
+
+
+def import_zones(zones: List[NoFlyZone], replace: bool = False, batch_size: int = 1000) -> List[NoFlyZone]:
+    """
+    Insert zones with bulk_create in a single transaction, then rebuild the
+    geofence index once; the fleet is re-evaluated after commit.
+
+    replace=True deletes all existing zones first (same transaction).
+    """
+    with transaction.atomic():
+        if replace:
+            NoFlyZone.objects.all().delete()
+        created = NoFlyZone.objects.bulk_create(zones, batch_size=batch_size)
+
+    rebuild_geofence_index()
+    schedule_fleet_reevaluation()
+    return created
@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from drones.models import DangerRuleDefinition, DroneTelemetryPoint, NoFlyZone
+from drones.services.auth_cache import invalidate_auth_cache
+from drones.services.geofence import invalidate_geofence_index
+from drones.services.grid import grid_cell
+from drones.services.reevaluate import schedule_fleet_reevaluation
+from drones.services.rules import invalidate_rule_set
+
+# Sent with serials=[...] and online=True/False whenever drones change presence
+# (on ingest of an offline drone, or by the presence sweeper).
+drone_presence_changed = Signal()
+
+
+@receiver(post_save, sender=NoFlyZone)
+@receiver(post_delete, sender=NoFlyZone)
+def _zone_changed(sender, **kwargs):
+    invalidate_geofence_index()
+    schedule_fleet_reevaluation()
+
+
+@receiver(post_save, sender=DangerRuleDefinition)
+@receiver(post_delete, sender=DangerRuleDefinition)
+def _danger_rule_changed(sender, **kwargs):
+    invalidate_rule_set()
+    schedule_fleet_reevaluation()
+
+
+@receiver(pre_save, sender=DroneTelemetryPoint)
+def _fill_grid_cell(sender, instance, raw=False, **kwargs):
+    # bulk_create (ingest) sets grid_cell itself; fixtures (raw) are backfilled
+    # with `manage.py backfill_grid_cells`.
+    if not raw and instance.grid_cell is None:
+        instance.grid_cell = grid_cell(instance.latitude, instance.longitude)
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _user_changed(sender, instance, **kwargs):
+    invalidate_auth_cache(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def _permissions_changed(sender, **kwargs):
+    # Group changes affect many users; just drop the whole cache.
+    invalidate_auth_cache()
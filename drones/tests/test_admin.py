@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from drones.admin import EstimatedCountPaginator
+from drones.models import Drone, DroneTelemetryPoint
+
+T0 = datetime(2026, 10, 19, 8, 0, tzinfo=dt_timezone.utc)
+URL = "/admin/drones/dronetelemetrypoint/"
+
+
+class TelemetryAdminTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser(username="root", password="pass12345")
+        self.client.force_login(admin)
+
+    def add_points(self, drones, points):
+        for i in range(drones):
+            drone = Drone.objects.create(serial=f"ADM-{Drone.objects.count():03d}")
+            DroneTelemetryPoint.objects.bulk_create([
+                DroneTelemetryPoint(drone=drone, timestamp=T0 + timedelta(minutes=j), latitude=31.9, longitude=35.8)
+                for j in range(points)
+            ])
+
+    def changelist_queries(self, path):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(path)
+        self.assertEqual(res.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        paths = (URL, f"{URL}?timestamp__year=2026&timestamp__month=10", f"{URL}?q=ADM-001")
+        self.add_points(2, 3)
+        small = [self.changelist_queries(path) for path in paths]
+        self.add_points(20, 10)
+        self.assertEqual([self.changelist_queries(path) for path in paths], small)
+
+    def test_change_form_uses_raw_id_widget(self):
+        self.add_points(3, 1)
+        point = DroneTelemetryPoint.objects.first()
+        res = self.client.get(f"{URL}{point.pk}/change/")
+        self.assertContains(res, 'class="vForeignKeyRawIdAdminField"')
+        self.assertNotContains(res, "<option")
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=5)
+    def test_paginator_bounds_counts(self):
+        self.add_points(2, 4)
+        qs = DroneTelemetryPoint.objects.order_by("-timestamp")
+        self.assertEqual(EstimatedCountPaginator(qs.filter(drone__serial="ADM-000"), 2).count, 4)
+        # No row estimate on SQLite: bounded to the limit.
+        self.assertEqual(EstimatedCountPaginator(qs, 2).count, 5)
+        self.assertEqual(EstimatedCountPaginator(qs, 2).num_pages, 3)
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 from rest_framework.test import APIClient
@@ -7,6 +8,7 @@ from drones.models import Drone, DroneTelemetryPoint
 class ApiTests(TestCase):
     def setUp(self):
         self.client = APIClient()
+        cache.clear()
 
     def test_list_filter_serial(self):
         Drone.objects.create(serial="ABC123")
@@ -30,3 +32,13 @@ class ApiTests(TestCase):
     def test_nearby_validation(self):
         res = self.client.get("/api/drones/nearby?lat=999&lon=0")
         self.assertEqual(res.status_code, 400)
+
+    def test_nearby_across_antimeridian(self):
+        Drone.objects.create(serial="EAST", latitude=0, longitude=179.99)
+        Drone.objects.create(serial="WEST", latitude=0, longitude=-179.99)
+        Drone.objects.create(serial="FAR", latitude=0, longitude=179.0)
+        Drone.objects.create(serial="NOPOS")
+
+        res = self.client.get("/api/drones/nearby?lat=0&lon=-179.999")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([d["serial"] for d in res.json()], ["EAST", "WEST"])
@@ -1,17 +1,20 @@
 from django.contrib.auth.models import User, Permission
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework.test import APIClient
 from django.utils import timezone
 
-from drones.models import Drone
+from drones.models import Drone, DroneOSDPayload
 
 
 class AuthRBACTests(TestCase):
     def setUp(self):
         self.client = APIClient()
+        cache.clear()
         self.user = User.objects.create_user(username="u1", password="pass12345")
-        self.drone = Drone.objects.create(serial="D1", last_seen_at=timezone.now(), last_payload={"x": 1})
+        self.drone = Drone.objects.create(serial="D1", last_seen_at=timezone.now())
+        DroneOSDPayload.objects.create(drone=self.drone, payload={"x": 1}, received_at=timezone.now())
 
     def _get_or_create_mark_safe_perm(self):
         """
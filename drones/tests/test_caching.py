@@ -0,0 +1,55 @@
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from drones.models import Drone
+from drones.services.cache_version import bump_version
+
+
+class ApiCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        Drone.objects.create(serial="D1", is_dangerous=True, danger_reasons=["x"], last_seen_at=timezone.now())
+
+    def test_list_is_cached_until_version_bump(self):
+        first = self.client.get("/api/drones")
+        self.assertEqual(len(first.json()), 1)
+
+        Drone.objects.create(serial="D2")
+        self.assertEqual(len(self.client.get("/api/drones").json()), 1)
+
+        bump_version()
+        self.assertEqual(len(self.client.get("/api/drones").json()), 2)
+
+    def test_query_string_is_part_of_the_key(self):
+        Drone.objects.create(serial="OTHER")
+        self.assertEqual(len(self.client.get("/api/drones?serial=D1").json()), 1)
+        self.assertEqual(len(self.client.get("/api/drones").json()), 2)
+
+    def test_etag_returns_304(self):
+        res = self.client.get("/api/drones/dangerous")
+        etag = res["ETag"]
+
+        res2 = self.client.get("/api/drones/dangerous", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res2.status_code, 304)
+        self.assertEqual(res2["ETag"], etag)
+
+    def test_mark_safe_invalidates(self):
+        user = User.objects.create_user(username="op", password="pass12345")
+        user.user_permissions.add(Permission.objects.get(codename="mark_safe"))
+        self.client.force_authenticate(user=user)
+
+        etag = self.client.get("/api/drones/dangerous")["ETag"]
+        self.assertEqual(self.client.post("/api/drones/D1/mark-safe").status_code, 200)
+
+        res = self.client.get("/api/drones/dangerous", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), [])
+
+    def test_errors_are_not_cached(self):
+        self.assertEqual(self.client.get("/api/drones/NOPE/path").status_code, 404)
+        Drone.objects.create(serial="NOPE")
+        self.assertEqual(self.client.get("/api/drones/NOPE/path").status_code, 200)
@@ -0,0 +1,90 @@
+import json
+import random
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from drones.models import Drone
+from drones.services.conflicts import CONFLICT_REASON, detect_conflicts, find_conflicts
+from drones.services.geo import haversine_km
+from drones.services.geofence import invalidate_geofence_index
+from drones.services.ingest import TelemetryIngestor
+from drones.services.rules import invalidate_rule_set
+
+
+class FindConflictsTests(SimpleTestCase):
+    def test_matches_pairwise_check(self):
+        rng = random.Random(7)
+        positions = []
+        # Clusters around ordinary places, the antimeridian and a pole.
+        for i, (lat, lon) in enumerate([(31.95, 35.9), (10.0, 179.9995), (10.0, -179.9995), (89.9999, 0.0)] * 30):
+            positions.append((i, lat + rng.uniform(-0.001, 0.001), lon + rng.uniform(-0.001, 0.001), None))
+
+        expected = set()
+        for a in range(len(positions)):
+            for b in range(a + 1, len(positions)):
+                _, lat1, lon1, _ = positions[a]
+                _, lat2, lon2, _ = positions[b]
+                if haversine_km(lat1, lon1, lat2, lon2) * 1000 < 50:
+                    expected.add((a, b))
+
+        found = find_conflicts(positions, separation_m=50)
+        self.assertEqual({(a, b) for a, b, _, _ in found}, expected)
+        self.assertTrue(expected)
+        distances = [d for _, _, d, _ in found]
+        self.assertEqual(distances, sorted(distances))
+
+    def test_vertical_separation(self):
+        positions = [("A", 31.95, 35.9, 100.0), ("B", 31.95, 35.9001, 160.0), ("C", 31.95, 35.9002, None)]
+        self.assertEqual(len(find_conflicts(positions, separation_m=50, vertical_m=0)), 3)
+
+        found = find_conflicts(positions, separation_m=50, vertical_m=30)
+        self.assertEqual({(a, b) for a, b, _, _ in found}, {("A", "C"), ("B", "C")})
+        self.assertIsNone(found[0][3])
+
+
+@override_settings(MIN_SEPARATION_M=50, MIN_VERTICAL_SEPARATION_M=0, DANGER_RULES=[])
+class DetectConflictsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_rule_set()
+        invalidate_geofence_index()
+        now = timezone.now()
+        self.a = Drone.objects.create(serial="A", latitude=31.95, longitude=35.9, height=50, last_seen_at=now, is_online=True)
+        self.b = Drone.objects.create(serial="B", latitude=31.9501, longitude=35.9, height=50, last_seen_at=now, is_online=True)
+        self.far = Drone.objects.create(serial="FAR", latitude=32.5, longitude=35.9, height=50, last_seen_at=now, is_online=True)
+        self.other = Drone.objects.create(
+            serial="OTHER", latitude=32.5001, longitude=35.9, last_seen_at=now, is_online=False,
+        )
+
+    def test_flags_and_clears_close_pairs(self):
+        conflicts = detect_conflicts()
+        self.assertEqual([(c.serial_a, c.serial_b) for c in conflicts], [("A", "B")])
+        self.assertAlmostEqual(conflicts[0].distance_m, 11.1, delta=0.2)
+
+        self.a.refresh_from_db()
+        self.assertTrue(self.a.is_dangerous)
+        self.assertEqual(self.a.danger_reasons, [CONFLICT_REASON])
+        self.far.refresh_from_db()
+        self.assertFalse(self.far.is_dangerous)
+
+        Drone.objects.filter(pk=self.b.pk).update(latitude=31.96)
+        self.assertEqual(detect_conflicts(), [])
+        self.a.refresh_from_db()
+        self.assertFalse(self.a.is_dangerous)
+        self.assertEqual(self.a.danger_reasons, [])
+
+    def test_ingest_keeps_detector_reason(self):
+        detect_conflicts()
+        TelemetryIngestor().ingest("A", {"latitude": 31.95, "longitude": 35.9, "height": 55, "horizontal_speed": 1})
+        self.a.refresh_from_db()
+        self.assertEqual(self.a.danger_reasons, [CONFLICT_REASON])
+
+    def test_conflicts_endpoint(self):
+        res = APIClient().get("/api/drones/conflicts")
+        self.assertEqual(res.status_code, 200)
+        data = json.loads(res.content)
+        self.assertEqual([(c["serial_a"], c["serial_b"]) for c in data], [("A", "B")])
+        self.assertEqual(data[0]["vertical_m"], 0.0)
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from drones.models import Drone, DroneTelemetryPoint
+from drones.services.export import EXPORT_FORMATS, export_telemetry, write_ndjson
+
+T0 = datetime(2026, 10, 19, 8, 0, tzinfo=dt_timezone.utc)
+User = get_user_model()
+
+
+class TelemetryExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="exporter", password="pass12345")
+        for serial in ("EX1", "EX2", "EX3"):
+            drone = Drone.objects.create(serial=serial)
+            DroneTelemetryPoint.objects.bulk_create([
+                DroneTelemetryPoint(
+                    drone=drone,
+                    timestamp=T0 + timedelta(minutes=i),
+                    latitude=31.9 + i / 100,
+                    longitude=35.8,
+                    height=10.0 * i if i else None,
+                )
+                for i in range(3)
+            ])
+
+    def test_csv_endpoint_streams_selected_drones_and_window(self):
+        self.client.force_authenticate(user=self.user)
+        res = self.client.get(
+            "/api/telemetry/export?serials=EX2,EX1&since=2026-10-19T08:01:00Z&file_format=csv"
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.streaming)
+        self.assertIn("attachment;", res["Content-Disposition"])
+
+        rows = list(csv.DictReader(io.StringIO(b"".join(res.streaming_content).decode())))
+        self.assertEqual([r["serial"] for r in rows], ["EX1", "EX1", "EX2", "EX2"])
+        self.assertEqual(rows[0]["height"], "10.0")
+
+    def test_endpoint_validation_and_auth(self):
+        self.assertEqual(self.client.get("/api/telemetry/export").status_code, 401)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get("/api/telemetry/export?file_format=xlsx").status_code, 400)
+
+    def test_ndjson_in_small_chunks(self):
+        chunks = list(export_telemetry("ndjson", serials=["EX3"], chunk_size=2))
+        self.assertEqual(len(chunks), 2)
+        records = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+        self.assertEqual(len(records), 3)
+        self.assertIsNone(records[0]["height"])
+        self.assertEqual(records[2]["timestamp"], (T0 + timedelta(minutes=2)).isoformat())
+
+    def test_ndjson_writes_null_for_non_finite_values(self):
+        rows = [("EX1", T0, 31.9, 35.8, float("nan"), float("inf"))]
+        record = json.loads(b"".join(write_ndjson(rows, 10)))
+        self.assertEqual(record["latitude"], 31.9)
+        self.assertIsNone(record["height"])
+        self.assertIsNone(record["horizontal_speed"])
+
+    def test_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.csv")
+            call_command("export_telemetry", "--serial", "EX1", "--output", path, stdout=io.StringIO())
+            with open(path, newline="") as f:
+                self.assertEqual(len(list(csv.DictReader(f))), 3)
+
+    @unittest.skipUnless("parquet" in EXPORT_FORMATS, "pyarrow not installed")
+    def test_parquet_roundtrip(self):
+        import pyarrow.parquet as pq
+
+        data = b"".join(export_telemetry("parquet", chunk_size=4))
+        table = pq.read_table(io.BytesIO(data))
+        self.assertEqual(table.num_rows, 9)
+        self.assertEqual(table.column_names[0], "serial")
@@ -1,9 +1,13 @@
 from django.test import TestCase
 from drones.models import NoFlyZone
-from drones.services.geofence import check_geofence
+from drones.services.geofence import check_geofence, invalidate_geofence_index
 
 
 class GeofenceTests(TestCase):
+    def setUp(self):
+        # The geofence index is process-wide and survives test rollbacks.
+        invalidate_geofence_index()
+
     def test_polygon_zone_inside(self):
         NoFlyZone.objects.create(
             name="Poly",
@@ -35,3 +39,29 @@ class GeofenceTests(TestCase):
 
         reason = check_geofence(31.50, 35.82)  # far away
         self.assertIsNone(reason)
+
+    def test_circle_zone_inside_and_outside(self):
+        NoFlyZone.objects.create(
+            name="Airport",
+            shape="circle",
+            center_lat=31.99,
+            center_lon=35.99,
+            radius_km=3.0,
+            is_active=True,
+        )
+
+        self.assertEqual(check_geofence(32.0, 35.99), "entered_no_fly_zone")  # ~1.1km away
+        self.assertIsNone(check_geofence(32.03, 35.99))  # ~4.4km away
+
+    def test_non_finite_point_is_in_no_zone(self):
+        NoFlyZone.objects.create(
+            name="Airport",
+            shape="circle",
+            center_lat=31.99,
+            center_lon=35.99,
+            radius_km=3.0,
+            is_active=True,
+        )
+
+        for lat, lon in ((float("nan"), 1.0), (31.99, float("inf")), (float("-inf"), 35.99)):
+            self.assertIsNone(check_geofence(lat, lon))
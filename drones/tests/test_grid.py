@@ -0,0 +1,112 @@
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from drones.models import Drone, DroneTelemetryPoint
+from drones.services.geo import haversine_km
+from drones.services.grid import backfill_grid_cells, cell_ranges, drones_near, grid_cell
+
+T0 = datetime(2026, 10, 19, 8, 0, tzinfo=dt_timezone.utc)
+
+
+class GridCellTests(TestCase):
+    def test_ranges_cover_the_cells_of_a_bbox(self):
+        ranges = cell_ranges(31.0, 35.0, 31.05, 35.05, deg=0.01)
+        self.assertEqual(len(ranges), 6)
+        for lat in (31.0, 31.025, 31.05):
+            for lon in (35.0, 35.025, 35.05):
+                cell = grid_cell(lat, lon, deg=0.01)
+                self.assertTrue(any(lo <= cell <= hi for lo, hi in ranges))
+        self.assertFalse(any(lo <= grid_cell(31.0, 35.07, deg=0.01) <= hi for lo, hi in ranges))
+
+    def test_missing_or_non_finite_positions_have_no_cell(self):
+        for lat, lon in ((None, 1.0), (float("nan"), 1.0), (1.0, float("inf")), (float("-inf"), 1.0)):
+            self.assertIsNone(grid_cell(lat, lon))
+        self.assertEqual(cell_ranges(float("nan"), 35.0, 31.05, 35.05), [])
+        self.assertEqual(drones_near(float("nan"), 35.0, 5.0, T0, T0 + timedelta(hours=1)), [])
+
+    def test_ranges_wrap_the_antimeridian(self):
+        ranges = cell_ranges(0.0, 179.5, 0.0, 180.5, deg=1.0)
+        for lon in (179.7, -179.7):
+            cell = grid_cell(0.0, lon, deg=1.0)
+            self.assertTrue(any(lo <= cell <= hi for lo, hi in ranges))
+
+
+class HistoryNearbyTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        rng = random.Random(7)
+        self.points = []
+        for n in range(8):
+            drone = Drone.objects.create(serial=f"H{n}")
+            for i in range(30):
+                p = DroneTelemetryPoint(
+                    drone=drone,
+                    timestamp=T0 + timedelta(minutes=i),
+                    latitude=31.9 + rng.uniform(-0.1, 0.1),
+                    longitude=35.8 + rng.uniform(-0.1, 0.1),
+                )
+                p.grid_cell = grid_cell(p.latitude, p.longitude)
+                self.points.append(p)
+        DroneTelemetryPoint.objects.bulk_create(self.points)
+
+    def brute_force(self, lat, lon, radius_km, since, until):
+        best = {}
+        for p in self.points:
+            d = haversine_km(lat, lon, p.latitude, p.longitude)
+            if since <= p.timestamp < until and d <= radius_km:
+                best[p.drone.serial] = min(d, best.get(p.drone.serial, d))
+        return sorted(best.items(), key=lambda kv: (kv[1], kv[0]))
+
+    def test_matches_brute_force(self):
+        since, until = T0 + timedelta(minutes=5), T0 + timedelta(minutes=20)
+        for radius in (0.5, 2.0, 6.0):
+            got = [(a.serial, a.distance_km) for a in drones_near(31.9, 35.8, radius, since, until)]
+            self.assertEqual(got, self.brute_force(31.9, 35.8, radius, since, until))
+
+    def test_fallbacks_match_brute_force(self):
+        since, until = T0 + timedelta(minutes=5), T0 + timedelta(minutes=20)
+        expected = self.brute_force(31.9, 35.8, 6.0, since, until)
+        for cells, ranges in ((0, 256), (0, 0)):
+            with self.subTest(cells=cells, ranges=ranges), override_settings(
+                GRID_MAX_QUERY_CELLS=cells, GRID_MAX_QUERY_RANGES=ranges
+            ):
+                got = [(a.serial, a.distance_km) for a in drones_near(31.9, 35.8, 6.0, since, until)]
+                self.assertEqual(got, expected)
+
+    def test_index_probes_are_bounded_by_time(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("reads the SQLite query plan")
+        with CaptureQueriesContext(connection) as ctx:
+            drones_near(31.9, 35.8, 5.0, T0, T0 + timedelta(hours=1))
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + ctx.captured_queries[-1]["sql"])
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("telemetry_cell_ts_idx (grid_cell=? AND timestamp>? AND timestamp<?)", plan)
+
+    def test_endpoint(self):
+        res = self.client.get(
+            "/api/telemetry/nearby?lat=31.9&lon=35.8&radius_km=6"
+            "&since=2026-10-19T08:00:00Z&until=2026-10-19T09:00:00Z"
+        )
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertEqual([r["serial"] for r in body], [s for s, _ in self.brute_force(31.9, 35.8, 6, T0, T0 + timedelta(hours=1))])
+        self.assertEqual(set(body[0]), {"serial", "distance_km", "at", "latitude", "longitude"})
+
+        bad = self.client.get("/api/telemetry/nearby?lat=31.9&lon=35.8&radius_km=5000&since=2026-10-19T08:00:00Z&until=2026-10-19T09:00:00Z")
+        self.assertEqual(bad.status_code, 400)
+
+    def test_save_fills_and_backfill_repairs_cells(self):
+        drone = Drone.objects.get(serial="H0")
+        p = DroneTelemetryPoint.objects.create(drone=drone, timestamp=T0 - timedelta(days=1), latitude=1.0, longitude=2.0)
+        self.assertEqual(p.grid_cell, grid_cell(1.0, 2.0))
+
+        DroneTelemetryPoint.objects.filter(pk=p.pk).update(grid_cell=None)
+        self.assertEqual(backfill_grid_cells(), 1)
+        p.refresh_from_db()
+        self.assertEqual(p.grid_cell, grid_cell(1.0, 2.0))
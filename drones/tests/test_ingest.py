@@ -0,0 +1,203 @@
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from drones.models import Drone, DroneTelemetryPoint
+from drones.services.binary_osd import decode_struct_frame, encode_struct_frame
+from drones.services.decoding import device_time, extract_fields, get_json_decoder, split_batch
+from drones.services.dedup import RecentFrames
+from drones.services.geofence import invalidate_geofence_index
+from drones.services.grid import grid_cell
+from drones.services.ingest import TelemetryIngestor
+from drones.services.osd_store import get_latest_payload
+from drones.services.rules import invalidate_rule_set
+
+
+class DecodingTests(TestCase):
+    def test_decoders_accept_bytes_and_memoryview(self):
+        raw = b'{"latitude": 1.5}'
+        for name in ("auto", "json"):
+            decode = get_json_decoder(name)
+            self.assertEqual(decode(raw), {"latitude": 1.5})
+            self.assertEqual(decode(memoryview(raw)), {"latitude": 1.5})
+
+    def test_extract_fields(self):
+        values, bad = extract_fields({"a": 1, "b": "2.5", "c": "x", "d": [1]}, ("a", "b", "c", "d", "e"))
+        self.assertEqual(values, {"a": 1.0, "b": 2.5, "c": None, "d": None, "e": None})
+        self.assertEqual(bad, 2)
+
+    def test_stdlib_decoder_keeps_non_finite_literals_as_strings(self):
+        decode = get_json_decoder("json")
+        self.assertEqual(decode(b'{"a": NaN, "b": -Infinity}'), {"a": "NaN", "b": "-Infinity"})
+
+    def test_extract_fields_rejects_non_finite_values(self):
+        payload = {"a": float("nan"), "b": "nan", "c": "inf", "d": float("-inf"), "e": 10**400, "f": "1e3"}
+        values, bad = extract_fields(payload, tuple(payload))
+        self.assertEqual(values, {"a": None, "b": None, "c": None, "d": None, "e": None, "f": 1000.0})
+        self.assertEqual(bad, 5)
+
+
+class IngestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_rule_set()
+        invalidate_geofence_index()
+        self.ingestor = TelemetryIngestor()
+
+    def publish(self, serial, payload, topic_suffix="osd"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        return self.ingestor.handle_message(f"thing/product/{serial}/{topic_suffix}", body)
+
+    def test_ingest_updates_state_history_and_payload(self):
+        payload = {"latitude": 31.9, "longitude": 35.8, "height": 600, "horizontal_speed": 3, "extra": {"x": 1}}
+        self.assertTrue(self.publish("D1", payload))
+
+        drone = Drone.objects.get(serial="D1")
+        self.assertTrue(drone.is_online)
+        self.assertEqual(drone.danger_reasons, ["height > 500.0m"])
+        self.assertEqual(DroneTelemetryPoint.objects.filter(drone=drone).count(), 1)
+        self.assertEqual(DroneTelemetryPoint.objects.get(drone=drone).grid_cell, grid_cell(31.9, 35.8))
+        self.assertEqual(get_latest_payload(drone)[1], payload)
+
+    def test_malformed_payloads_are_counted(self):
+        self.assertFalse(self.publish("D1", b"{not json"))
+        self.assertFalse(self.publish("D1", b"[1, 2]"))
+        self.assertFalse(self.publish("D1", {"latitude": 1}, topic_suffix="state"))
+        self.assertTrue(self.publish("D1", {"latitude": "north", "longitude": 2}))
+
+        stats = self.ingestor.stats.snapshot()
+        self.assertEqual(stats["messages"], 4)
+        self.assertEqual(stats["dropped_malformed_json"], 1)
+        self.assertEqual(stats["dropped_not_an_object"], 1)
+        self.assertEqual(stats["dropped_unknown_topic"], 1)
+        self.assertEqual(stats["bad_fields"], 1)
+        self.assertFalse(DroneTelemetryPoint.objects.exists())
+
+    def test_non_finite_coordinates_are_bad_fields(self):
+        # json.dumps writes NaN/Infinity literals; the stdlib decoder accepts them (orjson does not).
+        self.ingestor = TelemetryIngestor(decoder="json")
+        fixes = [
+            {"timestamp": 1_700_000_000, "latitude": float("nan"), "longitude": 35.8, "height": 20},
+            {"timestamp": 1_700_000_001, "latitude": "nan", "longitude": "inf", "height": 20},
+            {"timestamp": 1_700_000_002, "latitude": 31.9, "longitude": float("inf"), "height": 20},
+        ]
+        for fix in fixes:
+            self.assertTrue(self.publish("NF1", fix))
+
+        drone = Drone.objects.get(serial="NF1")
+        self.assertEqual((drone.latitude, drone.longitude, drone.height), (31.9, None, 20))
+        self.assertFalse(DroneTelemetryPoint.objects.exists())
+        self.assertEqual(self.ingestor.stats.snapshot()["bad_fields"], 4)
+
+    def test_batched_fixes_use_device_time_and_newest_state(self):
+        batch = {"fixes": [
+            {"timestamp": 1_700_000_010_000, "latitude": 31.92, "longitude": 35.82, "height": 40},
+            {"timestamp": 1_700_000_000_000, "latitude": 31.90, "longitude": 35.80, "height": 600},
+            {"timestamp": 1_700_000_005_000, "latitude": 31.91, "longitude": 35.81, "height": 30},
+        ]}
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(self.publish("D2", batch))
+        inserts = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith("INSERT") and '"drones_dronetelemetrypoint"' in q["sql"]
+        ]
+        self.assertEqual(len(inserts), 1)
+
+        drone = Drone.objects.get(serial="D2")
+        self.assertEqual(drone.last_seen_at, device_time(1_700_000_010))
+        self.assertEqual(drone.height, 40)
+        self.assertFalse(drone.is_dangerous)
+        points = list(DroneTelemetryPoint.objects.filter(drone=drone).order_by("timestamp"))
+        self.assertEqual([p.height for p in points], [600, 30, 40])
+        self.assertEqual(points[0].timestamp, device_time("2023-11-14T22:13:20Z"))
+        self.assertEqual(self.ingestor.stats.snapshot()["fixes"], 3)
+
+    def test_retransmissions_are_dropped(self):
+        fix = {"timestamp": 1_700_000_000, "latitude": 31.9, "longitude": 35.8}
+        self.assertTrue(self.publish("D3", fix))
+        self.assertFalse(self.publish("D3", fix))
+        self.assertEqual(self.ingestor.stats.snapshot()["duplicate_fixes"], 1)
+
+        # A fresh process has no memory of it; the unique constraint catches it.
+        self.ingestor = TelemetryIngestor()
+        self.assertTrue(self.publish("D3", [fix, {**fix, "timestamp": 1_700_000_001}]))
+        self.assertEqual(DroneTelemetryPoint.objects.filter(drone__serial="D3").count(), 2)
+
+    def test_dedup_memory_is_bounded(self):
+        recent = RecentFrames(window=2, max_drones=2)
+        t = [device_time(1_700_000_000 + i) for i in range(4)]
+        self.assertEqual(recent.fresh("A", [t[0], t[1], t[0]]), [True, True, False])
+        self.assertEqual(recent.fresh("A", [t[2], t[0]]), [True, True])  # t[0] left the window
+        recent.fresh("B", [t[0]])
+        recent.fresh("A", [t[3]])  # A reported last, so B is the older entry
+        recent.fresh("C", [t[0]])
+        self.assertEqual(len(recent), 2)
+        self.assertEqual(recent.fresh("A", [t[3]]), [False])
+        self.assertEqual(recent.fresh("B", [t[0]]), [True])
+
+    def test_late_frames_do_not_overwrite_newer_state(self):
+        self.publish("D4", {"timestamp": 1_700_000_010, "latitude": 31.9, "longitude": 35.8, "height": 20})
+        self.publish("D4", {"timestamp": 1_700_000_000, "latitude": 31.0, "longitude": 35.0, "height": 600})
+
+        drone = Drone.objects.get(serial="D4")
+        self.assertEqual(drone.height, 20)
+        self.assertFalse(drone.is_dangerous)
+        self.assertEqual(drone.last_seen_at, device_time(1_700_000_010))
+        heights = list(DroneTelemetryPoint.objects.filter(drone=drone).values_list("height", flat=True))
+        self.assertEqual(heights, [600, 20])
+        self.assertEqual(self.ingestor.stats.snapshot()["stale_frames"], 1)
+
+    def test_far_future_device_time_falls_back_to_arrival(self):
+        self.publish("D5", {"timestamp": 4_000_000_000, "latitude": 31.9, "longitude": 35.8})
+        drone = Drone.objects.get(serial="D5")
+        self.assertLess(drone.last_seen_at, device_time(4_000_000_000))
+        self.assertEqual(self.ingestor.stats.snapshot()["future_timestamps"], 1)
+
+    def test_split_batch_shapes(self):
+        self.assertEqual(split_batch({"a": 1}), [{"a": 1}])
+        self.assertEqual(split_batch([{"a": 1}, {"a": 2}]), [{"a": 1}, {"a": 2}])
+        self.assertEqual(split_batch({"fixes": [{"a": 1}]}), [{"a": 1}])
+        self.assertIsNone(split_batch([{"a": 1}, 2]))
+        self.assertIsNone(split_batch("x"))
+
+    def test_struct_frame_roundtrip(self):
+        fixes = [
+            {"timestamp": 1_700_000_000.0, "latitude": 31.9, "longitude": 35.8, "height": 10.0},
+            {"timestamp": 1_700_000_001.0, "latitude": 31.91, "longitude": 35.81, "battery_percent": 50.0},
+        ]
+        decoded = decode_struct_frame(memoryview(encode_struct_frame(fixes)))
+        self.assertEqual(len(decoded), 2)
+        self.assertIsNone(decoded[0]["horizontal_speed"])
+        self.assertAlmostEqual(decoded[1]["latitude"], 31.91)
+        self.assertEqual(decoded[1]["battery_percent"], 50.0)
+
+    def test_struct_frame_non_finite_values_are_missing(self):
+        frame = encode_struct_frame([
+            {"timestamp": 1_700_000_000.0, "latitude": float("inf"), "longitude": float("-inf"), "height": 10.0},
+        ])
+        (fix,) = decode_struct_frame(frame)
+        self.assertEqual((fix["latitude"], fix["longitude"], fix["height"]), (None, None, 10.0))
+        self.assertTrue(self.publish("B2", frame, topic_suffix="osd/bin"))
+        self.assertIsNone(Drone.objects.get(serial="B2").latitude)
+
+    def test_binary_topic_ingests_every_fix(self):
+        frame = encode_struct_frame([
+            {"timestamp": 1_700_000_000.0, "latitude": 31.9, "longitude": 35.8, "height": 10.0},
+            {"timestamp": 1_700_000_005.0, "latitude": 31.91, "longitude": 35.81, "height": 12.0},
+        ])
+        self.assertTrue(self.publish("B1", frame, topic_suffix="osd/bin"))
+
+        drone = Drone.objects.get(serial="B1")
+        self.assertEqual(DroneTelemetryPoint.objects.filter(drone=drone).count(), 2)
+        self.assertEqual(drone.height, 12.0)
+        self.assertEqual(drone.last_seen_at, device_time(1_700_000_005.0))
+
+    def test_bad_binary_frames_are_counted(self):
+        self.assertFalse(self.publish("B1", b"SDT1\x01\x00\x02\x00short", topic_suffix="osd/bin"))
+        self.assertFalse(self.publish("B1", b"whatever", topic_suffix="osd/cbor"))
+        stats = self.ingestor.stats.snapshot()
+        self.assertEqual(stats["dropped_malformed_binary"], 1)
+        self.assertEqual(stats["dropped_unknown_format"], 1)
@@ -0,0 +1,75 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from drones.models import Drone
+from drones.services.auth_cache import _TTLCache, get_cached_user, invalidate_auth_cache
+
+
+class JwtClaimsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        invalidate_auth_cache()
+        self.operators = Group.objects.create(name="operators")
+        self.operators.permissions.add(Permission.objects.get(codename="mark_safe"))
+        self.user = User.objects.create_user(username="op", password="pass12345")
+        self.user.groups.add(self.operators)
+        Drone.objects.create(serial="D1", is_dangerous=True, last_seen_at=timezone.now())
+
+    def _login(self):
+        res = self.client.post("/api/token/", {"username": "op", "password": "pass12345"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        return res.json()
+
+    def test_access_token_carries_perms_claim(self):
+        tokens = self._login()
+        self.assertEqual(AccessToken(tokens["access"])["perms"], ["mark_safe"])
+
+        refreshed = self.client.post("/api/token/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(AccessToken(refreshed.json()["access"])["perms"], ["mark_safe"])
+
+    @override_settings(JWT_STATELESS_AUTH=True)
+    def test_stateless_mode_skips_user_and_permission_queries(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._login()['access']}")
+
+        # drone lookup + update only
+        with self.assertNumQueries(2):
+            res = self.client.post("/api/drones/D1/mark-safe")
+        self.assertEqual(res.status_code, 200)
+
+        self.assertEqual(self.client.get("/api/zones").status_code, 403)
+
+    @override_settings(JWT_STATELESS_AUTH=False)
+    def test_cached_path_and_invalidation(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._login()['access']}")
+        self.assertEqual(self.client.post("/api/drones/D1/mark-safe").status_code, 200)
+
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.post("/api/drones/D1/mark-safe").status_code, 200)
+
+        self.operators.permissions.clear()
+        self.assertEqual(self.client.post("/api/drones/D1/mark-safe").status_code, 403)
+
+    def test_cached_user_is_a_fresh_instance(self):
+        first = get_cached_user(self.user.pk, lambda: User.objects.get(pk=self.user.pk))
+        first.first_name = "changed"
+        with self.assertNumQueries(0):
+            second = get_cached_user(self.user.pk, lambda: User.objects.get(pk=self.user.pk))
+        self.assertIsNot(first, second)
+        self.assertEqual((second.pk, second.username, second.first_name), (self.user.pk, "op", ""))
+        self.assertFalse(second._state.adding)
+
+    def test_ttl_cache_evicts_least_recently_used(self):
+        ttl_cache = _TTLCache()
+        for key in ("a", "b"):
+            ttl_cache.get_or_load(key, lambda: key, ttl=60, max_entries=2)
+        ttl_cache.get_or_load("a", lambda: "reloaded", ttl=60, max_entries=2)
+        ttl_cache.get_or_load("c", lambda: "c", ttl=60, max_entries=2)
+
+        self.assertEqual(len(ttl_cache), 2)
+        self.assertEqual(ttl_cache.get_or_load("a", lambda: "reloaded", ttl=60, max_entries=2), "a")
+        self.assertEqual(ttl_cache.get_or_load("b", lambda: "reloaded", ttl=60, max_entries=2), "reloaded")
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from drones.checks import check_shared_cache
+from drones.models import Drone, DroneOSDPayload
+from drones.services.osd_store import get_latest_payload, store_payload
+
+
+class OSDStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username="u", password="pass12345"))
+        self.drone = Drone.objects.create(serial="D1", last_seen_at=timezone.now())
+
+    def test_latest_payload_served_from_cache_and_persisted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            store_payload(self.drone, {"height": 10}, timezone.now())
+        self.assertEqual(DroneOSDPayload.objects.get(drone=self.drone).payload, {"height": 10})
+
+        with self.assertNumQueries(1):  # drone lookup only
+            res = self.client.get("/api/drones/D1/osd")
+        self.assertEqual(res.json()["osd"], {"height": 10})
+
+    def test_rolled_back_payload_is_not_cached(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                store_payload(self.drone, {"height": 10}, timezone.now(), force_persist=True)
+                raise RuntimeError("ingest failed")
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_latest_payload(self.drone), (None, {}))
+
+    def test_falls_back_to_persisted_row(self):
+        DroneOSDPayload.objects.create(drone=self.drone, payload={"a": 1}, received_at=timezone.now())
+        self.assertEqual(get_latest_payload(self.drone)[1], {"a": 1})
+
+    @override_settings(OSD_PERSIST_INTERVAL_SECONDS=60)
+    def test_persistence_is_throttled(self):
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            store_payload(self.drone, {"n": 1}, now, force_persist=True)
+            store_payload(self.drone, {"n": 2}, now + timedelta(seconds=1))
+
+        self.assertEqual(DroneOSDPayload.objects.get(drone=self.drone).payload, {"n": 1})
+        self.assertEqual(get_latest_payload(self.drone)[1], {"n": 2})
+
+    @override_settings(OSD_HISTORY_SIZE=2)
+    def test_history_ring_is_bounded(self):
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                store_payload(self.drone, {"n": i}, now + timedelta(seconds=i))
+
+        res = self.client.get("/api/drones/D1/osd?history=true")
+        self.assertEqual([h["osd"] for h in res.json()["history"]], [{"n": 1}, {"n": 2}])
+
+    def test_deploy_check_warns_about_per_process_cache(self):
+        self.assertEqual([w.id for w in check_shared_cache(None)], ["drones.W001"])
+        shared = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://cache"}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,137 @@
+"""
+Query-count and latency regression tests for the API endpoints.
+
+Every endpoint runs against a synthetic fleet (drones/services/synthetic.py)
+with a cold cache and must run exactly its expected number of queries,
+which does not depend on the fleet size: an N+1 or a per-row query fails
+here at any scale. Wall times (median of a few runs) are compared with
+perf_baselines.json for the same scale.
+
+Scale and baselines are driven by the environment:
+
+    DRONE_PERF_DRONES=1000 DRONE_PERF_POINTS=20 DRONE_PERF_ZONES=20 python manage.py test drones.tests.test_performance
+    DRONE_PERF_RECORD=1 ...     # rewrite the baselines for this scale
+    DRONE_PERF_TOLERANCE=5      # allowed slowdown factor vs the baseline
+"""
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from drones.services.auth_cache import invalidate_auth_cache
+from drones.services.geofence import invalidate_geofence_index
+from drones.services.rules import invalidate_rule_set
+from drones.services.synthetic import generate_fleet
+
+BASELINES = Path(__file__).with_name("perf_baselines.json")
+DRONES = int(os.environ.get("DRONE_PERF_DRONES", "1000"))
+POINTS = int(os.environ.get("DRONE_PERF_POINTS", "20"))
+ZONES = int(os.environ.get("DRONE_PERF_ZONES", "20"))
+RECORD = os.environ.get("DRONE_PERF_RECORD") == "1"
+TOLERANCE = float(os.environ.get("DRONE_PERF_TOLERANCE", "5"))
+RUNS = 3
+# Absolute slack so that very fast endpoints do not fail on timer noise.
+SLACK_SECONDS = 0.05
+
+SERIAL = "PERF-000000"
+CENTER = (31.95, 35.91)
+
+# name -> (method, path, auth, queries with a cold cache)
+ENDPOINTS = {
+    "drones_list": ("get", "/api/drones", None, 1),
+    "drones_online": ("get", "/api/drones/online", None, 1),
+    "drones_online_count": ("get", "/api/drones/online/count", None, 1),
+    "drones_nearby": ("get", f"/api/drones/nearby?lat={CENTER[0]}&lon={CENTER[1]}", None, 1),
+    "drones_dangerous": ("get", "/api/drones/dangerous", None, 1),
+    "drones_conflicts": ("get", "/api/drones/conflicts", None, 1),
+    "drone_osd": ("get", f"/api/drones/{SERIAL}/osd", "user", 3),
+    "drone_path": ("get", f"/api/drones/{SERIAL}/path", None, 2),
+    "drone_stats": ("get", f"/api/drones/{SERIAL}/stats?since=2000-01-01T00:00:00Z", None, 2),
+    "drone_mark_safe": ("post", f"/api/drones/{SERIAL}/mark-safe", "admin", 6),
+    "telemetry_export": ("get", "/api/telemetry/export?file_format=ndjson", "user", 2),
+    "telemetry_nearby": (
+        "get",
+        f"/api/telemetry/nearby?lat={CENTER[0]}&lon={CENTER[1]}&radius_km=2"
+        "&since=2000-01-01T00:00:00Z&until=2100-01-01T00:00:00Z",
+        None,
+        1,
+    ),
+    "zones_list": ("get", "/api/zones", "admin", 5),
+}
+
+
+@override_settings(DANGER_RULES_RELOAD_SECONDS=3600)
+class EndpointPerformanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_fleet(DRONES, POINTS, zones=ZONES, center=CENTER, spread_km=10, seed=1, prefix="PERF")
+        User.objects.create_user(username="perf-user", password="pass12345")
+        admin = User.objects.create_user(username="perf-admin", password="pass12345")
+        admin.user_permissions.add(
+            Permission.objects.get(codename="modify_settings"),
+            Permission.objects.get(codename="mark_safe"),
+        )
+
+    def setUp(self):
+        invalidate_rule_set()
+        invalidate_geofence_index()
+        invalidate_auth_cache()
+        self.tokens = {}
+        for role in ("user", "admin"):
+            res = APIClient().post("/api/token/", {"username": f"perf-{role}", "password": "pass12345"}, format="json")
+            self.tokens[role] = res.json()["access"]
+
+    def request(self, method, path, auth):
+        client = APIClient()
+        if auth:
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens[auth]}")
+        res = getattr(client, method)(path)
+        if getattr(res, "streaming", False):
+            b"".join(res.streaming_content)
+        return res
+
+    def cold_request(self, method, path, auth):
+        cache.clear()
+        invalidate_auth_cache()
+        return self.request(method, path, auth)
+
+    def test_endpoint_query_counts_and_timings(self):
+        scale = f"{DRONES}x{POINTS}x{ZONES}"
+        baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+        timings = {}
+
+        for name, (method, path, auth, queries) in ENDPOINTS.items():
+            with self.subTest(endpoint=name):
+                # Warm up process-level caches (rule set, geofence index).
+                self.cold_request(method, path, auth)
+
+                cache.clear()
+                invalidate_auth_cache()
+                with self.assertNumQueries(queries):
+                    res = self.request(method, path, auth)
+                self.assertEqual(res.status_code, 200, name)
+
+                samples = []
+                for _ in range(RUNS):
+                    started = time.perf_counter()
+                    self.cold_request(method, path, auth)
+                    samples.append(time.perf_counter() - started)
+                timings[name] = round(statistics.median(samples), 4)
+
+                baseline = baselines.get(scale, {}).get(name)
+                if baseline is not None and not RECORD:
+                    self.assertLessEqual(
+                        timings[name],
+                        baseline * TOLERANCE + SLACK_SECONDS,
+                        f"{name}: {timings[name]:.4f}s vs baseline {baseline:.4f}s at {scale}",
+                    )
+
+        if RECORD:
+            baselines[scale] = timings
+            BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
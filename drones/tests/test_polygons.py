@@ -0,0 +1,63 @@
+import math
+import random
+
+from django.test import TestCase, override_settings
+
+from drones.models import NoFlyZone
+from drones.services.geofence import IndexedZone, _point_in_polygon
+from drones.services.polygons import normalize_ring, prepare_polygon, signed_area, simplify_ring
+
+
+def wobbly_ring(n: int):
+    """Clockwise, open ring of n points around (35.8, 31.9) with a noisy radius."""
+    rnd = random.Random(42)
+    pts = []
+    for i in range(n):
+        a = -2 * math.pi * i / n
+        r = 0.05 + rnd.uniform(-0.00005, 0.00005)
+        pts.append([35.8 + r * math.cos(a), 31.9 + r * math.sin(a)])
+    return pts
+
+
+class PolygonTests(TestCase):
+    def test_normalize_closes_and_orients_ccw(self):
+        ring = normalize_ring([[0, 0], [0, 1], [0, 1], [1, 1], [1, 0]])
+        self.assertEqual(ring[0], ring[-1])
+        self.assertEqual(len(ring), 5)
+        self.assertGreater(signed_area(ring), 0)
+
+    def test_normalize_rejects_degenerate(self):
+        with self.assertRaises(ValueError):
+            normalize_ring([[0, 0], [1, 1], [0, 0]])
+
+    def test_simplify_reduces_vertices(self):
+        ring = normalize_ring(wobbly_ring(5000))
+        simplified = simplify_ring(ring, 0.001)
+        self.assertLess(len(simplified), len(ring) // 10)
+        self.assertEqual(simplified[0], simplified[-1])
+
+    @override_settings(ZONE_SIMPLIFY_TOLERANCE_DEG=0.001, ZONE_SIMPLIFY_MIN_POINTS=64)
+    def test_simplified_geofence_matches_full_polygon(self):
+        prepared = prepare_polygon(wobbly_ring(2000))
+        self.assertTrue(prepared.simplified)
+
+        zone = NoFlyZone(
+            pk=1,
+            shape=NoFlyZone.SHAPE_POLYGON,
+            polygon=prepared.ring,
+            polygon_simplified=prepared.simplified,
+            simplify_tolerance_deg=prepared.tolerance_deg,
+        )
+        iz = IndexedZone.from_zone(zone)
+
+        rnd = random.Random(7)
+        for _ in range(500):
+            lon = 35.8 + rnd.uniform(-0.06, 0.06)
+            lat = 31.9 + rnd.uniform(-0.06, 0.06)
+            self.assertEqual(iz.contains(lat, lon), _point_in_polygon(lon, lat, prepared.ring))
+
+    @override_settings(ZONE_SIMPLIFY_TOLERANCE_DEG=0)
+    def test_simplification_can_be_disabled(self):
+        prepared = prepare_polygon(wobbly_ring(200))
+        self.assertEqual(prepared.simplified, [])
+        self.assertIsNone(prepared.tolerance_deg)
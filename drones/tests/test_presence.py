@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from drones.models import Drone
+from drones.services.presence import sweep_presence
+from drones.signals import drone_presence_changed
+
+
+class PresenceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        now = timezone.now()
+        Drone.objects.create(serial="FRESH", latitude=1, longitude=2, last_seen_at=now)
+        Drone.objects.create(serial="STALE", latitude=1, longitude=2, last_seen_at=now - timedelta(minutes=5), is_online=True)
+        Drone.objects.create(serial="NOPOS", last_seen_at=now)
+
+    def test_sweep_reconciles_flag_and_emits_transitions(self):
+        events = []
+
+        def handler(sender, serials, online, **kwargs):
+            events.append((online, sorted(serials)))
+
+        drone_presence_changed.connect(handler)
+        try:
+            came_online, went_offline = sweep_presence()
+        finally:
+            drone_presence_changed.disconnect(handler)
+
+        self.assertEqual(sorted(came_online), ["FRESH", "NOPOS"])
+        self.assertEqual(went_offline, ["STALE"])
+        self.assertIn((False, ["STALE"]), events)
+        self.assertEqual(
+            sorted(Drone.objects.filter(is_online=True).values_list("serial", flat=True)),
+            ["FRESH", "NOPOS"],
+        )
+        self.assertEqual(sweep_presence(), ([], []))
+
+    def test_online_endpoints_agree(self):
+        sweep_presence()
+        res = self.client.get("/api/drones/online")
+        self.assertEqual([d["serial"] for d in res.json()], ["FRESH"])
+        # NOPOS is flagged online but, without a position, listed by neither endpoint.
+        res = self.client.get("/api/drones/online/count")
+        self.assertEqual(res.json(), {"online": 1})
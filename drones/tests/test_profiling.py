@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve
+
+from drones.middleware import ProfilingMiddleware
+from drones.services.geofence import invalidate_geofence_index
+from drones.services.ingest import TelemetryIngestor
+from drones.services.profiling import Profiler, stage
+from drones.services.rules import invalidate_rule_set
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_rule_set()
+        invalidate_geofence_index()
+
+    def test_stage_is_noop_outside_a_sample(self):
+        profiler = Profiler("test", rate=0)
+        with profiler.sample("x") as sample, stage("decode"):
+            pass
+        self.assertIsNone(sample)
+        self.assertEqual(profiler.report(), "[profile test] 0 sampled unit(s), rate=0")
+
+    def test_records_ingest_stages_and_queries(self):
+        profiler = Profiler("ingest", rate=1.0, report_seconds=0)
+        ingestor = TelemetryIngestor()
+        payload = json.dumps({"latitude": 31.9, "longitude": 35.8, "height": 50, "horizontal_speed": 3}).encode()
+        for _ in range(3):
+            with profiler.sample("message"):
+                ingestor.handle_message("thing/product/P1/osd", payload)
+
+        report = profiler.report()
+        self.assertIn("message: n=3", report)
+        for name in ("decode", "transaction", "classify", "geofence", "rules"):
+            self.assertIn(f"    {name}: n=", report)
+        sql_per_unit = float(report.split("sql=")[1].split("/unit")[0])
+        self.assertGreater(sql_per_unit, 0)
+        # Reset after reporting.
+        self.assertNotIn("message", profiler.report())
+
+    def test_cprofile_stats_are_merged_and_dumped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = Profiler("ingest", rate=1.0, use_cprofile=True, report_seconds=0, directory=directory)
+            for _ in range(2):
+                with profiler.sample("message"):
+                    sorted(range(1000), key=lambda i: -i)
+            report = profiler.report()
+            self.assertIn("function calls", report)
+            self.assertEqual(len([f for f in os.listdir(directory) if f.endswith(".prof")]), 1)
+
+    def test_middleware(self):
+        with override_settings(PROFILE_API_RATE=0):
+            with self.assertRaises(MiddlewareNotUsed):
+                ProfilingMiddleware(lambda request: HttpResponse())
+
+        def view(request):
+            request.resolver_match = resolve("/api/drones/X1/path")
+            return HttpResponse()
+
+        with override_settings(PROFILE_API_RATE=1.0, PROFILE_REPORT_SECONDS=0):
+            middleware = ProfilingMiddleware(view)
+        middleware(RequestFactory().get("/api/drones/X1/path"))
+        self.assertIn("GET /api/drones/<str:serial>/path: n=1", middleware.profiler.report())
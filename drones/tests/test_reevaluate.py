@@ -0,0 +1,140 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from drones.models import DangerRuleDefinition, Drone, DroneOSDPayload, NoFlyZone
+from drones.services.auth_cache import invalidate_auth_cache
+from drones.services.geofence import GEOFENCE_REASON, invalidate_geofence_index
+from drones.services import reevaluate
+from drones.services.reevaluate import reevaluate_fleet, schedule_fleet_reevaluation
+from drones.services.rules import invalidate_rule_set
+
+User = get_user_model()
+
+
+class FleetReevaluationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_rule_set()
+        invalidate_geofence_index()
+        invalidate_auth_cache()
+        now = timezone.now()
+        self.inside = Drone.objects.create(serial="IN", latitude=31.9, longitude=35.8, height=50, last_seen_at=now)
+        self.outside = Drone.objects.create(serial="OUT", latitude=10.0, longitude=10.0, height=50, last_seen_at=now)
+        self.high = Drone.objects.create(
+            serial="HIGH", latitude=10.0, longitude=10.0, height=300, last_seen_at=now,
+            is_dangerous=False, danger_reasons=[],
+        )
+
+    def admin_client(self):
+        user = User.objects.create_user(username="admin1", password="pass12345")
+        user.user_permissions.add(Permission.objects.get(codename="modify_settings"))
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @override_settings(FLEET_REEVALUATION_ASYNC=False)
+    def test_zone_created_through_api_flags_drones_inside(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.admin_client().post(
+                "/api/zones",
+                {"name": "Z", "shape": "circle", "center_lat": 31.9, "center_lon": 35.8, "radius_km": 1},
+                format="json",
+            )
+        self.assertEqual(res.status_code, 201)
+        self.inside.refresh_from_db()
+        self.assertTrue(self.inside.is_dangerous)
+        self.assertEqual(self.inside.danger_reasons, [GEOFENCE_REASON])
+
+    @override_settings(FLEET_REEVALUATION_ASYNC=False)
+    def test_zone_deleted_through_api_clears_drones(self):
+        # bulk_create: no signals, so no re-evaluation is pending yet.
+        (zone,) = NoFlyZone.objects.bulk_create([NoFlyZone(name="Z", center_lat=31.9, center_lon=35.8, radius_km=1)])
+        reevaluate_fleet()
+        self.inside.refresh_from_db()
+        self.assertTrue(self.inside.is_dangerous)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.admin_client().delete(f"/api/zones/{zone.id}")
+        self.assertEqual(res.status_code, 204)
+        self.inside.refresh_from_db()
+        self.assertFalse(self.inside.is_dangerous)
+        self.assertEqual(self.inside.danger_reasons, [])
+
+    @override_settings(DANGER_RULES=[
+        {"name": "height", "field": "height", "operator": "gt", "threshold": 200, "reason": "height > 200m"},
+    ])
+    def test_threshold_change_rewrites_only_changed_rows(self):
+        invalidate_rule_set()
+        # rule version + rules, zones, drones, one bulk update
+        with self.assertNumQueries(5):
+            result = reevaluate_fleet()
+        self.assertEqual((result.checked, result.changed), (3, 1))
+        self.high.refresh_from_db()
+        self.assertEqual(self.high.danger_reasons, ["height > 200m"])
+
+        self.assertEqual(reevaluate_fleet().changed, 0)
+
+    @override_settings(DANGER_RULES=[
+        {"name": "height", "field": "height", "operator": "gt", "threshold": 200, "reason": "height > 200m"},
+    ])
+    def test_rows_written_meanwhile_are_not_overwritten(self):
+        invalidate_rule_set()
+        classify = reevaluate.classify
+
+        def ingest_meanwhile(*args, **kwargs):
+            # HIGH gets a newer state from ingest after the re-evaluation read it.
+            Drone.objects.filter(serial="HIGH").update(
+                height=50, danger_reasons=[], updated_at=timezone.now() + timedelta(seconds=1)
+            )
+            return classify(*args, **kwargs)
+
+        with mock.patch.object(reevaluate, "classify", side_effect=ingest_meanwhile):
+            result = reevaluate_fleet()
+        self.assertEqual((result.checked, result.changed, result.skipped), (3, 0, 1))
+        self.high.refresh_from_db()
+        self.assertEqual((self.high.height, self.high.danger_reasons), (50, []))
+
+    def test_background_runs_coalesce(self):
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_run():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+
+        worker = reevaluate._BackgroundReevaluation()
+        with mock.patch.object(reevaluate, "reevaluate_fleet", side_effect=slow_run):
+            worker.request()
+            self.assertTrue(started.wait(5))
+            for _ in range(3):
+                worker.request()
+            release.set()
+            worker.wait(5)
+        self.assertEqual(len(calls), 2)
+
+    def test_payload_only_fields_come_from_osd_store(self):
+        DangerRuleDefinition.objects.create(name="battery", field="battery_percent", operator="lt", threshold=20)
+        DroneOSDPayload.objects.create(drone=self.outside, payload={"battery_percent": 5}, received_at=timezone.now())
+        invalidate_rule_set()
+
+        reevaluate_fleet()
+        self.outside.refresh_from_db()
+        self.assertEqual(self.outside.danger_reasons, ["battery_percent < 20.0"])
+
+    def test_schedule_runs_once_per_transaction(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                schedule_fleet_reevaluation()
+                NoFlyZone.objects.create(name="A", center_lat=0, center_lon=0, radius_km=1)
+                NoFlyZone.objects.create(name="B", center_lat=1, center_lon=1, radius_km=1)
+        self.assertEqual(len(callbacks), 1)
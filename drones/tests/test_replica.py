@@ -0,0 +1,121 @@
+"""
+Read-replica routing. The two-database tests need a replica alias:
+
+    DATABASE_REPLICA_URL=sqlite:///replica.sqlite3 python manage.py test drones.tests.test_replica
+
+Each test database is then separate and nothing replicates, so rows created
+on one side only show which database served a request.
+"""
+import json
+import unittest
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from drones.models import Drone, DroneTelemetryPoint
+from drones.routers import ReadReplicaRouter
+from drones.services import replica
+from drones.services.replica import current_read_alias, pin_primary, reset_replica_lag, use_replica
+
+REPLICA = settings.DATABASE_REPLICA_ALIAS
+HAS_SQLITE_REPLICA = (
+    REPLICA in settings.DATABASES and settings.DATABASES[REPLICA]["ENGINE"] == "django.db.backends.sqlite3"
+)
+
+
+class ReadReplicaRouterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_replica_lag()
+
+    def test_reads_use_primary_outside_a_replica_block(self):
+        router = ReadReplicaRouter()
+        self.assertIsNone(router.db_for_read(Drone))
+        self.assertEqual(router.db_for_write(Drone), DEFAULT_DB_ALIAS)
+        with use_replica():
+            self.assertEqual(router.db_for_write(Drone), DEFAULT_DB_ALIAS)
+        self.assertIsNone(current_read_alias())
+
+    @override_settings(DATABASE_REPLICA_ALIAS="")
+    def test_no_replica_configured_reads_primary(self):
+        Drone.objects.create(serial="P-1")
+        pin_primary()
+        with use_replica() as alias:
+            self.assertEqual(alias, DEFAULT_DB_ALIAS)
+            self.assertEqual(list(Drone.objects.values_list("serial", flat=True)), ["P-1"])
+        self.assertEqual(self.client.get("/api/drones").json()[0]["serial"], "P-1")
+
+
+@unittest.skipUnless(HAS_SQLITE_REPLICA, "set DATABASE_REPLICA_URL to a SQLite database")
+@override_settings(DATABASE_REPLICA_MAX_LAG_SECONDS=5, DATABASE_REPLICA_LAG_CHECK_SECONDS=60)
+class ReplicaRoutingTests(TestCase):
+    # The alias must exist even for the test runner to skip this class.
+    databases = {DEFAULT_DB_ALIAS, REPLICA} if HAS_SQLITE_REPLICA else {DEFAULT_DB_ALIAS}
+
+    def setUp(self):
+        cache.clear()
+        reset_replica_lag()
+        self.client = APIClient()
+        now = timezone.now()
+        # Present on the replica only, i.e. "seen" by replica reads.
+        seen = Drone.objects.using(REPLICA).create(
+            serial="ON-REPLICA", latitude=31.95, longitude=35.91, last_seen_at=now, is_online=True, is_dangerous=True
+        )
+        DroneTelemetryPoint.objects.using(REPLICA).create(drone=seen, timestamp=now, latitude=31.95, longitude=35.91)
+        Drone.objects.create(serial="ON-PRIMARY", latitude=31.95, longitude=35.91, last_seen_at=now, is_dangerous=True)
+
+    def serials(self, path):
+        res = self.client.get(path)
+        self.assertEqual(res.status_code, 200, path)
+        return [d["serial"] for d in res.json()]
+
+    def test_read_only_views_read_the_replica(self):
+        self.assertEqual(self.serials("/api/drones"), ["ON-REPLICA"])
+        self.assertEqual(self.serials("/api/drones/online"), ["ON-REPLICA"])
+        self.assertEqual(self.serials("/api/drones/nearby?lat=31.95&lon=35.91"), ["ON-REPLICA"])
+        self.assertEqual(self.client.get("/api/drones/online/count").json(), {"online": 1})
+        self.assertEqual(self.client.get("/api/drones/ON-REPLICA/path").json()["properties"]["points"], 1)
+        self.assertEqual(self.client.get("/api/drones/ON-PRIMARY/path").status_code, 404)
+
+    def test_safety_views_read_the_primary(self):
+        self.assertEqual(self.serials("/api/drones/dangerous"), ["ON-PRIMARY"])
+
+    def test_export_streams_from_the_replica(self):
+        user = User.objects.create_user(username="exporter", password="pass12345")
+        self.client.force_authenticate(user=user)
+        res = self.client.get("/api/telemetry/export?file_format=ndjson")
+        records = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+        self.assertEqual([r["serial"] for r in records], ["ON-REPLICA"])
+
+    def test_lagging_or_unreachable_replica_falls_back_to_primary(self):
+        for lag in (30.0, None):
+            reset_replica_lag()
+            cache.clear()
+            with self.subTest(lag=lag), mock.patch.object(replica, "measure_lag", return_value=lag):
+                self.assertEqual(self.serials("/api/drones"), ["ON-PRIMARY"])
+
+    def test_lag_is_checked_once_per_interval(self):
+        with mock.patch.object(replica, "measure_lag", return_value=0.5) as measure:
+            for _ in range(3):
+                with use_replica() as alias:
+                    self.assertEqual(alias, REPLICA)
+        self.assertEqual(measure.call_count, 1)
+
+    def test_mark_safe_writes_primary_and_pins_reads_to_it(self):
+        admin = User.objects.create_user(username="safety", password="pass12345")
+        admin.user_permissions.add(Permission.objects.get(codename="mark_safe"))
+        self.client.force_authenticate(user=admin)
+
+        res = self.client.post("/api/drones/ON-PRIMARY/mark-safe")
+        self.assertEqual(res.status_code, 200)
+        self.assertFalse(Drone.objects.get(serial="ON-PRIMARY").is_dangerous)
+        self.assertEqual(self.serials("/api/drones"), ["ON-PRIMARY"])
+
+        cache.delete(replica.PIN_KEY)
+        self.assertEqual(self.serials("/api/drones?serial=ON"), ["ON-REPLICA"])
@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from drones.models import DangerRuleDefinition, NoFlyZone
+from drones.services.geofence import invalidate_geofence_index
+from drones.services.rules import CompiledRuleSet, RuleSpec, classify, get_rule_set, invalidate_rule_set
+
+
+class RuleEngineTests(TestCase):
+    def setUp(self):
+        invalidate_rule_set()
+        invalidate_geofence_index()
+
+    def test_default_rules_keep_legacy_reasons(self):
+        reasons = classify({"height": 600.0, "horizontal_speed": 12.0}, None, None)
+        self.assertEqual(reasons, ["height > 500.0m", "speed > 10.0m/s"])
+
+    def test_missing_values_never_match(self):
+        rs = CompiledRuleSet([RuleSpec(name="battery", field="battery_percent", operator="lt", threshold=20)])
+        self.assertEqual(rs.evaluate({}), [])
+        self.assertEqual(rs.evaluate({"battery_percent": 15.0}), ["battery_percent < 20.0"])
+
+    def test_drone_class_override(self):
+        rs = CompiledRuleSet([
+            RuleSpec(name="height", field="height", operator="gt", threshold=500, reason="too high"),
+            RuleSpec(name="height", field="height", operator="gt", threshold=100, reason="too high (micro)", drone_class="micro"),
+        ])
+        self.assertEqual(rs.evaluate({"height": 200.0}), [])
+        self.assertEqual(rs.evaluate({"height": 200.0}, drone_class="micro"), ["too high (micro)"])
+        self.assertEqual(rs.evaluate({"height": 600.0}, drone_class="heavy"), ["too high"])
+
+    def test_zone_and_time_scoping(self):
+        now = timezone.now()
+        rs = CompiledRuleSet([
+            RuleSpec(name="zone-speed", field="horizontal_speed", operator="gt", threshold=2, zone_id=7),
+            RuleSpec(
+                name="night", field="height", operator="gt", threshold=50,
+                active_from=now - timedelta(hours=1), active_until=now + timedelta(hours=1),
+            ),
+        ])
+        self.assertTrue(rs.needs_zones)
+        self.assertEqual(rs.evaluate({"horizontal_speed": 3.0}, zone_ids=[1]), [])
+        self.assertEqual(rs.evaluate({"horizontal_speed": 3.0}, zone_ids=[7]), ["horizontal_speed > 2.0"])
+        self.assertEqual(rs.evaluate({"height": 60.0}, now=now), ["height > 50.0"])
+        self.assertEqual(rs.evaluate({"height": 60.0}, now=now + timedelta(hours=2)), [])
+
+    def test_invalid_field_rejected(self):
+        with self.assertRaises(ValueError):
+            RuleSpec(name="x", field="__import__('os')", operator="gt", threshold=1)
+
+    @override_settings(DANGER_RULES_RELOAD_SECONDS=0)
+    def test_db_rules_hot_reload_and_override_settings(self):
+        self.assertEqual(len(get_rule_set()), 2)
+
+        DangerRuleDefinition.objects.create(
+            name="height", field="height", operator="gt", threshold=100, reason="height > 100m",
+        )
+        DangerRuleDefinition.objects.create(
+            name="vspeed", field="vertical_speed", operator="gt", threshold=5,
+        )
+        reasons = classify({"height": 150.0, "vertical_speed": 6.0}, None, None)
+        self.assertEqual(reasons, ["height > 100m", "vertical_speed > 5.0"])
+
+    def test_classify_adds_geofence_reason(self):
+        zone = NoFlyZone.objects.create(name="Z", shape="circle", center_lat=31.99, center_lon=35.99, radius_km=3)
+        DangerRuleDefinition.objects.create(
+            name="zone-height", field="height", operator="gt", threshold=10, zone=zone,
+        )
+        reasons = classify({"height": 20.0}, 31.99, 35.99)
+        self.assertEqual(reasons, ["height > 10.0", "entered_no_fly_zone"])
@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from drf_spectacular.views import SpectacularAPIView
+
+from drones.api.schema import clear_schema_cache
+
+
+class CachedSchemaTests(TestCase):
+    def setUp(self):
+        clear_schema_cache()
+        self.addCleanup(clear_schema_cache)
+
+    def test_schema_generated_once_and_served_with_etag(self):
+        with mock.patch.object(SpectacularAPIView, "get", autospec=True, side_effect=SpectacularAPIView.get) as generate:
+            first = self.client.get("/api/schema/?format=json")
+            second = self.client.get("/api/schema/?format=json")
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["Content-Type"], "application/vnd.oai.openapi+json")
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+        schema = json.loads(first.content)
+        self.assertIn("/api/drones", schema["paths"])
+        self.assertIn("bearerAuth", schema["components"]["securitySchemes"])
+        self.assertIn({"bearerAuth": []}, schema["paths"]["/api/drones/{serial}/mark-safe"]["post"]["security"])
+
+        res = self.client.get("/api/schema/?format=json", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, 304)
+
+    def test_formats_are_cached_separately(self):
+        yaml = self.client.get("/api/schema/")
+        self.assertTrue(yaml["Content-Type"].startswith("application/vnd.oai.openapi"))
+        self.assertTrue(yaml.content.startswith(b"openapi:"))
+        self.assertNotEqual(yaml["ETag"], self.client.get("/api/schema/?format=json")["ETag"])
+
+    def test_prebuilt_schema_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "openapi.json")
+            with open(path, "w") as f:
+                json.dump({"openapi": "3.0.3", "info": {"title": "Prebuilt", "version": "1"}, "paths": {}}, f)
+            with override_settings(OPENAPI_SCHEMA_FILE=path), mock.patch.object(SpectacularAPIView, "get") as generate:
+                res = self.client.get("/api/schema/?format=json")
+        generate.assert_not_called()
+        self.assertEqual(json.loads(res.content)["info"]["title"], "Prebuilt")
@@ -0,0 +1,138 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DataError, OperationalError
+from django.test import TestCase
+
+from drones.models import DroneTelemetryPoint
+from drones.services.geofence import invalidate_geofence_index
+from drones.services.ingest import SpooledIngestor, TelemetryIngestor
+from drones.services.rules import invalidate_rule_set
+from drones.services.spool import Spool, read_segment
+
+
+class SpoolTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def replay_all(self, spool):
+        seen = []
+        spool.replay(lambda batch: seen.extend(batch), batch_size=2)
+        return seen
+
+    def test_append_replay_roundtrip_across_segments(self):
+        spool = Spool(self.tmp.name, segment_bytes=64)
+        for i in range(5):
+            spool.append(f"thing/product/S{i}/osd", b'{"i": %d}' % i, 1000.0 + i)
+        self.assertGreater(spool.stats()["segments"], 1)
+
+        records = self.replay_all(spool)
+        self.assertEqual([r.topic for r in records], [f"thing/product/S{i}/osd" for i in range(5)])
+        self.assertEqual(records[3].payload, b'{"i": 3}')
+        self.assertEqual(records[4].received_at, 1004.0)
+        self.assertFalse(spool.has_pending())
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_segments_survive_restart_and_torn_tail_is_ignored(self):
+        spool = Spool(self.tmp.name)
+        spool.append("t/1", b"a", 1.0)
+        spool.append("t/2", b"b", 2.0)
+        spool.close()
+        (name,) = os.listdir(self.tmp.name)
+        with open(os.path.join(self.tmp.name, name), "ab") as f:
+            f.write(b"\x00\x01\x02")
+
+        with self.assertLogs("drones.services.spool", "WARNING"):
+            records = self.replay_all(Spool(self.tmp.name))
+        self.assertEqual([r.payload for r in records], [b"a", b"b"])
+
+    def test_failed_handler_keeps_the_segment(self):
+        spool = Spool(self.tmp.name)
+        spool.append("t/1", b"a", 1.0)
+
+        def fail(batch):
+            raise OperationalError("db down")
+
+        with self.assertRaises(OperationalError):
+            spool.replay(fail)
+        self.assertTrue(spool.has_pending())
+        self.assertEqual(len(self.replay_all(spool)), 1)
+
+    def test_size_limit_drops_oldest_segment(self):
+        spool = Spool(self.tmp.name, segment_bytes=40, max_bytes=100)
+        with self.assertLogs("drones.services.spool", "ERROR"):
+            for i in range(10):
+                spool.append("t/x", b"0123456789", float(i))
+        stats = spool.stats()
+        self.assertLessEqual(stats["bytes"], 100 + 40)
+        self.assertGreater(stats["dropped"], 0)
+        self.assertEqual(stats["appended"] - stats["dropped"], len(self.replay_all(spool)))
+
+
+class SpooledIngestorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_rule_set()
+        invalidate_geofence_index()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.ingestor = TelemetryIngestor()
+        self.spooled = SpooledIngestor(self.ingestor, Spool(self.tmp.name))
+
+    def submit(self, serial, ts):
+        fix = {"timestamp": ts, "latitude": 31.9, "longitude": 35.8}
+        self.spooled.submit(f"thing/product/{serial}/osd", json.dumps(fix).encode())
+
+    def test_frames_are_spooled_during_outage_and_replayed(self):
+        with mock.patch.object(TelemetryIngestor, "ingest_batch", side_effect=OperationalError("db down")):
+            with self.assertLogs("drones.services.ingest", "WARNING"):
+                self.submit("SP1", 1_700_000_000)
+        # Later frames queue behind the spooled one to keep their order.
+        self.submit("SP1", 1_700_000_001)
+        self.submit("SP2", 1_700_000_001)
+        self.assertFalse(DroneTelemetryPoint.objects.exists())
+        self.assertEqual(self.ingestor.stats.snapshot()["spooled"], 1)
+
+        self.assertEqual(self.spooled.drain(), 3)
+        self.assertEqual(DroneTelemetryPoint.objects.filter(drone__serial="SP1").count(), 2)
+        self.assertEqual(DroneTelemetryPoint.objects.filter(drone__serial="SP2").count(), 1)
+        self.assertFalse(self.spooled.spool.has_pending())
+
+        self.submit("SP1", 1_700_000_002)
+        self.assertEqual(DroneTelemetryPoint.objects.filter(drone__serial="SP1").count(), 3)
+
+    def test_permanent_error_is_dead_lettered_and_does_not_block_ingest(self):
+        ingest_batch = TelemetryIngestor.ingest_batch
+
+        def bad_serial_fails(ingestor, serial, *args, **kwargs):
+            if serial == "BAD":
+                raise DataError("value too long for type character varying(128)")
+            return ingest_batch(ingestor, serial, *args, **kwargs)
+
+        # Spooled during an outage, next to a good frame queued behind it.
+        with mock.patch.object(TelemetryIngestor, "ingest_batch", side_effect=OperationalError("db down")):
+            with self.assertLogs("drones.services.ingest", "WARNING"):
+                self.submit("BAD", 1_700_000_000)
+        self.submit("OK", 1_700_000_000)
+
+        with mock.patch.object(TelemetryIngestor, "ingest_batch", autospec=True, side_effect=bad_serial_fails):
+            with self.assertLogs("drones.services.ingest", "ERROR"), self.assertLogs("drones.services.spool", "ERROR"):
+                self.assertEqual(self.spooled.drain(), 2)
+            self.assertFalse(self.spooled.spool.has_pending())
+
+            # Not spooled when it fails on the direct path either.
+            with self.assertLogs("drones.services.ingest", "ERROR"), self.assertLogs("drones.services.spool", "ERROR"):
+                self.submit("BAD", 1_700_000_001)
+            self.assertFalse(self.spooled.spool.has_pending())
+            self.submit("OK", 1_700_000_001)
+
+        self.assertEqual(DroneTelemetryPoint.objects.filter(drone__serial="OK").count(), 2)
+        self.assertFalse(DroneTelemetryPoint.objects.filter(drone__serial="BAD").exists())
+        dead = list(read_segment(self.spooled.spool.dead_letter_path))
+        self.assertEqual([r.topic for r in dead], ["thing/product/BAD/osd"] * 2)
+        self.assertEqual(self.spooled.spool.stats()["dead_lettered"], 2)
+        self.assertEqual(self.ingestor.stats.snapshot()["dead_lettered"], 2)
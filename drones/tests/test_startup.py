@@ -0,0 +1,28 @@
+import importlib
+import sys
+
+from django.test import TestCase
+
+from drones.services.startup import StartupTimer, migrate_if_needed, pending_migrations, process_uptime
+
+
+class StartupTests(TestCase):
+    def test_current_schema_skips_migrate(self):
+        self.assertEqual(pending_migrations(), [])
+        with self.assertNumQueries(2):  # table introspection + applied migrations
+            self.assertEqual(migrate_if_needed(), [])
+
+    def test_timer_summary(self):
+        timer = StartupTimer()
+        timer.phase("migrations")
+        summary = timer.summary()
+        self.assertRegex(summary, r"^Started( in \d+ms)? \(.*migrations \d+ms\)$")
+        if sys.platform.startswith("linux"):
+            self.assertGreater(process_uptime(), 0)
+
+    def test_consumer_settings_drop_web_apps(self):
+        lean = importlib.import_module("sager_drone_task.settings_consumer")
+        self.assertIn("drones", lean.INSTALLED_APPS)
+        for app in ("django.contrib.admin", "rest_framework", "drf_spectacular"):
+            self.assertNotIn(app, lean.INSTALLED_APPS)
+        self.assertEqual(lean.MIDDLEWARE, [])
@@ -0,0 +1,49 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from drones.models import Drone, DroneOSDPayload, DroneTelemetryPoint, NoFlyZone
+from drones.services.geofence import invalidate_geofence_index
+from drones.services.grid import grid_cell
+from drones.services.rules import invalidate_rule_set
+from drones.services.synthetic import delete_synthetic, generate_fleet
+
+
+class SyntheticFleetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_rule_set()
+        invalidate_geofence_index()
+
+    def test_generates_consistent_fleet(self):
+        fleet = generate_fleet(drones=25, points=8, zones=6, seed=3, batch_size=50)
+        self.assertEqual((fleet.drones, fleet.points, fleet.zones), (25, 200, 6))
+        self.assertEqual(Drone.objects.count(), 25)
+        self.assertEqual(DroneOSDPayload.objects.count(), 25)
+        self.assertTrue(NoFlyZone.objects.filter(shape=NoFlyZone.SHAPE_POLYGON, polygon__isnull=False).exists())
+
+        # Current state is the last fix of each track.
+        drone = Drone.objects.get(serial="SIM-000007")
+        last = DroneTelemetryPoint.objects.filter(drone=drone).order_by("timestamp").last()
+        self.assertEqual((last.latitude, last.longitude, last.timestamp), (drone.latitude, drone.longitude, drone.last_seen_at))
+        self.assertEqual(last.grid_cell, grid_cell(last.latitude, last.longitude))
+
+        # Same seed, same data.
+        tracks = list(DroneTelemetryPoint.objects.order_by("drone__serial", "timestamp").values_list("latitude", "height"))
+        delete_synthetic()
+        generate_fleet(drones=25, points=8, zones=6, seed=3, batch_size=50)
+        self.assertEqual(
+            list(DroneTelemetryPoint.objects.order_by("drone__serial", "timestamp").values_list("latitude", "height")),
+            tracks,
+        )
+
+    def test_command_replace(self):
+        out = StringIO()
+        call_command("generate_fleet", drones=4, points=3, zones=2, pattern=["orbit", "line"], stdout=out)
+        call_command("generate_fleet", drones=2, points=3, zones=1, replace=True, stdout=out)
+        self.assertIn("Deleted 4 drone row(s) and 2 zone row(s)", out.getvalue())
+        self.assertEqual(Drone.objects.count(), 2)
+        self.assertEqual(DroneTelemetryPoint.objects.count(), 6)
+        self.assertEqual(NoFlyZone.objects.count(), 1)
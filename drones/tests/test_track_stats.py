@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from drones.models import Drone, DroneTelemetryPoint
+from drones.services.geo import haversine_km
+from drones.services.track_stats import compute_track_stats
+
+T0 = datetime(2026, 10, 19, 8, 0, tzinfo=dt_timezone.utc)
+
+
+class TrackStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.drone = Drone.objects.create(serial="TS1")
+
+    def point(self, seconds, lat, lon, height=None, speed=None):
+        return DroneTelemetryPoint.objects.create(
+            drone=self.drone,
+            timestamp=T0 + timedelta(seconds=seconds),
+            latitude=lat,
+            longitude=lon,
+            height=height,
+            horizontal_speed=speed,
+        )
+
+    def test_summary(self):
+        self.point(0, 31.90, 35.80, height=10, speed=2)
+        self.point(10, 31.91, 35.80, height=30, speed=6)
+        self.point(20, 31.92, 35.80)
+        self.point(500, 31.92, 35.81, height=20)  # gap > ONLINE_WINDOW_SECONDS: not online time
+
+        data = compute_track_stats(self.drone, T0).summary()
+        expected_km = (
+            haversine_km(31.90, 35.80, 31.91, 35.80)
+            + haversine_km(31.91, 35.80, 31.92, 35.80)
+            + haversine_km(31.92, 35.80, 31.92, 35.81)
+        )
+        self.assertEqual(data["points"], 4)
+        self.assertAlmostEqual(data["distance_km"], expected_km, places=5)
+        self.assertEqual(data["max_height"], 30)
+        self.assertEqual(data["avg_height"], 20)
+        self.assertEqual(data["max_speed"], 6)
+        self.assertEqual(data["avg_speed"], 4)
+        self.assertEqual(data["online_seconds"], 20)
+
+    def test_repeated_calls_only_read_new_points(self):
+        self.point(0, 31.90, 35.80, height=10)
+        self.point(10, 31.91, 35.80, height=20)
+        compute_track_stats(self.drone, T0)
+
+        self.point(20, 31.92, 35.80, height=60)
+        with self.assertNumQueries(2):
+            stats = compute_track_stats(self.drone, T0)
+        self.assertEqual(stats.points, 3)
+        self.assertEqual(stats.max_height, 60)
+        self.assertEqual(stats.online_seconds, 20)
+
+    def test_late_point_triggers_recompute(self):
+        self.point(0, 31.90, 35.80)
+        self.point(20, 31.92, 35.80)
+        compute_track_stats(self.drone, T0)
+
+        self.point(10, 31.91, 35.80)
+        stats = compute_track_stats(self.drone, T0)
+        self.assertEqual(stats.points, 3)
+        self.assertAlmostEqual(stats.distance_km, haversine_km(31.90, 35.80, 31.92, 35.80), places=3)
+
+    def test_endpoint_window_and_validation(self):
+        self.point(0, 31.90, 35.80, height=10)
+        self.point(3600, 31.91, 35.80, height=99)
+
+        res = self.client.get("/api/drones/TS1/stats?since=2026-10-19T07:00:00Z&until=2026-10-19T08:30:00Z")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["points"], 1)
+        self.assertEqual(res.json()["max_height"], 10)
+
+        res = self.client.get("/api/drones/TS1/stats?since=2026-10-19T09:00:00Z&until=2026-10-19T08:00:00Z")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(self.client.get("/api/drones/NOPE/stats").status_code, 404)
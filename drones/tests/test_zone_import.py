@@ -0,0 +1,108 @@
+from django.contrib.auth.models import Permission, User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from drones.models import NoFlyZone
+from drones.services.geofence import check_geofence, invalidate_geofence_index
+from drones.services.zone_import import ZoneImportError, parse_feature_collection
+
+
+SQUARE = [[35.80, 31.97], [35.85, 31.97], [35.85, 32.00], [35.80, 32.00], [35.80, 31.97]]
+
+
+def feature(geometry, **props):
+    return {"type": "Feature", "properties": props, "geometry": geometry}
+
+
+class ZoneImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="admin", password="pass12345")
+        self.user.user_permissions.add(Permission.objects.get(codename="modify_settings"))
+        self.client.force_authenticate(user=self.user)
+        invalidate_geofence_index()
+
+    def test_parse_all_geometry_types(self):
+        zones = parse_feature_collection({
+            "type": "FeatureCollection",
+            "features": [
+                feature({"type": "Polygon", "coordinates": [SQUARE]}, name="Square"),
+                feature({"type": "MultiPolygon", "coordinates": [[SQUARE], [SQUARE]]}, name="Multi"),
+                feature({"type": "Point", "coordinates": [35.9, 31.9]}, name="Circle", radius_m=1500),
+            ],
+        })
+        self.assertEqual([z.name for z in zones], ["Square", "Multi [0]", "Multi [1]", "Circle"])
+        self.assertEqual(zones[3].shape, NoFlyZone.SHAPE_CIRCLE)
+        self.assertAlmostEqual(zones[3].radius_km, 1.5)
+
+    def test_parse_collects_every_error(self):
+        with self.assertRaises(ZoneImportError) as ctx:
+            parse_feature_collection({
+                "type": "FeatureCollection",
+                "features": [
+                    feature({"type": "Point", "coordinates": [35.9, 31.9]}),
+                    feature({"type": "Polygon", "coordinates": [[[0, 0], [1, "x"], [1, 1]]]}),
+                ],
+            })
+        self.assertEqual(len(ctx.exception.errors), 2)
+        self.assertIn("features[1]: coordinates[0][1]", ctx.exception.errors[1])
+
+    def test_parse_checks_object_members_and_is_active(self):
+        polygon = {"type": "Polygon", "coordinates": [SQUARE]}
+        zones = parse_feature_collection({
+            "type": "FeatureCollection",
+            "features": [
+                feature(polygon, is_active="false"),
+                feature(polygon, is_active="TRUE"),
+                feature(polygon, is_active=False),
+                {"type": "Feature", "properties": None, "geometry": polygon},
+            ],
+        })
+        self.assertEqual([z.is_active for z in zones], [False, True, False, True])
+
+        with self.assertRaises(ZoneImportError) as ctx:
+            parse_feature_collection({
+                "type": "FeatureCollection",
+                "features": [
+                    {"type": "Feature", "properties": ["x"], "geometry": polygon},
+                    {"type": "Feature", "properties": {}, "geometry": "Polygon"},
+                    feature(polygon, is_active="yes"),
+                    feature({"type": "Point", "coordinates": [35.9, 31.9]}, radius_km=float("nan")),
+                ],
+            })
+        self.assertEqual(len(ctx.exception.errors), 4)
+
+        res = self.client.post(
+            "/api/zones/bulk",
+            {"type": "FeatureCollection", "features": [{"type": "Feature", "properties": "x", "geometry": polygon}]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 400)
+
+    def test_bulk_endpoint_creates_zones_and_rebuilds_index(self):
+        self.assertIsNone(check_geofence(31.98, 35.82))
+
+        res = self.client.post(
+            "/api/zones/bulk",
+            {"type": "FeatureCollection", "features": [feature({"type": "Polygon", "coordinates": [SQUARE]})]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.json()["created"], 1)
+        self.assertEqual(NoFlyZone.objects.count(), 1)
+        self.assertEqual(check_geofence(31.98, 35.82), "entered_no_fly_zone")
+
+    def test_bulk_endpoint_is_all_or_nothing(self):
+        res = self.client.post(
+            "/api/zones/bulk",
+            {
+                "type": "FeatureCollection",
+                "features": [
+                    feature({"type": "Polygon", "coordinates": [SQUARE]}),
+                    feature({"type": "LineString", "coordinates": [[0, 0], [1, 1]]}),
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(NoFlyZone.objects.count(), 0)
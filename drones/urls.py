@@ -3,24 +3,37 @@ from django.urls import path
 from drones.api.views import (
     DroneListView,
     OnlineDronesView,
+    OnlineDronesCountView,
     NearbyDronesView,
     DangerousDronesView,
+    DroneConflictsView,
     DroneOSDView,
     DronePathGeoJSONView,
+    DroneTrackStatsView,
+    TelemetryExportView,
+    HistoryNearbyView,
     MarkDroneSafeView,
     NoFlyZoneListCreateView,
+    NoFlyZoneBulkImportView,
     NoFlyZoneDetailView,
 )
 
 urlpatterns = [
     path("drones", DroneListView.as_view()),
     path("drones/online", OnlineDronesView.as_view()),
+    path("drones/online/count", OnlineDronesCountView.as_view()),
     path("drones/nearby", NearbyDronesView.as_view()),
     path("drones/dangerous", DangerousDronesView.as_view()),
+    path("drones/conflicts", DroneConflictsView.as_view()),
     path("drones/<str:serial>/osd", DroneOSDView.as_view()),
     path("drones/<str:serial>/path", DronePathGeoJSONView.as_view()),
+    path("drones/<str:serial>/stats", DroneTrackStatsView.as_view()),
     path("drones/<str:serial>/mark-safe", MarkDroneSafeView.as_view()),
 
+    path("telemetry/export", TelemetryExportView.as_view()),
+    path("telemetry/nearby", HistoryNearbyView.as_view()),
+
     path("zones", NoFlyZoneListCreateView.as_view()),
+    path("zones/bulk", NoFlyZoneBulkImportView.as_view()),
     path("zones/<int:zone_id>", NoFlyZoneDetailView.as_view()),
 ]
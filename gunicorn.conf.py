@@ -0,0 +1,36 @@
+"""
+Production serving: `gunicorn` (this file is picked up from the working directory).
+
+Defaults to threaded WSGI workers: the API views are synchronous and spend
+most of their time in the DB or cache, so a few processes with several
+threads each beat many single-threaded processes at the same memory cost.
+Set GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker (uvicorn installed)
+to serve the ASGI application instead.
+
+Env: WEB_BIND, WEB_CONCURRENCY (processes), GUNICORN_THREADS,
+GUNICORN_WORKER_CLASS, GUNICORN_TIMEOUT, GUNICORN_MAX_REQUESTS.
+With DB_POOL=1 keep DB_POOL_MAX_SIZE >= GUNICORN_THREADS.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("WEB_BIND", "0.0.0.0:8000")
+
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+_asgi = "uvicorn" in worker_class
+wsgi_app = "sager_drone_task.asgi:application" if _asgi else "sager_drone_task.wsgi:application"
+
+# Processes: one per core plus one (threads cover I/O wait), capped for small DB pools.
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count() + 1, 8)))
+threads = int(os.environ.get("GUNICORN_THREADS", "4")) if worker_class == "gthread" else 1
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to bound slow leaks; jitter avoids restarting all at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
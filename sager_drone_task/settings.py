@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/6.0/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
+import importlib.util
 import os
 from pathlib import Path
 import dj_database_url
@@ -43,7 +44,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Inactive unless PROFILE_API_RATE > 0
+    'drones.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -52,6 +56,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# optional: static files without a separate web server (looked up, not imported, for fast worker startup)
+if importlib.util.find_spec("whitenoise") is None:  # pragma: no cover - depends on environment
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+
 ROOT_URLCONF = 'sager_drone_task.urls'
 
 TEMPLATES = [
@@ -76,13 +84,40 @@ WSGI_APPLICATION = 'sager_drone_task.wsgi.application'
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
 # DB: sqlite locally, postgres in docker via DATABASE_URL
+# DB_POOL=1 (PostgreSQL with psycopg 3) uses Django's native connection pool: each worker process
+# keeps DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections shared by its threads, instead of one
+# persistent connection per thread (DB_CONN_MAX_AGE, which must be 0 with a pool).
+DB_POOL = os.environ.get("DB_POOL", "0") == "1"
+_DB_CONN = {
+    "conn_max_age": 0 if DB_POOL else int(os.environ.get("DB_CONN_MAX_AGE", "600")),
+    "conn_health_checks": not DB_POOL,
+}
 DATABASES = {
-    "default": dj_database_url.config(
-        default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
-        conn_max_age=600,
-    )
+    "default": dj_database_url.config(default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}", **_DB_CONN)
 }
 
+# Optional read replica (drones/routers.py, drones/services/replica.py): the read-only list, path,
+# stats and export endpoints read from DATABASE_REPLICA_URL while its lag stays within
+# DATABASE_REPLICA_MAX_LAG_SECONDS (checked every DATABASE_REPLICA_LAG_CHECK_SECONDS); writes,
+# ingest and everything else use "default". Two SQLite files work for local testing.
+DATABASE_REPLICA_ALIAS = "replica"
+if os.environ.get("DATABASE_REPLICA_URL"):
+    DATABASES[DATABASE_REPLICA_ALIAS] = dj_database_url.parse(os.environ["DATABASE_REPLICA_URL"], **_DB_CONN)
+    if DATABASES[DATABASE_REPLICA_ALIAS]["ENGINE"] != "django.db.backends.sqlite3":
+        # A server replica is read-only: tests read the primary's test database through it.
+        DATABASES[DATABASE_REPLICA_ALIAS]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["drones.routers.ReadReplicaRouter"]
+DATABASE_REPLICA_MAX_LAG_SECONDS = float(os.environ.get("DATABASE_REPLICA_MAX_LAG_SECONDS", "5"))
+DATABASE_REPLICA_LAG_CHECK_SECONDS = float(os.environ.get("DATABASE_REPLICA_LAG_CHECK_SECONDS", "5"))
+
+for _db in DATABASES.values():
+    if DB_POOL and _db["ENGINE"] == "django.db.backends.postgresql":
+        _db.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+        }
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -118,13 +153,15 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+# `collectstatic` target; served by WhiteNoise when it is installed (DEBUG off, gunicorn)
+STATIC_ROOT = BASE_DIR / "staticfiles"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # DRF & DRF-Spectacular settings
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "drones.authentication.DroneJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -141,7 +178,7 @@ SPECTACULAR_SETTINGS = {
         "tagsSorter": "alpha",
         "operationsSorter": "alpha",
     },
-    "SECURITY": [{"bearerAuth": []}],
+    # Per-operation security comes from the DroneJWTScheme extension (drones/api/schema.py).
     "COMPONENTS": {
         "securitySchemes": {
             "bearerAuth": {
@@ -170,4 +207,150 @@ ONLINE_WINDOW_SECONDS = int(os.environ.get("ONLINE_WINDOW_SECONDS", "30"))
 NEARBY_RADIUS_KM = float(os.environ.get("NEARBY_RADIUS_KM", "5.0"))
 
 DANGEROUS_HEIGHT_M = float(os.environ.get("DANGEROUS_HEIGHT_M", "500.0"))
-DANGEROUS_SPEED_MS = float(os.environ.get("DANGEROUS_SPEED_MS", "10.0"))
\ No newline at end of file
+DANGEROUS_SPEED_MS = float(os.environ.get("DANGEROUS_SPEED_MS", "10.0"))
+
+# Geofence index: in-process zone index, rebuilt on local zone changes and
+# refreshed at least every GEOFENCE_INDEX_TTL_SECONDS to see other processes' edits.
+GEOFENCE_INDEX_TTL_SECONDS = float(os.environ.get("GEOFENCE_INDEX_TTL_SECONDS", "30"))
+GEOFENCE_INDEX_CELL_DEG = float(os.environ.get("GEOFENCE_INDEX_CELL_DEG", "0.1"))
+
+# Fleet re-evaluation after zone/rule edits (drones/services/reevaluate.py) runs on a background
+# thread of the process that made the edit, coalescing repeated edits; "0" runs it inline on commit
+FLEET_REEVALUATION_ASYNC = os.environ.get("FLEET_REEVALUATION_ASYNC", "1") == "1"
+
+# Zone polygons with at least ZONE_SIMPLIFY_MIN_POINTS vertices also store a
+# Douglas-Peucker simplified copy (tolerance in degrees, ~11 m by default; 0 disables).
+ZONE_SIMPLIFY_TOLERANCE_DEG = float(os.environ.get("ZONE_SIMPLIFY_TOLERANCE_DEG", "0.0001"))
+ZONE_SIMPLIFY_MIN_POINTS = int(os.environ.get("ZONE_SIMPLIFY_MIN_POINTS", "64"))
+
+# Danger rules as data: field/operator/threshold (see drones/services/rules.py).
+# Rules in the DangerRuleDefinition table override these by (name, drone_class).
+DANGER_RULES = [
+    {
+        "name": "height",
+        "field": "height",
+        "operator": "gt",
+        "threshold": DANGEROUS_HEIGHT_M,
+        "reason": f"height > {DANGEROUS_HEIGHT_M}m",
+    },
+    {
+        "name": "speed",
+        "field": "horizontal_speed",
+        "operator": "gt",
+        "threshold": DANGEROUS_SPEED_MS,
+        "reason": f"speed > {DANGEROUS_SPEED_MS}m/s",
+    },
+]
+DANGER_RULES_RELOAD_SECONDS = float(os.environ.get("DANGER_RULES_RELOAD_SECONDS", "5"))
+
+# Presence sweeper period (mqtt_consumer runs it in a background thread; 0 disables there)
+PRESENCE_SWEEP_SECONDS = float(os.environ.get("PRESENCE_SWEEP_SECONDS", "5"))
+
+# Cache: local-memory by default (per process). Point DJANGO_CACHE_BACKEND/LOCATION at a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) so the consumer's invalidations
+# reach the web workers; with local memory only the TTL applies across processes.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", "sager-drone-task"),
+    }
+}
+DRONE_API_CACHE_TTL_SECONDS = int(os.environ.get("DRONE_API_CACHE_TTL_SECONDS", "2"))
+DRONE_API_CACHE_BUMP_INTERVAL_SECONDS = float(os.environ.get("DRONE_API_CACHE_BUMP_INTERVAL_SECONDS", "1.0"))
+
+# Auth fast paths (see drones/authentication.py and drones/permissions.py).
+# JWT_STATELESS_AUTH trusts the "perms" claim of access tokens: no user/permission queries per
+# request, but revoked permissions stay valid until the access token expires.
+JWT_STATELESS_AUTH = os.environ.get("JWT_STATELESS_AUTH", "0") == "1"
+AUTH_CACHE_SECONDS = float(os.environ.get("AUTH_CACHE_SECONDS", "30"))
+# Per-process cap on cached users and permission sets (least recently used evicted first).
+AUTH_CACHE_MAX_ENTRIES = int(os.environ.get("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# Raw OSD payload store (drones/services/osd_store.py): latest payload in the cache, upserted to
+# DroneOSDPayload at most every OSD_PERSIST_INTERVAL_SECONDS per drone (0 = every message);
+# OSD_HISTORY_SIZE > 0 keeps a ring of recent payloads per drone in the cache for debugging.
+OSD_CACHE_SECONDS = int(os.environ.get("OSD_CACHE_SECONDS", "3600"))
+OSD_PERSIST_INTERVAL_SECONDS = float(os.environ.get("OSD_PERSIST_INTERVAL_SECONDS", "0"))
+OSD_HISTORY_SIZE = int(os.environ.get("OSD_HISTORY_SIZE", "0"))
+
+# Consumer JSON decoding: "auto" (orjson when installed), "orjson" or "json"
+MQTT_JSON_DECODER = os.environ.get("MQTT_JSON_DECODER", "auto")
+# How often mqtt_consumer logs (and resets) its ingest/drop counters; 0 disables
+INGEST_STATS_LOG_SECONDS = float(os.environ.get("INGEST_STATS_LOG_SECONDS", "60"))
+
+# Compact binary telemetry (thing/product/<serial>/osd/<format>, see drones/services/binary_osd.py);
+# empty disables the subscription
+MQTT_BINARY_TOPIC = os.environ.get("MQTT_BINARY_TOPIC", "thing/product/+/osd/+")
+
+# Duplicate/late frame handling: device timestamps remembered per drone for dedup (0 disables;
+# the (drone, timestamp) unique constraint still applies), how many drones are remembered (least
+# recently reporting forgotten first), and how far in the future a device timestamp may be before
+# the arrival time is used instead
+INGEST_DEDUP_WINDOW = int(os.environ.get("INGEST_DEDUP_WINDOW", "8"))
+INGEST_DEDUP_MAX_DRONES = int(os.environ.get("INGEST_DEDUP_MAX_DRONES", "100000"))
+INGEST_MAX_FUTURE_SKEW_SECONDS = float(os.environ.get("INGEST_MAX_FUTURE_SKEW_SECONDS", "300"))
+
+# Durable ingest spool (drones/services/spool.py). "fallback": frames are spooled to disk while the
+# DB is failing and replayed in bulk once it recovers; "always": the MQTT callback only appends to
+# the spool and a writer thread ingests from it; "off": no spool.
+INGEST_SPOOL_MODE = os.environ.get("INGEST_SPOOL_MODE", "fallback")
+INGEST_SPOOL_DIR = os.environ.get("INGEST_SPOOL_DIR", str(BASE_DIR / "var" / "spool"))
+INGEST_SPOOL_SEGMENT_MB = float(os.environ.get("INGEST_SPOOL_SEGMENT_MB", "8"))
+INGEST_SPOOL_MAX_MB = float(os.environ.get("INGEST_SPOOL_MAX_MB", "512"))
+INGEST_SPOOL_FSYNC_EVERY = int(os.environ.get("INGEST_SPOOL_FSYNC_EVERY", "100"))
+INGEST_SPOOL_FSYNC_SECONDS = float(os.environ.get("INGEST_SPOOL_FSYNC_SECONDS", "1.0"))
+INGEST_SPOOL_REPLAY_SECONDS = float(os.environ.get("INGEST_SPOOL_REPLAY_SECONDS", "1.0"))
+INGEST_SPOOL_REPLAY_BATCH = int(os.environ.get("INGEST_SPOOL_REPLAY_BATCH", "500"))
+
+# Per-drone track statistics (/api/drones/<serial>/stats): running summaries are cached per
+# window and extended with new points only; this bounds how long a summary is reused
+TRACK_STATS_CACHE_SECONDS = int(os.environ.get("TRACK_STATS_CACHE_SECONDS", "300"))
+
+# Telemetry bulk export (/api/telemetry/export, manage.py export_telemetry): rows fetched per
+# server-side cursor round trip and written per output chunk / Parquet row group
+EXPORT_CHUNK_ROWS = int(os.environ.get("EXPORT_CHUNK_ROWS", "5000"))
+
+# Spatio-temporal telemetry index (drones/services/grid.py): cell size of the grid_cell column
+# (changing it requires `manage.py backfill_grid_cells --all`), how many cells a historical "near"
+# query lists one by one (each probe bounded by cell and time; about 120 for a 5 km radius), and
+# how many per-row cell ranges it may use beyond that before it falls back to a lat/lon bbox scan
+GRID_CELL_DEG = float(os.environ.get("GRID_CELL_DEG", "0.01"))
+GRID_MAX_QUERY_CELLS = int(os.environ.get("GRID_MAX_QUERY_CELLS", "1024"))
+GRID_MAX_QUERY_RANGES = int(os.environ.get("GRID_MAX_QUERY_RANGES", "256"))
+# Largest radius accepted by /api/telemetry/nearby
+HISTORY_NEARBY_MAX_RADIUS_KM = float(os.environ.get("HISTORY_NEARBY_MAX_RADIUS_KM", "50"))
+
+# Separation conflicts (drones/services/conflicts.py, /api/drones/conflicts): online drones closer
+# than MIN_SEPARATION_M (and, when > 0, closer than MIN_VERTICAL_SEPARATION_M in height) get the
+# separation_conflict danger reason; mqtt_consumer runs the detector every CONFLICT_DETECT_SECONDS
+# (0 disables it there; `manage.py detect_conflicts` runs it standalone)
+MIN_SEPARATION_M = float(os.environ.get("MIN_SEPARATION_M", "50"))
+MIN_VERTICAL_SEPARATION_M = float(os.environ.get("MIN_VERTICAL_SEPARATION_M", "0"))
+CONFLICT_DETECT_SECONDS = float(os.environ.get("CONFLICT_DETECT_SECONDS", "1.0"))
+
+# Sampling profiler (drones/services/profiling.py): fraction of MQTT messages (mqtt_consumer
+# --profile) and of HTTP requests (ProfilingMiddleware) to record with per-stage timings and SQL
+# counts; 0 disables. PROFILE_CPROFILE also runs cProfile on sampled units. Reports are logged every
+# PROFILE_REPORT_SECONDS and merged cProfile stats written to PROFILE_DIR (when set).
+PROFILE_INGEST_RATE = float(os.environ.get("PROFILE_INGEST_RATE", "0"))
+PROFILE_API_RATE = float(os.environ.get("PROFILE_API_RATE", "0"))
+PROFILE_CPROFILE = os.environ.get("PROFILE_CPROFILE", "0") == "1"
+PROFILE_REPORT_SECONDS = float(os.environ.get("PROFILE_REPORT_SECONDS", "60"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    # Profiling reports are opted into, so they are always shown.
+    "loggers": {"drones.services.profiling": {"handlers": ["console"], "level": "INFO", "propagate": False}},
+}
+
+# OpenAPI schema (drones/api/schema.py): served from memory after the first request; when this file
+# exists (written at image build time by `manage.py spectacular --format openapi-json --file ...`)
+# it is loaded instead of introspecting the views
+OPENAPI_SCHEMA_FILE = os.environ.get("OPENAPI_SCHEMA_FILE", "")
+
+# Admin changelists over large tables (drones/admin.py EstimatedCountPaginator): rows counted exactly
+# at most; beyond it unfiltered lists use PostgreSQL's row estimate
+ADMIN_EXACT_COUNT_LIMIT = int(os.environ.get("ADMIN_EXACT_COUNT_LIMIT", "10000"))
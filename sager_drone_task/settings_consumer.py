@@ -0,0 +1,18 @@
+"""
+Lean settings profile for the MQTT consumer (`python consumer.py`).
+
+Same database, cache and drone settings as settings.py, but only the apps
+the ORM, signals and services need: no admin, sessions, messages, static
+files, DRF or drf-spectacular, and no middleware or templates. The web
+service applies the migrations of the full app set.
+"""
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "drones",
+]
+
+MIDDLEWARE = []
+TEMPLATES = []
@@ -16,7 +16,8 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularSwaggerView
+from drones.api.schema import CachedSpectacularAPIView
 from drones.api.views.auth_views import MyTokenObtainPairView, MyTokenRefreshView
 
 urlpatterns = [
@@ -26,8 +27,8 @@ urlpatterns = [
     path("api/token/", MyTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", MyTokenRefreshView.as_view(), name="token_refresh"),
 
-    # OpenAPI schema + Swagger UI
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    # OpenAPI schema (built once per process, or loaded from OPENAPI_SCHEMA_FILE) + Swagger UI
+    path("api/schema/", CachedSpectacularAPIView.as_view(), name="schema"),
     path("", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
 
     # App routes